@@ -1,3 +1,4 @@
+import asyncio
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
@@ -5,20 +6,62 @@ import structlog
 from fastapi import FastAPI
 
 from features.health.router import router as health_router
+from features.items.repository import ItemRepository
 from features.items.router import router as items_router
+from features.metrics.router import router as metrics_router
 from shared.config import settings
+from shared.db.engine import get_database
 from shared.lib.exceptions import register_exception_handlers
+from shared.lib.lifecycle import lifecycle
+from shared.lib.redis import close_redis
+from shared.lib.responses import FastJSONResponse
+from shared.middleware.admission import add_admission_control_middleware
 from shared.middleware.cors import add_cors_middleware
-from shared.middleware.logging import RequestLoggingMiddleware
+from shared.middleware.lifecycle import LifecycleMiddleware
+from shared.middleware.logging import RequestLoggingMiddleware, log_writer
+from shared.middleware.metrics import MetricsMiddleware
+from shared.middleware.query_profile import QueryProfileMiddleware
+from shared.middleware.read_your_writes import add_read_your_writes_middleware
+from shared.middleware.timeout import add_timeout_middleware
 
 logger = structlog.get_logger()
 
+# Seconds the shutdown waits for queued request logs; it fits in the second
+# shutdown_request_timeout leaves before the server's graceful timeout
+LOG_FLUSH_TIMEOUT = 0.5
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     await logger.ainfo("startup", env=settings.app_env)
+    # Engines are created here, in the worker, rather than when the app is imported
+    database = get_database()
+    # The server accepts connections only once startup is done, so this precedes readiness
+    await database.warm_up(
+        settings.db_pool_warmup, lambda session: ItemRepository(session).warm_up()
+    )
+    lifecycle.drain_on_signal(settings.shutdown_drain_seconds)
+    monitor = None
+    if database.replicas.engines:
+        monitor = asyncio.create_task(
+            database.replicas.monitor(settings.db_replica_check_interval)
+        )
     yield
-    await logger.ainfo("shutdown")
+    # The server has stopped accepting requests; give those still running a deadline
+    idle = await lifecycle.wait_idle(settings.shutdown_request_timeout)
+    # The writer thread is a daemon: whatever it has not written when the worker exits is lost
+    flushed = await asyncio.to_thread(log_writer.flush, LOG_FLUSH_TIMEOUT)
+    if monitor is not None:
+        monitor.cancel()
+    await database.dispose()
+    await close_redis()
+    await logger.ainfo(
+        "shutdown",
+        in_flight=lifecycle.in_flight,
+        idle=idle,
+        logs_flushed=flushed,
+        logs_dropped=log_writer.dropped,
+    )
 
 
 def _init_sentry() -> None:
@@ -44,23 +87,34 @@ def create_app() -> FastAPI:
         docs_url="/docs" if settings.is_development else None,
         redoc_url="/redoc" if settings.is_development else None,
         lifespan=lifespan,
+        default_response_class=FastJSONResponse,
     )
 
-    add_cors_middleware(app)
+    # Innermost, so the deadline bounds the handler and its session, not the other layers
+    add_timeout_middleware(app)
+    add_read_your_writes_middleware(app)
 
+    # Rate limiting sits inside CORS so 429 responses still carry CORS headers
     if not settings.is_testing:
-        from slowapi.errors import RateLimitExceeded
-
-        from shared.middleware.rate_limit import limiter, rate_limit_exceeded_handler
+        from shared.middleware.rate_limit import add_rate_limit_middleware
 
-        app.state.limiter = limiter
-        app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
+        add_rate_limit_middleware(app)
 
+    # Sheds load before the rate limiter's Redis round trip, with CORS headers on the 503
+    add_admission_control_middleware(app)
+    add_cors_middleware(app)
     app.add_middleware(RequestLoggingMiddleware)
+    app.add_middleware(QueryProfileMiddleware)
+    app.add_middleware(LifecycleMiddleware)
+    # Added last so it wraps, and times, every other middleware
+    if settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
 
     register_exception_handlers(app)
 
     app.include_router(health_router)
+    if settings.metrics_enabled:
+        app.include_router(metrics_router)
     app.include_router(items_router, prefix="/api/v1/items", tags=["items"])
 
     return app
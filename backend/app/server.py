@@ -0,0 +1,134 @@
+"""Production server: gunicorn managing uvicorn workers on uvloop and httptools.
+
+    python -m app.server
+
+The app is imported once in the master (preload_app) and workers are forked from it,
+so a new or restarted worker serves requests without importing anything. Nothing that
+holds sockets or threads is shared across the fork: the modules owning DB pools, the
+Redis client and the log writer reset them in the child with os.register_at_fork, and
+the rate limiter is built on each worker's first request.
+"""
+
+import math
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, ClassVar
+
+from gunicorn.app.base import BaseApplication  # type: ignore[import-untyped]
+from gunicorn.arbiter import Arbiter  # type: ignore[import-untyped]
+from gunicorn.workers.base import Worker  # type: ignore[import-untyped]
+from starlette.types import ASGIApp
+from uvicorn_worker import UvicornWorker  # type: ignore[import-untyped]
+
+from shared.config import Settings, settings
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+# Worker heartbeats are file writes; keep them off a possibly slow container disk.
+# Gunicorn writes nothing else there.
+HEARTBEAT_DIR = "/dev/shm"  # nosec B108
+
+
+class AppWorker(UvicornWorker):  # type: ignore[misc]
+    CONFIG_KWARGS: ClassVar[dict[str, Any]] = {
+        "loop": "uvloop",
+        "http": "httptools",
+        "lifespan": "on",
+        # Cancel requests still running before gunicorn's graceful_timeout kills the worker
+        "timeout_graceful_shutdown": settings.shutdown_request_timeout,
+    }
+
+
+def cpu_quota(root: Path = CGROUP_ROOT) -> float | None:
+    """CPUs granted by the cgroup CPU quota (v2, then v1); None when unlimited."""
+    try:
+        quota, period = (root / "cpu.max").read_text().split()
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        quota_us = int((root / "cpu" / "cpu.cfs_quota_us").read_text())
+        period_us = int((root / "cpu" / "cpu.cfs_period_us").read_text())
+    except (OSError, ValueError):
+        return None
+    return quota_us / period_us if quota_us > 0 and period_us > 0 else None
+
+
+def worker_count(config: Settings, root: Path = CGROUP_ROOT) -> int:
+    """WEB_CONCURRENCY, else one worker per CPU this process may use.
+
+    Workers are async, so more than one per CPU only adds memory and DB connections.
+    A container's CPU quota counts, not the host's core count.
+    """
+    if config.web_concurrency:
+        return config.web_concurrency
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    quota = cpu_quota(root)
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(1, cpus)
+
+
+def _child_exit(server: Arbiter, worker: Worker) -> None:
+    # Drops the exited worker's live gauges (in-flight requests, checked-out connections)
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)  # type: ignore[no-untyped-call]
+
+
+def server_options(config: Settings) -> dict[str, Any]:
+    options: dict[str, Any] = {
+        "bind": config.server_bind,
+        "workers": worker_count(config),
+        "worker_class": AppWorker,
+        "preload_app": True,
+        "keepalive": config.server_keepalive,
+        "backlog": config.server_backlog,
+        "max_requests": config.server_max_requests,
+        "max_requests_jitter": config.server_max_requests_jitter,
+        "graceful_timeout": config.server_graceful_timeout,
+    }
+    if os.path.isdir(HEARTBEAT_DIR):
+        options["worker_tmp_dir"] = HEARTBEAT_DIR
+    if config.metrics_enabled:
+        options["child_exit"] = _child_exit
+    return options
+
+
+def prepare_metrics_dir() -> None:
+    """Point prometheus_client at a multiprocess directory, emptied of previous runs.
+
+    Must run before prometheus_client is imported, i.e. before the app is loaded.
+    """
+    path = Path(
+        os.environ.setdefault(
+            "PROMETHEUS_MULTIPROC_DIR", str(Path(tempfile.gettempdir()) / "prometheus-multiproc")
+        )
+    )
+    path.mkdir(parents=True, exist_ok=True)
+    for stale in path.glob("*.db"):
+        stale.unlink()
+
+
+class Server(BaseApplication):  # type: ignore[misc]
+    def __init__(self, options: dict[str, Any]) -> None:
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for name, value in self.options.items():
+            self.cfg.set(name, value)
+
+    def load(self) -> ASGIApp:
+        from app.main import app
+
+        return app
+
+
+if __name__ == "__main__":
+    if settings.metrics_enabled:
+        prepare_metrics_dir()
+    Server(server_options(settings)).run()
@@ -0,0 +1,116 @@
+"""Requests/sec of GET /api/v1/items?limit=100 with the old and new response paths.
+
+"before" is the previous handler: it hashes every row's version into the ETag, sets it
+on the injected response and returns
+the model through ``response_model``, so FastAPI revalidates it, serializes it to a dict
+and encodes it with ``json.dumps``.
+"after" is the current app, which encodes the page with pydantic-core directly.
+
+Both apps are built by ``create_app`` (same middleware) and run in-process with the
+item read cache on, so the numbers compare the serialization paths rather than network
+or database latency.
+
+    uv run python -m benchmarks.list_serialization [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections.abc import AsyncGenerator
+
+os.environ.setdefault("APP_ENV", "testing")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-do-not-use-in-production")
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite://"
+os.environ.setdefault("CACHE_TTL", "60")
+os.environ.setdefault("CACHE_LOCAL", "true")
+os.environ.setdefault("REQUEST_LOG_SAMPLE_RATE", "0")
+
+from fastapi import APIRouter, Depends, FastAPI, Query, Response
+from fastapi.responses import JSONResponse
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.main import create_app
+from features.items.router import get_item_service
+from features.items.schema import ItemListResponse
+from features.items.service import ItemService
+from shared.db.base import Base
+from shared.db.models.item import Item
+from shared.db.session import get_session
+from shared.lib.http_cache import cache_validators, make_etag
+
+PAGE_SIZE = 100
+
+
+def _baseline_router() -> APIRouter:
+    router = APIRouter()
+
+    @router.get("", response_model=ItemListResponse, response_class=JSONResponse)
+    async def list_items(
+        response: Response,
+        limit: int = Query(20, ge=1, le=100),
+        service: ItemService = Depends(get_item_service),
+    ) -> ItemListResponse:
+        page = await service.get_list(limit=limit)
+        versions = (f"{item.id}@{item.updated_at.isoformat()}" for item in page.items)
+        etag = make_etag(*versions, page.total, page.next_cursor)
+        response.headers.update(cache_validators(etag))
+        return page
+
+    return router
+
+
+async def _requests_per_second(app: FastAPI, requests: int) -> float:
+    url = f"/api/v1/items?limit={PAGE_SIZE}"
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(50):
+            (await client.get(url)).raise_for_status()
+        started = time.perf_counter()
+        for _ in range(requests):
+            await client.get(url)
+        return requests / (time.perf_counter() - started)
+
+
+async def main(requests: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with session_factory() as session:
+        session.add_all(
+            Item(name=f"Item {i}", description="Benchmark item " * 4) for i in range(PAGE_SIZE)
+        )
+        await session.commit()
+
+    async def override_get_session() -> AsyncGenerator[AsyncSession, None]:
+        async with session_factory() as session:
+            yield session
+
+    after = create_app()
+    before = create_app()
+    before.include_router(_baseline_router(), prefix="/api/v1/items")
+    # Move the baseline route ahead of the real one so it handles the request
+    before.router.routes.insert(0, before.router.routes.pop())
+    for app in (before, after):
+        app.dependency_overrides[get_session] = override_get_session
+
+    before_rps = await _requests_per_second(before, requests)
+    after_rps = await _requests_per_second(after, requests)
+    await engine.dispose()
+
+    sys.stdout.write(
+        f"GET /api/v1/items?limit={PAGE_SIZE}, {requests} requests\n"
+        f"  before (response_model + json.dumps): {before_rps:8.1f} req/s\n"
+        f"  after  (FastJSONResponse):            {after_rps:8.1f} req/s\n"
+        f"  speedup: {after_rps / before_rps:.2f}x\n"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    asyncio.run(main(parser.parse_args().requests))
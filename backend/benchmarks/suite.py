@@ -0,0 +1,310 @@
+"""Latency and throughput of the main endpoints, with a regression gate.
+
+Runs in-process against create_app() through httpx's ASGITransport, or against a live
+server with --url. In-process runs seed the items table of DATABASE_URL (default: a
+SQLite file in the temp dir) up to each --rows size and list items at several offsets
+per size; get/create item and /health run once, at the largest size. They also time a
+bare app with and without each middleware, so middleware overhead shows separately.
+
+Every scenario reports req/s and p50/p95/p99 latency. With --baseline, results are
+compared against a stored run and the exit code is 1 if any scenario's p95 grew or its
+throughput fell by more than --tolerance; a missing baseline file is recorded instead.
+Baselines only compare runs on the same machine, database and settings.
+
+    uv run python -m benchmarks.suite [--rows 10000,100000] [--requests 300]
+    uv run python -m benchmarks.suite --baseline benchmarks/baseline.json [--update-baseline]
+    uv run python -m benchmarks.suite --url http://localhost:8000 --requests 2000
+
+A live server must allow the request rate (RATE_LIMIT_DEFAULT) and have seeded data
+(benchmarks.seed against its DATABASE_URL).
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+os.environ.setdefault("APP_ENV", "development")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-do-not-use-in-production")
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite+aiosqlite:///{Path(tempfile.gettempdir()) / 'benchmark-items.db'}"
+)
+# Production-like middleware, minus limits and logs that would distort the numbers
+os.environ.setdefault("RATE_LIMIT_DEFAULT", "1000000/second")
+os.environ.setdefault("REQUEST_LOG_SAMPLE_RATE", "0")
+os.environ.setdefault("DB_SLOW_QUERY_MS", "0")
+os.environ.setdefault("CACHE_TTL", "0")
+
+import structlog
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient, Response
+from starlette.types import ASGIApp
+
+from app.main import create_app
+from benchmarks.seed import seed_items
+from shared.config import settings
+from shared.db.base import Base
+from shared.db.engine import get_database
+from shared.middleware.cors import add_cors_middleware
+from shared.middleware.logging import RequestLoggingMiddleware
+from shared.middleware.rate_limit import RateLimiter, RateLimitMiddleware
+
+OFFSETS = (1_000, 10_000, 100_000)
+ORIGIN = {"Origin": "http://localhost:3000"}
+
+
+@dataclass
+class Result:
+    name: str
+    seconds: float
+    latencies: list[float]
+
+    def summary(self) -> dict[str, float]:
+        cuts = statistics.quantiles(self.latencies, n=100, method="inclusive")
+        return {
+            "rps": round(len(self.latencies) / self.seconds, 1),
+            "p50_ms": round(cuts[49] * 1000, 3),
+            "p95_ms": round(cuts[94] * 1000, 3),
+            "p99_ms": round(cuts[98] * 1000, 3),
+        }
+
+
+Send = Callable[[int], Awaitable[Response]]
+
+
+def repeat_get(client: AsyncClient, url: str, **kwargs: Any) -> Send:
+    """The same GET for every request number."""
+    return lambda _: client.get(url, **kwargs)
+
+
+async def measure(
+    name: str,
+    send: Send,
+    requests: int,
+    concurrency: int,
+) -> Result:
+    """Send requests from ``concurrency`` workers after a short warm-up."""
+    for i in range(min(20, requests)):
+        (await send(i)).raise_for_status()
+    counter = itertools.count()
+    latencies: list[float] = []
+
+    async def worker() -> None:
+        while (i := next(counter)) < requests:
+            started = time.perf_counter()
+            response = await send(i)
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result = Result(name, time.perf_counter() - started, latencies)
+    summary = result.summary()
+    sys.stdout.write(
+        f"  {name:<44} {summary['rps']:9.1f} req/s  p50={summary['p50_ms']:8.2f}ms  "
+        f"p95={summary['p95_ms']:8.2f}ms  p99={summary['p99_ms']:8.2f}ms\n"
+    )
+    return result
+
+
+async def item_scenarios(
+    client: AsyncClient, label: str, rows: int, requests: int, concurrency: int
+) -> list[Result]:
+    """Listing at several offsets: their cost grows with the offset and the table size."""
+    first = (await client.get("/api/v1/items", params={"limit": 20})).json()
+    scenarios = {
+        f"list first page, exact total {label}": {"limit": 20},
+        f"list keyset page 2 {label}": {
+            "limit": 20,
+            "cursor": first["next_cursor"],
+            "total": "none",
+        },
+    }
+    for offset in OFFSETS:
+        if offset < rows:
+            scenarios[f"list skip={offset} {label}"] = {
+                "limit": 20,
+                "skip": offset,
+                "total": "none",
+            }
+
+    results = []
+    for name, params in scenarios.items():
+        send = repeat_get(client, "/api/v1/items", params=params)
+        results.append(await measure(name, send, requests, concurrency))
+    return results
+
+
+async def endpoint_scenarios(client: AsyncClient, requests: int, concurrency: int) -> list[Result]:
+    page = (await client.get("/api/v1/items", params={"limit": 100, "total": "none"})).json()
+    ids = [item["id"] for item in page["items"]]
+    if not ids:
+        sys.exit("no items to read: seed the database first (benchmarks.seed)")
+    return [
+        await measure(
+            "get item",
+            lambda i: client.get(f"/api/v1/items/{ids[i % len(ids)]}"),
+            requests,
+            concurrency,
+        ),
+        await measure(
+            "create item",
+            lambda i: client.post("/api/v1/items", json={"name": f"bench {i}"}),
+            requests,
+            concurrency,
+        ),
+        await measure("health", repeat_get(client, "/health"), requests, concurrency),
+        await measure("health live", repeat_get(client, "/health/live"), requests, concurrency),
+    ]
+
+
+def _bare_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> dict[str, str]:
+        return {"status": "ok"}
+
+    return app
+
+
+def middleware_apps() -> dict[str, ASGIApp]:
+    """A route that does nothing, bare and behind each middleware on its own."""
+    logged = _bare_app()
+    logged.add_middleware(RequestLoggingMiddleware, exclude_paths=[], sample_rate=1.0)
+    cors = _bare_app()
+    add_cors_middleware(cors)
+    limited = _bare_app()
+    limited.add_middleware(
+        RateLimitMiddleware, limiter=RateLimiter(), default_rate=settings.rate_limit_default
+    )
+    return {"none": _bare_app(), "logging": logged, "cors": cors, "rate limit": limited}
+
+
+async def middleware_scenarios(requests: int) -> list[Result]:
+    results = []
+    for label, app in middleware_apps().items():
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://bench") as client:
+            send = repeat_get(client, "/ping", headers=ORIGIN)
+            # One at a time, so the latency difference is the middleware's own cost
+            results.append(await measure(f"middleware: {label}", send, requests, concurrency=1))
+    bare = results[0].summary()["p50_ms"]
+    for result in results[1:]:
+        overhead = (result.summary()["p50_ms"] - bare) * 1000
+        sys.stdout.write(f"  {result.name:<44} +{overhead:.0f}us per request (p50)\n")
+    return results
+
+
+async def run_in_process(sizes: list[int], requests: int, concurrency: int) -> list[Result]:
+    # Request and slow-query logs go through structlog; keep them out of the report
+    structlog.configure(logger_factory=structlog.ReturnLoggerFactory())
+    database = get_database()
+    async with database.engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    app = create_app()
+    results = []
+    async with (
+        app.router.lifespan_context(app),
+        AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client,
+    ):
+        for size in sorted(sizes):
+            async with database.session_factory() as session:
+                rows = await seed_items(session, size)
+            sys.stdout.write(f"{settings.database_url.split(':')[0]}, {rows} items\n")
+            results += await item_scenarios(client, f"({rows} rows)", rows, requests, concurrency)
+        results += await endpoint_scenarios(client, requests, concurrency)
+    sys.stdout.write("middleware overhead, in-process\n")
+    results += await middleware_scenarios(requests)
+    await database.dispose()
+    return results
+
+
+async def run_live(url: str, requests: int, concurrency: int) -> list[Result]:
+    async with AsyncClient(base_url=url, timeout=30.0) as client:
+        sys.stdout.write(f"live server {url}\n")
+        results = await item_scenarios(client, "(live)", sys.maxsize, requests, concurrency)
+        results += await endpoint_scenarios(client, requests, concurrency)
+    return results
+
+
+def compare(
+    baseline: dict[str, dict[str, float]], current: dict[str, dict[str, float]], tolerance: float
+) -> list[str]:
+    """Scenarios whose p95 grew or whose throughput fell by more than tolerance."""
+    regressions = []
+    for name, now in current.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if now["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {before['p95_ms']:.2f}ms -> {now['p95_ms']:.2f}ms")
+        if now["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: {before['rps']:.1f} -> {now['rps']:.1f} req/s")
+    return regressions
+
+
+def gate(path: Path, run: dict[str, Any], update: bool, tolerance: float) -> int:
+    if update or not path.exists():
+        path.write_text(json.dumps(run, indent=2) + "\n")
+        sys.stdout.write(f"baseline written to {path}\n")
+        return 0
+    baseline = json.loads(path.read_text())
+    if baseline["settings"] != run["settings"]:
+        sys.stdout.write(
+            f"baseline {path} was recorded with {baseline['settings']}, not "
+            f"{run['settings']}; rerun with the same options or --update-baseline\n"
+        )
+        return 1
+    regressions = compare(baseline["results"], run["results"], tolerance)
+    for regression in regressions:
+        sys.stdout.write(f"REGRESSION {regression}\n")
+    if not regressions:
+        sys.stdout.write(f"no regressions beyond {tolerance:.0%} against {path}\n")
+    return 1 if regressions else 0
+
+
+async def main(args: argparse.Namespace) -> int:
+    sizes = [int(size) for size in args.rows.split(",")]
+    if args.url:
+        results = await run_live(args.url, args.requests, args.concurrency)
+    else:
+        results = await run_in_process(sizes, args.requests, args.concurrency)
+
+    run: dict[str, Any] = {
+        "settings": {
+            "target": args.url or settings.database_url.split(":")[0],
+            "rows": sizes,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "results": {result.name: result.summary() for result in results},
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(run, indent=2) + "\n")
+    if args.baseline:
+        return gate(Path(args.baseline), run, args.update_baseline, args.tolerance)
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", default="10000,100000", help="comma-separated table sizes")
+    parser.add_argument("--requests", type=int, default=300, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--url", help="benchmark a running server instead of create_app()")
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--baseline", help="baseline JSON to compare against (or create)")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -1,17 +1,40 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Response
 
-from features.health.schema import HealthResponse
+from features.health.schema import FlightStatsResponse, HealthResponse, PoolStatusResponse
 from features.health.service import HealthService
-from shared.db.session import get_session
+from shared.config import settings
+from shared.db.engine import get_database
+from shared.db.pool import pool_snapshot
+from shared.lib.lifecycle import lifecycle
+from shared.lib.singleflight import flight_snapshot
 
 router = APIRouter()
 
+_health_service: HealthService | None = None
+
+
+def get_health_service() -> HealthService:
+    """One per worker, so the cached result is shared by every probe it answers."""
+    global _health_service
+    if _health_service is None:
+        database = get_database()
+        _health_service = HealthService(
+            database.health_engine,
+            database.replicas,
+            ttl=settings.health_cache_ttl,
+            timeout=settings.health_check_timeout,
+        )
+    return _health_service
+
 
 @router.get("/health", response_model=HealthResponse)
-async def health_check(session: AsyncSession = Depends(get_session)) -> HealthResponse:
-    service = HealthService(session)
-    return await service.check()
+async def health_check(response: Response) -> HealthResponse:
+    result = await get_health_service().check()
+    if lifecycle.draining:
+        # Tells load balancers to stop routing here before the worker stops
+        response.status_code = 503
+        return result.model_copy(update={"status": "draining"})
+    return result
 
 
 # Liveness probe — intentionally dependency-free (no DB, no Redis).
@@ -20,3 +43,18 @@ async def health_check(session: AsyncSession = Depends(get_session)) -> HealthRe
 async def health_live() -> dict[str, str]:
     """Shallow liveness probe — no I/O. Used by Dockerfile HEALTHCHECK."""
     return {"status": "ok"}
+
+
+@router.get("/health/pool", response_model=PoolStatusResponse)
+async def health_pool() -> PoolStatusResponse:
+    """Connection pool occupancy and checkout wait counters for this worker."""
+    return PoolStatusResponse.model_validate(pool_snapshot(get_database().engine.pool))
+
+
+@router.get("/health/coalescing", response_model=dict[str, FlightStatsResponse])
+async def health_coalescing() -> dict[str, FlightStatsResponse]:
+    """Single-flight counters for this worker: followers are reads served by another's query."""
+    return {
+        name: FlightStatsResponse.model_validate(stats)
+        for name, stats in flight_snapshot().items()
+    }
@@ -5,4 +5,24 @@ class HealthResponse(BaseModel):
     status: str
     database: str
     redis: str
+    replicas: str = "skipped"
     version: str
+
+
+class PoolStatusResponse(BaseModel):
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+    waiting: int = 0
+    size: int | None = None
+    checked_in: int | None = None
+    checked_out: int | None = None
+    overflow: int | None = None
+
+
+class FlightStatsResponse(BaseModel):
+    leaders: int
+    followers: int
+    hit_rate: float
+    in_flight: int
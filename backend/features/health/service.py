@@ -1,48 +1,104 @@
+import asyncio
+import time
+from collections.abc import Awaitable
+
 import structlog
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine
 
 from features.health.schema import HealthResponse
 from shared.config import settings
+from shared.db.routing import ReplicaSet
+from shared.lib.redis import get_redis
+from shared.lib.singleflight import SingleFlight
 
 logger = structlog.get_logger()
 
 
 class HealthService:
-    def __init__(self, session: AsyncSession) -> None:
-        self.session = session
+    """Aggregated dependency health, cached for ``ttl`` seconds.
+
+    The checks run concurrently, each bounded by ``timeout``. Once a result exists,
+    callers get it straight away and an expired one is refreshed in the background, so
+    probes never wait on a slow dependency. ``engine`` should have a pool of its own
+    (shared.db.engine.Database.health_engine) so probes do not queue behind request traffic.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        replicas: ReplicaSet | None = None,
+        ttl: float = 0.0,
+        timeout: float = 2.0,
+    ) -> None:
+        self.engine = engine
+        self.replicas = replicas
+        self.ttl = ttl
+        self.timeout = timeout
+        self._result: HealthResponse | None = None
+        self._checked_at = 0.0
+        self._flight: SingleFlight[HealthResponse] = SingleFlight()
+        self._refresh: asyncio.Task[HealthResponse] | None = None
 
     async def check(self) -> HealthResponse:
-        db_status = await self._check_database()
-        redis_status = await self._check_redis()
+        if self._result is None or self.ttl <= 0:
+            return await self._flight.do("health", self._run_checks)
+        if time.monotonic() - self._checked_at >= self.ttl and (
+            self._refresh is None or self._refresh.done()
+        ):
+            self._refresh = asyncio.create_task(self._flight.do("health", self._run_checks))
+        return self._result
 
+    async def _run_checks(self) -> HealthResponse:
+        db_status, redis_status = await asyncio.gather(
+            self._timed("database", self._check_database()),
+            self._timed("redis", self._check_redis()),
+        )
         overall = "healthy" if db_status == "up" and redis_status != "down" else "unhealthy"
 
-        return HealthResponse(
+        self._result = HealthResponse(
             status=overall,
             database=db_status,
             redis=redis_status,
+            replicas=self._check_replicas(),
             version=settings.app_env,
         )
+        self._checked_at = time.monotonic()
+        return self._result
+
+    async def _timed(self, name: str, check: Awaitable[str]) -> str:
+        try:
+            return await asyncio.wait_for(check, self.timeout)
+        except TimeoutError:
+            await logger.awarning("health_check_timed_out", check=name, timeout=self.timeout)
+            return "down"
 
     async def _check_database(self) -> str:
         try:
-            await self.session.execute(text("SELECT 1"))
+            async with self.engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
             return "up"
         except Exception:
             await logger.aexception("database_health_check_failed")
             return "down"
 
+    def _check_replicas(self) -> str:
+        # The lifespan's replica monitor keeps this state current; reads fall back to the
+        # primary, so failed replicas never make the app unhealthy
+        if self.replicas is None or not self.replicas.engines:
+            return "skipped"
+        healthy = self.replicas.healthy
+        if healthy == len(self.replicas.engines):
+            return "up"
+        return "degraded" if healthy else "down"
+
     async def _check_redis(self) -> str:
-        if not settings.redis_url:
+        client = get_redis()
+        if client is None:
             return "skipped"
 
         try:
-            import redis.asyncio as aioredis  # type: ignore[import-not-found]
-
-            client = aioredis.from_url(settings.redis_url)
             await client.ping()
-            await client.aclose()
             return "up"
         except Exception:
             await logger.aexception("redis_health_check_failed")
@@ -0,0 +1,104 @@
+import uuid
+from collections.abc import Awaitable, Callable
+
+from features.items.schema import ItemListResponse, ItemResponse
+from shared.config import settings
+from shared.lib.cache import CacheBackend, get_cache_backend, read_through
+from shared.lib.metrics import CACHE_REQUESTS
+
+_LIST_VERSION_KEY = "items:list-version"
+
+# Far longer than CACHE_TTL plus any load, so entries cached under a version have
+# expired before its counter does and a reset to 0 cannot revive them
+_ITEM_VERSION_TTL = 86_400.0
+
+
+class ItemCache:
+    """Read-through cache for item payloads.
+
+    Cache keys embed a version number: one per item, and one for all list pages.
+    Every write bumps the versions it affects, orphaning the old entries. A load that
+    started before the write stores its result under the old key, where no later read
+    looks, so it cannot put a stale payload back. Loaders must read the primary for the
+    same reason: a replica may still return the row as it was before the write.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float) -> None:
+        self.backend = backend
+        self.ttl = ttl
+
+    async def get_item(
+        self, item_id: uuid.UUID, loader: Callable[[], Awaitable[ItemResponse]]
+    ) -> ItemResponse:
+        version = int(await self.backend.get(_item_version_key(item_id)) or 0)
+        key = f"{_item_key(item_id)}:{version}"
+        return await read_through(self.backend, key, ItemResponse, loader, self.ttl, "items.get")
+
+    async def get_items(
+        self,
+        item_ids: list[uuid.UUID],
+        loader: Callable[[list[uuid.UUID]], Awaitable[dict[uuid.UUID, ItemResponse]]],
+    ) -> dict[uuid.UUID, ItemResponse]:
+        """The items among item_ids that exist, keyed by id.
+
+        Versions and payloads are each read with one bulk GET, and every miss is
+        resolved by a single loader call whose results are stored in one round trip.
+        """
+        ids = list(dict.fromkeys(item_ids))
+        versions = await self.backend.get_many([_item_version_key(item_id) for item_id in ids])
+        keys = {
+            item_id: f"{_item_key(item_id)}:{int(version or 0)}"
+            for item_id, version in zip(ids, versions, strict=True)
+        }
+        found: dict[uuid.UUID, ItemResponse] = {}
+        missing: list[uuid.UUID] = []
+        cached = await self.backend.get_many(list(keys.values()))
+        for item_id, value in zip(keys, cached, strict=True):
+            if value is None:
+                missing.append(item_id)
+            else:
+                found[item_id] = ItemResponse.model_validate_json(value)
+        CACHE_REQUESTS.labels("items.get", "hit").inc(len(found))
+        if not missing:
+            return found
+        CACHE_REQUESTS.labels("items.get", "miss").inc(len(missing))
+
+        loaded = await loader(missing)
+        if loaded:
+            entries = {
+                keys[item_id]: item.model_dump_json().encode() for item_id, item in loaded.items()
+            }
+            await self.backend.set_many(entries, self.ttl)
+        return found | loaded
+
+    async def get_list(
+        self, params: str, loader: Callable[[], Awaitable[ItemListResponse]]
+    ) -> ItemListResponse:
+        version = int(await self.backend.get(_LIST_VERSION_KEY) or 0)
+        key = f"items:list:{version}:{params}"
+        return await read_through(
+            self.backend, key, ItemListResponse, loader, self.ttl, "items.list"
+        )
+
+    async def invalidate(self, *item_ids: uuid.UUID) -> None:
+        for item_id in item_ids:
+            await self.backend.incr(_item_version_key(item_id), _ITEM_VERSION_TTL)
+        await self.backend.incr(_LIST_VERSION_KEY)
+
+
+def _item_key(item_id: uuid.UUID) -> str:
+    return f"items:item:{item_id}"
+
+
+def _item_version_key(item_id: uuid.UUID) -> str:
+    return f"items:item-version:{item_id}"
+
+
+def get_item_cache() -> ItemCache | None:
+    """The configured item cache, or None when CACHE_TTL is 0 or there is no backend."""
+    if settings.cache_ttl <= 0:
+        return None
+    backend = get_cache_backend()
+    if backend is None:
+        return None
+    return ItemCache(backend, settings.cache_ttl)
@@ -0,0 +1,71 @@
+"""Command-line bulk import of items.
+
+    uv run python -m features.items.cli import items.csv --rejected rejected.ndjson
+
+The format follows the file extension (.csv, otherwise NDJSON) unless --format is given.
+Rejected rows are written as NDJSON objects with line, error and raw fields.
+"""
+
+import argparse
+import asyncio
+import sys
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import TextIO
+
+from features.items.cache import get_item_cache
+from features.items.repository import ItemRepository
+from features.items.schema import FileFormat, ItemImportRejection
+from features.items.service import ItemService
+from shared.db.engine import get_database
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+async def _file_chunks(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as source:
+        while chunk := source.read(READ_CHUNK_SIZE):
+            yield chunk
+
+
+async def _import(path: Path, import_format: FileFormat, rejected: TextIO | None) -> int:
+    def write_rejection(rejection: ItemImportRejection) -> None:
+        if rejected is not None:
+            rejected.write(rejection.model_dump_json() + "\n")
+
+    database = get_database()
+    try:
+        async with database.session_factory() as session:
+            service = ItemService(ItemRepository(session), cache=get_item_cache())
+            result = await service.import_items(
+                _file_chunks(path), import_format, on_reject=write_rejection
+            )
+    finally:
+        await database.dispose()
+
+    sys.stdout.write(
+        f"Imported {result.imported} rows, rejected {result.rejected} "
+        f"in {result.elapsed_seconds:.2f}s ({result.rows_per_second:.0f} rows/sec)\n"
+    )
+    return 1 if result.rejected else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m features.items.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="Bulk-load items from NDJSON or CSV")
+    import_parser.add_argument("path", type=Path)
+    import_parser.add_argument("--format", choices=[f.value for f in FileFormat])
+    import_parser.add_argument("--rejected", type=Path, help="Write rejected rows here")
+    args = parser.parse_args(argv)
+
+    path: Path = args.path
+    import_format = FileFormat(args.format or ("csv" if path.suffix == ".csv" else "ndjson"))
+    if args.rejected is None:
+        return asyncio.run(_import(path, import_format, None))
+    with args.rejected.open("w") as rejected:
+        return asyncio.run(_import(path, import_format, rejected))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""NDJSON and CSV encoding for item export and parsing for item import."""
+
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from features.items.repository import ItemRow
+from features.items.schema import FileFormat, ItemResponse
+from shared.lib.exceptions import ValidationException
+
+CSV_COLUMNS = ("id", "name", "description", "created_at", "updated_at")
+
+# Longest line, and longest CSV record spanning lines, an import accepts; longer ones
+# are rejected without being buffered whole
+MAX_LINE_BYTES = 1 << 20
+MAX_RECORD_LENGTH = 1 << 20
+
+# Characters of an over-long line or record echoed back in its rejection
+RAW_PREVIEW_LENGTH = 200
+
+
+def csv_header() -> bytes:
+    return (",".join(CSV_COLUMNS) + "\r\n").encode()
+
+
+def encode_ndjson(rows: Sequence[ItemRow]) -> bytes:
+    lines = (ItemResponse.model_validate(row).model_dump_json() for row in rows)
+    return "".join(f"{line}\n" for line in lines).encode()
+
+
+def encode_csv(rows: Sequence[ItemRow]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(
+        (row.id, row.name, row.description, row.created_at.isoformat(), row.updated_at.isoformat())
+        for row in rows
+    )
+    return buffer.getvalue().encode()
+
+
+@dataclass(frozen=True)
+class ImportRecord:
+    """One input record: parsed fields, or the reason it could not be parsed."""
+
+    line: int
+    raw: str
+    fields: dict[str, Any] | None = None
+    error: str | None = None
+
+
+async def _lines(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[tuple[int, bytes, str | None]]:
+    # Split on raw bytes: b"\n" never occurs inside a multi-byte UTF-8 sequence, so
+    # every line can be decoded on its own and a bad byte only rejects its own line
+    too_long = f"Line is longer than {MAX_LINE_BYTES} bytes"
+    pending = b""
+    # Start of the line being dropped for its length, kept for the rejection
+    head: bytes | None = None
+    number = 0
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            number += 1
+            if head is not None:
+                yield number, head, too_long
+                head = None
+            elif len(line) > MAX_LINE_BYTES:
+                yield number, line[:RAW_PREVIEW_LENGTH], too_long
+            else:
+                yield number, line.removesuffix(b"\r"), None
+        if head is None and len(pending) > MAX_LINE_BYTES:
+            head = pending[:RAW_PREVIEW_LENGTH]
+        if head is not None:
+            pending = b""
+    if head is not None:
+        yield number + 1, head, too_long
+    elif pending:
+        yield number + 1, pending.removesuffix(b"\r"), None
+
+
+async def _decoded(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, str, str | None]]:
+    async for number, line, error in _lines(chunks):
+        if error is not None:
+            yield number, line.decode(errors="replace"), error
+            continue
+        try:
+            yield number, line.decode(), None
+        except UnicodeDecodeError:
+            yield number, line.decode(errors="replace"), "Line is not valid UTF-8"
+
+
+async def _parse_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[ImportRecord]:
+    async for number, text, error in _decoded(chunks):
+        if error is not None:
+            yield ImportRecord(number, text, error=error)
+            continue
+        if not text.strip():
+            continue
+        try:
+            fields = json.loads(text)
+        except json.JSONDecodeError:
+            yield ImportRecord(number, text, error="Invalid JSON")
+            continue
+        if not isinstance(fields, dict):
+            yield ImportRecord(number, text, error="Expected a JSON object")
+            continue
+        yield ImportRecord(number, text, fields=fields)
+
+
+def _ends_quoted(line: str, quoted: bool) -> bool:
+    """Whether a quoted field is still open at the end of ``line``.
+
+    ``quoted`` tells whether one was open at its start. Follows csv.reader's default
+    dialect: only a quote that starts a field opens one, so a quote inside an unquoted
+    field is literal, and "" inside a quoted field is an escaped quote.
+    """
+    index = line.find('"')
+    while index >= 0:
+        if quoted:
+            if line.startswith('"', index + 1):
+                index += 1
+            else:
+                quoted = False
+        elif index == 0 or line[index - 1] == ",":
+            quoted = True
+        index = line.find('"', index + 1)
+    return quoted
+
+
+async def _parse_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[ImportRecord]:
+    header: list[str] | None = None
+    # Physical lines of the record being assembled, their length and the line it started on
+    parts: list[str] = []
+    length = 0
+    start = 0
+    quoted = False
+    async for number, text, error in _decoded(chunks):
+        if error is not None:
+            yield ImportRecord(number, text, error=error)
+            continue
+        start = start or number
+        parts.append(text)
+        length += len(text) + 1
+        quoted = _ends_quoted(text, quoted)
+        if quoted and length <= MAX_RECORD_LENGTH:
+            continue
+        record = "\n".join(parts)
+        line, start, parts, length = start, 0, [], 0
+        if quoted:
+            # Give up on the record; the lines after it are read as new records
+            quoted = False
+            message = f"Record is longer than {MAX_RECORD_LENGTH} characters"
+            yield ImportRecord(line, record[:RAW_PREVIEW_LENGTH], error=message)
+            continue
+        if not record.strip():
+            continue
+        try:
+            values = next(csv.reader([record]))
+        except csv.Error as exc:
+            if header is None:
+                raise ValidationException(f"Invalid CSV header: {exc}") from exc
+            yield ImportRecord(line, record, error=f"Invalid CSV: {exc}")
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            if "name" not in header:
+                raise ValidationException("CSV header must include a name column")
+            continue
+        if len(values) != len(header):
+            message = f"Expected {len(header)} columns, got {len(values)}"
+            yield ImportRecord(line, record, error=message)
+            continue
+        # Empty cells mean "not set", so optional columns fall back to their defaults
+        fields = {name: value for name, value in zip(header, values, strict=True) if value}
+        yield ImportRecord(line, record, fields=fields)
+    if parts:
+        yield ImportRecord(start, "\n".join(parts), error="Unterminated quoted field")
+
+
+def parse_records(
+    chunks: AsyncIterator[bytes], file_format: FileFormat
+) -> AsyncIterator[ImportRecord]:
+    """Records from a streamed upload, read incrementally so the body is never buffered whole."""
+    if file_format == FileFormat.CSV:
+        return _parse_csv(chunks)
+    return _parse_ndjson(chunks)
@@ -1,43 +1,633 @@
+import re
+import sys
+import time
 import uuid
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from typing import Any
 
-from sqlalchemy import func, select
+import structlog
+from sqlalchemy import (
+    Boolean,
+    ColumnElement,
+    Float,
+    Row,
+    Select,
+    any_,
+    bindparam,
+    case,
+    column,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.dml import ReturningUpdate
 
+from features.items.schema import ItemListFilters, ItemSort, TotalMode
+from shared.config import settings
 from shared.db.models.item import Item
+from shared.lib.batch_loader import BatchLoader
+from shared.lib.exceptions import ValidationException
+
+logger = structlog.get_logger()
+
+
+class _CountCache:
+    """Per-process cache of the exact row count, dropped on every write.
+
+    The TTL bounds staleness from writes made by other workers. The generation
+    counter stops a count that raced with a write from being stored.
+    """
+
+    def __init__(self) -> None:
+        self._value: int | None = None
+        self._expires_at = 0.0
+        self.generation = 0
+
+    def get(self) -> int | None:
+        if self._value is None or time.monotonic() >= self._expires_at:
+            return None
+        return self._value
+
+    def set(self, value: int, generation: int) -> None:
+        ttl = settings.items_count_cache_ttl
+        if ttl <= 0 or generation != self.generation:
+            return
+        self._value = value
+        self._expires_at = time.monotonic() + ttl
+
+    def invalidate(self) -> None:
+        self.generation += 1
+        self._value = None
+
+
+count_cache = _CountCache()
+# Planner estimate of the table size for the scan guard; never invalidated, it moves slowly
+size_cache = _CountCache()
+
+# Columns a bulk update may change; each gets a "set_<name>" flag in the VALUES list
+_BULK_UPDATE_COLUMNS = ("name", "description")
+
+# Columns written by COPY; created_at and updated_at come from their server defaults
+_COPY_COLUMNS = ("id", "name", "description")
+
+type ItemRow = Row[tuple[uuid.UUID, str, str | None, datetime, datetime]]
+
+# Execution options of reads that may be served by a read replica (shared.db.routing).
+# Version lookups for conditional writes stay on the primary, and so do reads that
+# fill the item cache (replica=False): a lagging row stored under the version a write
+# just bumped would be served by every worker until it expired.
+_REPLICA = {"read_replica": True}
+
+# Columns behind each ItemSort field; ix_items_<column>_id backs every one of them
+_SORT_COLUMNS: dict[str, InstrumentedAttribute[Any]] = {
+    "created_at": Item.created_at,
+    "updated_at": Item.updated_at,
+    "name": Item.name,
+}
+
+
+def _after_prefix(prefix: str) -> str | None:
+    """The least string above every string starting with ``prefix``; None if there is none.
+
+    Bumps the last character, after dropping trailing U+10FFFF, which has no successor,
+    and skipping the surrogates, which cannot be encoded.
+    """
+    stripped = prefix.rstrip(chr(sys.maxunicode))
+    if not stripped:
+        return None
+    last = ord(stripped[-1]) + 1
+    if 0xD800 <= last <= 0xDFFF:
+        last = 0xE000
+    return stripped[:-1] + chr(last)
+
+
+def _filtered[S: Select[Any]](query: S, filters: ItemListFilters) -> S:
+    if filters.name_prefix is not None:
+        # A case-sensitive range, so ix_items_name_id serves it with bound parameters.
+        # It matches exactly the names starting with the prefix when the collation
+        # compares by code point, as "C" does (SQLite's default BINARY too).
+        query = query.where(Item.name >= filters.name_prefix)
+        upper = _after_prefix(filters.name_prefix)
+        if upper is not None:
+            query = query.where(Item.name < upper)
+    for timestamp, since, until in (
+        (Item.created_at, filters.created_since, filters.created_until),
+        (Item.updated_at, filters.updated_since, filters.updated_until),
+    ):
+        if since is not None:
+            query = query.where(timestamp >= since)
+        if until is not None:
+            query = query.where(timestamp < until)
+    if filters.has_description is not None:
+        has_description = Item.description.is_not(None)
+        query = query.where(has_description if filters.has_description else ~has_description)
+    return query
+
+
+# Filters each sort's indexes serve as a range scan, read in order and cut off by LIMIT.
+# has_description picks one of the partial indexes on created_at (see the Item model).
+_RANGE_FILTERS = {
+    "created_at": frozenset({"created_since", "created_until", "has_description"}),
+    "updated_at": frozenset({"updated_since", "updated_until"}),
+    "name": frozenset({"name_prefix"}),
+}
+
+
+def _list_indexed(filters: ItemListFilters, sort: ItemSort) -> bool:
+    """Whether an index bounds the rows a page with these filters and sort reads.
+
+    Only filters the sort's own index covers qualify. Any other filter is applied row
+    by row along the sort index, which reads the whole table when few rows match.
+    """
+    return filters.model_dump(exclude_none=True).keys() <= _RANGE_FILTERS[sort.field]
+
+
+def _count_indexed(filters: ItemListFilters) -> bool:
+    """Whether counting the rows matching these filters reads one index range only."""
+    fields = filters.model_dump(exclude_none=True).keys()
+    return any(fields <= columns for columns in _RANGE_FILTERS.values() if columns)
 
 
 class ItemRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
+        # Live as long as the repository, i.e. one request (see get_item_service)
+        self.loader: BatchLoader[uuid.UUID, Item] = BatchLoader(self._load_by_ids)
+        self.primary_loader: BatchLoader[uuid.UUID, Item] = BatchLoader(self._load_primary)
 
-    async def get_by_id(self, item_id: uuid.UUID) -> Item | None:
-        return await self.session.get(Item, item_id)
-
-    async def get_list(self, skip: int = 0, limit: int = 20) -> tuple[list[Item], int]:
-        total_result = await self.session.execute(select(func.count()).select_from(Item))
-        total = total_result.scalar_one()
+    async def get_by_id(self, item_id: uuid.UUID, replica: bool = True) -> Item | None:
+        """Load one item; concurrent calls in the same tick share one SELECT."""
+        loader = self.loader if replica else self.primary_loader
+        return await loader.load(item_id)
 
-        result = await self.session.execute(
-            select(Item).offset(skip).limit(limit).order_by(Item.created_at.desc())
+    async def get_many(self, item_ids: Sequence[uuid.UUID], replica: bool = True) -> list[Item]:
+        """The items that exist among item_ids, in no particular order."""
+        if not item_ids:
+            return []
+        result = await self.session.scalars(
+            select(Item).where(self._id_in(item_ids)).execution_options(read_replica=replica)
         )
+        return list(result.all())
+
+    def _id_in(self, item_ids: Sequence[uuid.UUID]) -> ColumnElement[bool]:
+        """``Item.id IN item_ids``; on Postgres as ``= ANY`` of one array parameter.
+
+        One parameter keeps a single prepared statement for any id count, where an
+        expanding IN renders a new statement, and plan, per list length.
+        """
+        if self.session.get_bind().dialect.name != "postgresql":
+            return Item.id.in_(item_ids)
+        ids = bindparam("ids", list(item_ids), type_=postgresql.ARRAY(Item.id.type))
+        return Item.id == any_(ids)
+
+    async def _load_by_ids(self, item_ids: list[uuid.UUID]) -> dict[uuid.UUID, Item]:
+        return {item.id: item for item in await self.get_many(item_ids)}
+
+    async def _load_primary(self, item_ids: list[uuid.UUID]) -> dict[uuid.UUID, Item]:
+        return {item.id: item for item in await self.get_many(item_ids, replica=False)}
+
+    async def warm_up(self) -> None:
+        """Run the hot reads once, so asyncpg prepares them on this session's connection.
+
+        Passed to Database.warm_up by the lifespan. Only the SQL matters, not the rows;
+        the default listing runs without its count, which would scan the table.
+        """
+        await self.get_many([uuid.uuid4()])
+        await self.get_list(total_mode=TotalMode.NONE)
+        await self.get_updated_at(uuid.uuid4())
+
+    async def get_updated_at(self, item_id: uuid.UUID) -> datetime | None:
+        """Version lookup for conditional requests without loading the row."""
+        result = await self.session.execute(select(Item.updated_at).where(Item.id == item_id))
+        return result.scalar_one_or_none()
+
+    async def get_list(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        after: tuple[datetime | str, uuid.UUID] | None = None,
+        total_mode: TotalMode = TotalMode.EXACT,
+        filters: ItemListFilters | None = None,
+        sort: ItemSort = ItemSort.CREATED_AT_DESC,
+        replica: bool = True,
+    ) -> tuple[list[Item], int | None]:
+        filters = filters or ItemListFilters()
+        query = self.list_query(skip, limit, after, filters, sort)
+        if not _list_indexed(filters, sort):
+            await self._reject_large_scan("This filter and sort combination cannot use an index")
+
+        total: int | None = None
+        if total_mode == TotalMode.EXACT:
+            if filters.is_empty:
+                total = await self.count(replica)
+            else:
+                if not _count_indexed(filters):
+                    await self._reject_large_scan(
+                        "Counting these filters would scan the table; use total=estimate or none"
+                    )
+                count_query = _filtered(select(func.count()).select_from(Item), filters)
+                count_query = count_query.execution_options(read_replica=replica)
+                total = (await self.session.execute(count_query)).scalar_one()
+        elif total_mode == TotalMode.ESTIMATE:
+            total = await self.estimate_count(filters)
+
+        result = await self.session.execute(query.execution_options(read_replica=replica))
         items = list(result.scalars().all())
 
         return items, total
 
+    def list_query(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        after: tuple[datetime | str, uuid.UUID] | None = None,
+        filters: ItemListFilters | None = None,
+        sort: ItemSort = ItemSort.CREATED_AT_DESC,
+    ) -> Select[tuple[Item]]:
+        """The statement behind get_list(): one page in ``sort`` order, ties broken by id."""
+        key = _SORT_COLUMNS[sort.field]
+        order = (key.desc(), Item.id.desc()) if sort.descending else (key, Item.id)
+        query = select(Item).order_by(*order).limit(limit)
+        if filters is not None:
+            query = _filtered(query, filters)
+        if after is not None:
+            value, item_id = after
+            row = tuple_(key, Item.id)
+            bound = tuple_(literal(value, key.type), literal(item_id, Item.id.type))
+            query = query.where(row < bound if sort.descending else row > bound)
+        else:
+            query = query.offset(skip)
+        return query
+
+    async def _reject_large_scan(self, message: str) -> None:
+        """Raise for a query no index bounds when the table has ITEMS_SCAN_GUARD_ROWS or more.
+
+        Callers decide from the allowlist above, so index-backed queries cost nothing;
+        this one looks up the table size, reusing it for ITEMS_COUNT_CACHE_TTL. Smaller
+        tables are let through: there a scan is cheap and often the planner's best choice.
+        """
+        threshold = settings.items_scan_guard_rows
+        if not threshold or self.session.get_bind().dialect.name != "postgresql":
+            return
+        size = size_cache.get()
+        if size is None:
+            generation = size_cache.generation
+            size = await self.estimate_count()
+            size_cache.set(size, generation)
+        if size >= threshold:
+            raise ValidationException(message)
+
+    async def _plan(self, query: Select[Any]) -> dict[str, Any]:
+        """The root node of the Postgres plan for ``query``, with its bound parameters."""
+        connection = await self.session.connection()
+        compiled = query.compile(dialect=connection.dialect)
+        params = tuple(compiled.params[name] for name in compiled.positiontup or ())
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params)
+        plan: dict[str, Any] = result.scalar_one()[0]["Plan"]
+        return plan
+
+    async def search(
+        self,
+        query: str,
+        limit: int = 20,
+        after: tuple[float, uuid.UUID] | None = None,
+    ) -> list[tuple[Item, float]]:
+        """Items matching ``query`` with their relevance, best first."""
+        statement = self.search_query(query, limit, after).execution_options(**_REPLICA)
+        result = await self.session.execute(statement)
+        return list(result.tuples().all())
+
+    def search_query(
+        self,
+        query: str,
+        limit: int = 20,
+        after: tuple[float, uuid.UUID] | None = None,
+    ) -> Select[tuple[Item, float]]:
+        """The statement behind search(), e.g. for EXPLAIN.
+
+        Postgres matches word prefixes in search_vector plus trigram similarity of the
+        name, so typos in names still match. Elsewhere a LIKE over the same text stands
+        in. Both rank name prefixes first.
+        """
+        match: ColumnElement[bool]
+        rank: ColumnElement[float]
+        name_prefix = Item.name.istartswith(query, autoescape=True)
+        if self.session.get_bind().dialect.name == "postgresql":
+            conditions = [name_prefix, Item.name.bool_op("%")(query)]
+            rank = func.similarity(Item.name, query, type_=Float)
+            # Every word as a prefix ("lamp" matches "lamps"); \w+ tokens need no escaping
+            words = re.findall(r"\w+", query)
+            if words:
+                tsquery = func.to_tsquery(
+                    literal_column("'simple'::regconfig"), " & ".join(f"{w}:*" for w in words)
+                )
+                conditions.append(Item.search_vector.bool_op("@@")(tsquery))
+                rank += func.ts_rank_cd(Item.search_vector, tsquery, type_=Float)
+            match = or_(*conditions)
+        else:
+            match = Item.search_vector.contains(query, autoescape=True)
+            rank = case((Item.name.icontains(query, autoescape=True), 1.0), else_=0.0)
+        rank = rank + case((name_prefix, 1.0), else_=0.0)
+        rank = rank.label("rank")
+
+        stmt = select(Item, rank).where(match).order_by(rank.desc(), Item.id.desc()).limit(limit)
+        if after is not None:
+            after_rank, item_id = after
+            stmt = stmt.where(
+                tuple_(rank, Item.id)
+                < tuple_(literal(after_rank, Float), literal(item_id, Item.id.type))
+            )
+        return stmt
+
+    async def stream_rows(
+        self,
+        created_since: datetime | None = None,
+        created_until: datetime | None = None,
+        updated_since: datetime | None = None,
+        updated_until: datetime | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Sequence[ItemRow]]:
+        """Every matching row in created_at order, in batches read from a server-side cursor.
+
+        Plain column rows, not ORM objects, so nothing accumulates in the identity map.
+        Ranges are inclusive of "since" and exclusive of "until".
+        """
+        query = (
+            select(Item.id, Item.name, Item.description, Item.created_at, Item.updated_at)
+            .order_by(Item.created_at, Item.id)
+            .execution_options(yield_per=batch_size, **_REPLICA)
+        )
+        ranges = ItemListFilters(
+            created_since=created_since,
+            created_until=created_until,
+            updated_since=updated_since,
+            updated_until=updated_until,
+        )
+        result = await self.session.stream(_filtered(query, ranges))
+        async for partition in result.partitions():
+            yield partition
+
+    async def count(self, replica: bool = True) -> int:
+        cached = count_cache.get()
+        if cached is not None:
+            return cached
+
+        generation = count_cache.generation
+        query = select(func.count()).select_from(Item).execution_options(read_replica=replica)
+        result = await self.session.execute(query)
+        total = result.scalar_one()
+        count_cache.set(total, generation)
+        return total
+
+    async def estimate_count(self, filters: ItemListFilters | None = None) -> int:
+        """Row count from planner statistics; exact count when none are available."""
+        if self.session.get_bind().dialect.name == "postgresql":
+            if filters is not None and not filters.is_empty:
+                plan = await self._plan(_filtered(select(Item.id), filters))
+                return int(plan["Plan Rows"])
+            result = await self.session.execute(
+                text(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = 'items'::regclass"
+                ).execution_options(**_REPLICA)
+            )
+            estimate = result.scalar_one_or_none()
+            # reltuples is -1 until the table has been vacuumed or analyzed
+            if estimate is not None and estimate >= 0:
+                return int(estimate)
+        if filters is not None and not filters.is_empty:
+            count_query = _filtered(select(func.count()).select_from(Item), filters)
+            return (
+                await self.session.execute(count_query.execution_options(**_REPLICA))
+            ).scalar_one()
+        return await self.count()
+
     async def create(self, **kwargs: object) -> Item:
-        item = Item(**kwargs)
-        self.session.add(item)
+        result = await self.session.scalars(insert(Item).values(**kwargs).returning(Item))
+        item = result.one()
         await self.session.commit()
-        await self.session.refresh(item)
+        count_cache.invalidate()
         return item
 
-    async def update(self, item: Item, **kwargs: object) -> Item:
-        for key, value in kwargs.items():
-            setattr(item, key, value)
+    async def update(
+        self,
+        item_id: uuid.UUID,
+        expected_updated_at: datetime | None = None,
+        **kwargs: object,
+    ) -> Item | None:
+        """Update the row; None when it does not exist or no longer has expected_updated_at."""
+        if not kwargs:
+            # Nothing to write, but the precondition still holds; read it on the primary
+            query = select(Item).where(Item.id == item_id)
+            if expected_updated_at is not None:
+                query = query.where(Item.updated_at == expected_updated_at)
+            result = await self.session.scalars(
+                query, execution_options={"populate_existing": True}
+            )
+            return result.one_or_none()
+        stmt = update(Item).where(Item.id == item_id)
+        if expected_updated_at is not None:
+            stmt = stmt.where(Item.updated_at == expected_updated_at)
+        result = await self.session.scalars(
+            stmt.values(**kwargs).returning(Item),
+            execution_options={"synchronize_session": False, "populate_existing": True},
+        )
+        item = result.one_or_none()
         await self.session.commit()
-        await self.session.refresh(item)
         return item
 
-    async def delete(self, item: Item) -> None:
-        await self.session.delete(item)
+    async def delete(
+        self, item_id: uuid.UUID, expected_updated_at: datetime | None = None
+    ) -> bool:
+        stmt = delete(Item).where(Item.id == item_id)
+        if expected_updated_at is not None:
+            stmt = stmt.where(Item.updated_at == expected_updated_at)
+        result = await self.session.scalars(stmt.returning(Item.id))
+        deleted = result.one_or_none() is not None
         await self.session.commit()
+        if deleted:
+            count_cache.invalidate()
+        return deleted
+
+    async def bulk_create(self, rows: list[dict[str, object]]) -> list[Item]:
+        """Insert all rows with one multi-row INSERT ... RETURNING and commit."""
+        try:
+            result = await self.session.scalars(
+                insert(Item).returning(Item, sort_by_parameter_order=True), rows
+            )
+            items = list(result.all())
+            await self.session.commit()
+        except SQLAlchemyError:
+            await self.session.rollback()
+            raise
+        count_cache.invalidate()
+        return items
+
+    async def copy_rows(self, rows: list[dict[str, object]]) -> None:
+        """Insert rows without returning them and commit.
+
+        Uses asyncpg's binary COPY on Postgres and one multi-row INSERT elsewhere.
+        """
+        try:
+            if self.session.get_bind().dialect.name == "postgresql":
+                await self._copy(rows)
+            else:
+                await self.session.execute(insert(Item).values(rows))
+            await self.session.commit()
+        except SQLAlchemyError:
+            await self.session.rollback()
+            raise
+        count_cache.invalidate()
+
+    async def _copy(self, rows: list[dict[str, object]]) -> None:
+        import asyncpg  # type: ignore[import-untyped]
+
+        connection = await self.session.connection()
+        raw = await connection.get_raw_connection()
+        driver = raw.driver_connection
+        assert driver is not None
+        records = [(uuid.uuid4(), row["name"], row.get("description")) for row in rows]
+        try:
+            await driver.copy_records_to_table(
+                Item.__tablename__, records=records, columns=_COPY_COLUMNS
+            )
+        except asyncpg.PostgresError as exc:
+            # The driver connection bypasses SQLAlchemy's error wrapping
+            raise DBAPIError("COPY items", None, exc) from exc
+
+    async def create_each(self, rows: list[dict[str, object]]) -> list[Item | str]:
+        """Insert rows one by one, each in a savepoint, and commit those that succeed.
+
+        Returns the created item per row, or an error message for rows that were rejected.
+        """
+        outcomes: list[Item | str] = []
+        for row in rows:
+            try:
+                async with self.session.begin_nested():
+                    result = await self.session.scalars(insert(Item).values(**row).returning(Item))
+                    outcomes.append(result.one())
+            except SQLAlchemyError:
+                await logger.awarning("item_insert_rejected", exc_info=True)
+                outcomes.append("Rejected by the database")
+        await self.session.commit()
+        count_cache.invalidate()
+        return outcomes
+
+    async def insert_each(self, rows: list[dict[str, object]]) -> list[str | None]:
+        """Insert rows one by one, each in a savepoint, and commit those that succeed.
+
+        Returns an error message per row, None for rows that were inserted.
+        """
+        errors: list[str | None] = []
+        for row in rows:
+            try:
+                async with self.session.begin_nested():
+                    await self.session.execute(insert(Item).values(**row))
+            except SQLAlchemyError:
+                await logger.awarning("item_insert_rejected", exc_info=True)
+                errors.append("Rejected by the database")
+            else:
+                errors.append(None)
+        await self.session.commit()
+        count_cache.invalidate()
+        return errors
+
+    async def bulk_update(self, changes: list[tuple[uuid.UUID, dict[str, object]]]) -> list[Item]:
+        """Apply per-row partial updates with one UPDATE ... FROM (VALUES ...) and commit.
+
+        Returns the updated rows; ids that do not exist are simply absent.
+        """
+        try:
+            result = await self.session.scalars(
+                self._bulk_update_statement(changes),
+                execution_options={"synchronize_session": False, "populate_existing": True},
+            )
+            items = list(result.all())
+            await self.session.commit()
+        except SQLAlchemyError:
+            await self.session.rollback()
+            raise
+        return items
+
+    async def update_each(
+        self, changes: list[tuple[uuid.UUID, dict[str, object]]]
+    ) -> list[Item | str | None]:
+        """Apply the changes one row at a time, each in a savepoint, and commit the rest.
+
+        Returns per change the updated item, an error message when the database rejected
+        it, or None when the id does not exist.
+        """
+        outcomes: list[Item | str | None] = []
+        for change in changes:
+            try:
+                async with self.session.begin_nested():
+                    result = await self.session.scalars(
+                        self._bulk_update_statement([change]),
+                        execution_options={
+                            "synchronize_session": False,
+                            "populate_existing": True,
+                        },
+                    )
+                    outcomes.append(result.one_or_none())
+            except SQLAlchemyError:
+                await logger.awarning("item_update_rejected", item_id=change[0], exc_info=True)
+                outcomes.append("Rejected by the database")
+        await self.session.commit()
+        return outcomes
+
+    def _bulk_update_statement(
+        self, changes: list[tuple[uuid.UUID, dict[str, object]]]
+    ) -> ReturningUpdate[tuple[Item]]:
+        """UPDATE ... FROM (VALUES ...) RETURNING the rows, one VALUES row per change."""
+        columns = [column("id", Item.id.type)]
+        for name in _BULK_UPDATE_COLUMNS:
+            columns += [column(name, Item.__table__.c[name].type), column(f"set_{name}", Boolean)]
+        data = []
+        for item_id, fields in changes:
+            row: list[object] = [item_id]
+            for name in _BULK_UPDATE_COLUMNS:
+                row += [fields.get(name), name in fields]
+            data.append(tuple(row))
+        source = values(*columns, name="changes").data(data).cte("changes")
+
+        return (
+            update(Item)
+            .add_cte(source)
+            .where(Item.id == source.c.id)
+            .values(
+                {
+                    name: case(
+                        (source.c[f"set_{name}"], source.c[name]),
+                        else_=Item.__table__.c[name],
+                    )
+                    for name in _BULK_UPDATE_COLUMNS
+                }
+            )
+            .returning(Item)
+        )
+
+    async def bulk_delete(self, item_ids: list[uuid.UUID]) -> list[uuid.UUID]:
+        """Delete all ids with one DELETE ... RETURNING and commit; returns the deleted ids."""
+        try:
+            result = await self.session.scalars(
+                delete(Item).where(self._id_in(item_ids)).returning(Item.id)
+            )
+            deleted = list(result.all())
+            await self.session.commit()
+        except SQLAlchemyError:
+            await self.session.rollback()
+            raise
+        count_cache.invalidate()
+        return deleted
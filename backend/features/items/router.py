@@ -1,35 +1,244 @@
 import uuid
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from features.items.cache import get_item_cache
 from features.items.repository import ItemRepository
-from features.items.schema import ItemCreate, ItemListResponse, ItemResponse, ItemUpdate
+from features.items.schema import (
+    MAX_MULTI_GET_IDS,
+    FileFormat,
+    ItemBatchCreate,
+    ItemBatchDelete,
+    ItemBatchResponse,
+    ItemBatchUpdate,
+    ItemCreate,
+    ItemImportResponse,
+    ItemListFilters,
+    ItemListResponse,
+    ItemResponse,
+    ItemSort,
+    ItemUpdate,
+    TotalMode,
+)
 from features.items.service import ItemService
 from shared.db.session import get_session
+from shared.lib.exceptions import ValidationException
+from shared.lib.http_cache import (
+    cache_validators,
+    check_if_match,
+    has_conditional_read,
+    is_not_modified,
+    make_etag,
+    not_modified,
+)
+from shared.lib.responses import FastJSONResponse
 
 router = APIRouter()
 
 
 def get_item_service(session: AsyncSession = Depends(get_session)) -> ItemService:
-    return ItemService(ItemRepository(session))
+    return ItemService(ItemRepository(session), cache=get_item_cache())
+
+
+def _item_etag(item_id: uuid.UUID, updated_at: datetime) -> str:
+    return make_etag(item_id, updated_at.isoformat())
+
+
+def _item_validators(item: ItemResponse) -> dict[str, str]:
+    return cache_validators(_item_etag(item.id, item.updated_at), item.updated_at)
+
+
+async def _if_match_version(
+    request: Request, item_id: uuid.UUID, service: ItemService
+) -> datetime | None:
+    """Validate If-Match and return the version the write must still see, if any."""
+    if "if-match" not in request.headers:
+        return None
+    updated_at = await service.get_current_version(item_id)
+    check_if_match(request, _item_etag(item_id, updated_at))
+    return updated_at
+
+
+def _parse_ids(values: list[str]) -> list[uuid.UUID]:
+    try:
+        ids = [uuid.UUID(part) for value in values for part in value.split(",") if part]
+    except ValueError as exc:
+        raise ValidationException("ids must be UUIDs") from exc
+    if not 0 < len(ids) <= MAX_MULTI_GET_IDS:
+        raise ValidationException(f"ids must list 1 to {MAX_MULTI_GET_IDS} item ids")
+    return list(dict.fromkeys(ids))
+
+
+def get_list_filters(
+    name_prefix: str | None = Query(
+        None, min_length=1, max_length=255, description="Case-sensitive"
+    ),
+    created_since: datetime | None = Query(None, description="Inclusive lower bound"),
+    created_until: datetime | None = Query(None, description="Exclusive upper bound"),
+    updated_since: datetime | None = Query(None, description="Inclusive lower bound"),
+    updated_until: datetime | None = Query(None, description="Exclusive upper bound"),
+    has_description: bool | None = Query(None),
+) -> ItemListFilters:
+    return ItemListFilters(
+        name_prefix=name_prefix,
+        created_since=created_since,
+        created_until=created_until,
+        updated_since=updated_since,
+        updated_until=updated_until,
+        has_description=has_description,
+    )
 
 
 @router.get("", response_model=ItemListResponse)
 async def list_items(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="Opaque next_cursor from a previous page"),
+    total: TotalMode = Query(
+        TotalMode.EXACT, description="exact count, planner estimate, or none to skip counting"
+    ),
+    sort: ItemSort = Query(
+        ItemSort.CREATED_AT_DESC, description="Sort key; a leading '-' sorts descending"
+    ),
+    filters: ItemListFilters = Depends(get_list_filters),
+    ids: list[str] | None = Query(
+        None,
+        description=f"Up to {MAX_MULTI_GET_IDS} item ids, repeated or comma-separated. "
+        "Returns the items that exist, in the order given",
+    ),
+    service: ItemService = Depends(get_item_service),
+) -> ItemListResponse | Response:
+    """Items one page at a time, or the items listed in ids.
+
+    Filter and sort combinations that Postgres could only answer by scanning a large
+    table are rejected with 422 instead of being run.
+    """
+    if ids is not None:
+        if skip or cursor is not None or not filters.is_empty:
+            raise ValidationException("ids cannot be combined with skip, cursor or filters")
+        page = await service.get_many(_parse_ids(ids))
+    else:
+        page = await service.get_list(
+            skip=skip, limit=limit, cursor=cursor, total=total, filters=filters, sort=sort
+        )
+    # The page is already a validated model: encode it directly instead of letting
+    # FastAPI revalidate it and round-trip through a dict. The body doubles as the
+    # version, which is cheaper than hashing every row's updated_at.
+    response = FastJSONResponse(page)
+    etag = make_etag(response.body)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers.update(cache_validators(etag))
+    return response
+
+
+@router.get("/search", response_model=ItemListResponse)
+async def search_items(
+    q: str = Query(min_length=1, max_length=200, description="Words to search for"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="Opaque next_cursor from a previous page"),
+    service: ItemService = Depends(get_item_service),
+) -> Response:
+    """Ranked search over name and description; total is always null."""
+    return FastJSONResponse(await service.search(q, limit=limit, cursor=cursor))
+
+
+_FILE_MEDIA_TYPES = {
+    FileFormat.NDJSON: "application/x-ndjson",
+    FileFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_items(
+    export_format: FileFormat = Query(FileFormat.NDJSON, alias="format"),
+    created_since: datetime | None = Query(None, description="Inclusive lower bound"),
+    created_until: datetime | None = Query(None, description="Exclusive upper bound"),
+    updated_since: datetime | None = Query(None, description="Inclusive lower bound"),
+    updated_until: datetime | None = Query(None, description="Exclusive upper bound"),
+    service: ItemService = Depends(get_item_service),
+) -> StreamingResponse:
+    # The next batch is only fetched once the previous chunk has been sent, so a slow
+    # client throttles the cursor instead of buffering the table in memory
+    chunks = service.export(
+        export_format,
+        created_since=created_since,
+        created_until=created_until,
+        updated_since=updated_since,
+        updated_until=updated_until,
+    )
+    return StreamingResponse(
+        chunks,
+        media_type=_FILE_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="items.{export_format}"'},
+    )
+
+
+@router.post(
+    ":import",
+    response_model=ItemImportResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                media_type: {"schema": {"type": "string"}}
+                for media_type in _FILE_MEDIA_TYPES.values()
+            },
+        }
+    },
+)
+async def import_items(
+    request: Request,
+    import_format: FileFormat = Query(FileFormat.NDJSON, alias="format"),
+    service: ItemService = Depends(get_item_service),
+) -> ItemImportResponse:
+    """Bulk-load items from a streamed NDJSON or CSV body in the export format."""
+    return await service.import_items(request.stream(), import_format)
+
+
+@router.post(":batch", response_model=ItemBatchResponse)
+async def create_items_batch(
+    data: ItemBatchCreate,
     service: ItemService = Depends(get_item_service),
-) -> ItemListResponse:
-    return await service.get_list(skip=skip, limit=limit)
+) -> ItemBatchResponse:
+    return await service.create_batch(data)
+
+
+@router.patch(":batch", response_model=ItemBatchResponse)
+async def update_items_batch(
+    data: ItemBatchUpdate,
+    service: ItemService = Depends(get_item_service),
+) -> ItemBatchResponse:
+    return await service.update_batch(data)
+
+
+@router.delete(":batch", response_model=ItemBatchResponse)
+async def delete_items_batch(
+    data: ItemBatchDelete,
+    service: ItemService = Depends(get_item_service),
+) -> ItemBatchResponse:
+    return await service.delete_batch(data)
 
 
 @router.get("/{item_id}", response_model=ItemResponse)
 async def get_item(
     item_id: uuid.UUID,
+    request: Request,
     service: ItemService = Depends(get_item_service),
-) -> ItemResponse:
-    return await service.get_by_id(item_id)
+) -> ItemResponse | Response:
+    if has_conditional_read(request):
+        # Answer revalidation from the version alone, without building the response model
+        updated_at = await service.get_version(item_id)
+        etag = _item_etag(item_id, updated_at)
+        if is_not_modified(request, etag, updated_at):
+            return not_modified(etag, updated_at)
+
+    item = await service.get_by_id(item_id)
+    return FastJSONResponse(item, headers=_item_validators(item))
 
 
 @router.post("", response_model=ItemResponse, status_code=201)
@@ -44,14 +253,21 @@ async def create_item(
 async def update_item(
     item_id: uuid.UUID,
     data: ItemUpdate,
+    request: Request,
+    response: Response,
     service: ItemService = Depends(get_item_service),
 ) -> ItemResponse:
-    return await service.update(item_id, data)
+    expected = await _if_match_version(request, item_id, service)
+    item = await service.update(item_id, data, expected_updated_at=expected)
+    response.headers.update(_item_validators(item))
+    return item
 
 
 @router.delete("/{item_id}", status_code=204)
 async def delete_item(
     item_id: uuid.UUID,
+    request: Request,
     service: ItemService = Depends(get_item_service),
 ) -> None:
-    await service.delete(item_id)
+    expected = await _if_match_version(request, item_id, service)
+    await service.delete(item_id, expected_updated_at=expected)
@@ -1,7 +1,56 @@
 import uuid
 from datetime import datetime
+from enum import StrEnum
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+MAX_BATCH_SIZE = 1000
+MAX_MULTI_GET_IDS = 100
+
+
+class TotalMode(StrEnum):
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    NONE = "none"
+
+
+class ItemSort(StrEnum):
+    """Sort keys a list can be ordered by; each is backed by an index ending in id."""
+
+    CREATED_AT_DESC = "-created_at"
+    CREATED_AT_ASC = "created_at"
+    UPDATED_AT_DESC = "-updated_at"
+    UPDATED_AT_ASC = "updated_at"
+    NAME_ASC = "name"
+    NAME_DESC = "-name"
+
+    @property
+    def field(self) -> str:
+        return self.value.removeprefix("-")
+
+    @property
+    def descending(self) -> bool:
+        return self.value.startswith("-")
+
+
+class FileFormat(StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ItemListFilters(BaseModel):
+    """Filters for GET /items. Ranges include "since" and exclude "until"."""
+
+    name_prefix: str | None = Field(None, min_length=1, max_length=255)
+    created_since: datetime | None = None
+    created_until: datetime | None = None
+    updated_since: datetime | None = None
+    updated_until: datetime | None = None
+    has_description: bool | None = None
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.model_dump(exclude_none=True)
 
 
 class ItemCreate(BaseModel):
@@ -26,4 +75,59 @@ class ItemResponse(BaseModel):
 
 class ItemListResponse(BaseModel):
     items: list[ItemResponse]
-    total: int
+    total: int | None
+    next_cursor: str | None = None
+
+
+class ItemBatchUpdateEntry(ItemUpdate):
+    id: uuid.UUID
+
+    @field_validator("name", mode="after")
+    @classmethod
+    def reject_null_name(cls, v: str | None) -> str:
+        """A name may be left out, but not cleared: the column is NOT NULL."""
+        if v is None:
+            raise ValueError("name cannot be null")
+        return v
+
+
+class ItemBatchCreate(BaseModel):
+    items: list[ItemCreate] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class ItemBatchUpdate(BaseModel):
+    items: list[ItemBatchUpdateEntry] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class ItemBatchDelete(BaseModel):
+    ids: list[uuid.UUID] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class ItemBatchResult(BaseModel):
+    index: int
+    status: int
+    id: uuid.UUID | None = None
+    item: ItemResponse | None = None
+    error: str | None = None
+
+
+class ItemBatchResponse(BaseModel):
+    results: list[ItemBatchResult]
+    succeeded: int
+    failed: int
+
+
+class ItemImportRejection(BaseModel):
+    line: int
+    error: str
+    raw: str
+
+
+class ItemImportResponse(BaseModel):
+    imported: int
+    rejected: int
+    elapsed_seconds: float
+    rows_per_second: float
+    rejections: list[ItemImportRejection] = Field(
+        description="The first rejected rows; the rejected count covers all of them"
+    )
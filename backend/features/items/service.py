@@ -1,40 +1,495 @@
+import time
 import uuid
+from collections.abc import AsyncIterator, Callable, Sequence
+from datetime import datetime
+from typing import NoReturn
 
+import structlog
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+
+from features.items.cache import ItemCache
+from features.items.formats import (
+    ImportRecord,
+    csv_header,
+    encode_csv,
+    encode_ndjson,
+    parse_records,
+)
 from features.items.repository import ItemRepository
-from features.items.schema import ItemCreate, ItemListResponse, ItemResponse, ItemUpdate
-from shared.lib.exceptions import NotFoundException
+from features.items.schema import (
+    FileFormat,
+    ItemBatchCreate,
+    ItemBatchDelete,
+    ItemBatchResponse,
+    ItemBatchResult,
+    ItemBatchUpdate,
+    ItemCreate,
+    ItemImportRejection,
+    ItemImportResponse,
+    ItemListFilters,
+    ItemListResponse,
+    ItemResponse,
+    ItemSort,
+    ItemUpdate,
+    TotalMode,
+)
+from shared.config import settings
+from shared.db.models.item import Item
+from shared.lib.exceptions import (
+    NotFoundException,
+    PreconditionFailedException,
+    ValidationException,
+)
+from shared.lib.pagination import (
+    decode_cursor,
+    decode_rank_cursor,
+    encode_cursor,
+    encode_rank_cursor,
+)
+from shared.lib.singleflight import SingleFlight
+
+logger = structlog.get_logger()
+
+# Rows per bulk statement; keeps bind parameters well below Postgres' 32767 limit
+BATCH_CHUNK_SIZE = 500
+
+# Rows fetched from the export cursor and sent to the client per chunk
+EXPORT_BATCH_SIZE = 1000
+
+# Rows validated and written per COPY; rejections echoed back in the import response
+IMPORT_BATCH_SIZE = 1000
+IMPORT_REPORTED_REJECTIONS = 100
+
+# Concurrent identical reads in this process share one load (COALESCE_READS)
+item_flights: SingleFlight[ItemResponse] = SingleFlight("items.get")
+list_flights: SingleFlight[ItemListResponse] = SingleFlight("items.list")
+
+
+def _batch_response(results: list[ItemBatchResult]) -> ItemBatchResponse:
+    results.sort(key=lambda result: result.index)
+    failed = sum(1 for result in results if result.error is not None)
+    return ItemBatchResponse(results=results, succeeded=len(results) - failed, failed=failed)
+
+
+def _chunk_failed(entries: Sequence[tuple[int, uuid.UUID | None]]) -> list[ItemBatchResult]:
+    return [
+        ItemBatchResult(index=index, status=500, id=item_id, error="Database error")
+        for index, item_id in entries
+    ]
+
+
+def _rejected(index: int, item_id: uuid.UUID | None, error: str) -> ItemBatchResult:
+    return ItemBatchResult(index=index, status=422, id=item_id, error=error)
+
+
+def _not_found(index: int, item_id: uuid.UUID) -> ItemBatchResult:
+    return ItemBatchResult(index=index, status=404, id=item_id, error=f"Item {item_id} not found")
+
+
+def _duplicate(index: int, item_id: uuid.UUID) -> ItemBatchResult:
+    return ItemBatchResult(index=index, status=422, id=item_id, error="Duplicate id in batch")
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+    )
 
 
 class ItemService:
-    def __init__(self, repository: ItemRepository) -> None:
+    def __init__(self, repository: ItemRepository, cache: ItemCache | None = None) -> None:
         self.repository = repository
+        self.cache = cache
 
     async def get_by_id(self, item_id: uuid.UUID) -> ItemResponse:
-        item = await self.repository.get_by_id(item_id)
+        async def load() -> ItemResponse:
+            if self.cache is None:
+                return await self._load_item(item_id)
+            return await self.cache.get_item(
+                item_id, lambda: self._load_item(item_id, replica=False)
+            )
+
+        if not settings.coalesce_reads:
+            return await load()
+        return await item_flights.do(item_id, load)
+
+    async def get_many(self, item_ids: list[uuid.UUID]) -> ItemListResponse:
+        """The items among item_ids that exist, in the order given.
+
+        Cached items come from one bulk cache read and the rest from one query, so the
+        request session never runs more than one statement at a time. Like every cache
+        fill, that query reads the primary.
+        """
+        if self.cache is None:
+            found = await self._load_items(item_ids)
+        else:
+            found = await self.cache.get_items(
+                item_ids, lambda ids: self._load_items(ids, replica=False)
+            )
+        items = [found[item_id] for item_id in item_ids if item_id in found]
+        return ItemListResponse(items=items, total=len(items))
+
+    async def get_version(self, item_id: uuid.UUID) -> datetime:
+        """The item's updated_at, from the cache when enabled, otherwise a narrow query."""
+        if self.cache is not None:
+            return (await self.get_by_id(item_id)).updated_at
+        return await self.get_current_version(item_id)
+
+    async def get_current_version(self, item_id: uuid.UUID) -> datetime:
+        """The item's updated_at read from the primary, for preconditions on writes.
+
+        Never cached: a stale version would fail If-Match for clients holding the
+        current ETag until the entry expired.
+        """
+        updated_at = await self.repository.get_updated_at(item_id)
+        if updated_at is None:
+            raise NotFoundException(f"Item {item_id} not found")
+        return updated_at
+
+    async def _load_items(
+        self, item_ids: list[uuid.UUID], replica: bool = True
+    ) -> dict[uuid.UUID, ItemResponse]:
+        items = await self.repository.get_many(item_ids, replica=replica)
+        return {item.id: ItemResponse.model_validate(item) for item in items}
+
+    async def _load_item(self, item_id: uuid.UUID, replica: bool = True) -> ItemResponse:
+        item = await self.repository.get_by_id(item_id, replica=replica)
         if not item:
             raise NotFoundException(f"Item {item_id} not found")
         return ItemResponse.model_validate(item)
 
-    async def get_list(self, skip: int = 0, limit: int = 20) -> ItemListResponse:
-        items, total = await self.repository.get_list(skip=skip, limit=limit)
+    async def get_list(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        cursor: str | None = None,
+        total: TotalMode = TotalMode.EXACT,
+        filters: ItemListFilters | None = None,
+        sort: ItemSort = ItemSort.CREATED_AT_DESC,
+    ) -> ItemListResponse:
+        if cursor is not None and skip:
+            raise ValidationException("skip cannot be combined with cursor")
+        filters = filters or ItemListFilters()
+        after = None
+        if cursor is not None:
+            after = decode_cursor(cursor, sort)
+            # Timestamp sorts carry a datetime, name sorts a string
+            if isinstance(after[0], str) != (sort.field == "name"):
+                raise ValidationException("Invalid cursor")
+
+        scope = filters.model_dump_json(exclude_none=True)
+        key = f"{skip}:{limit}:{cursor}:{total}:{sort}:{scope}"
+
+        async def load() -> ItemListResponse:
+            if self.cache is None:
+                return await self._load_list(skip, limit, after, total, filters, sort)
+            return await self.cache.get_list(
+                key,
+                lambda: self._load_list(skip, limit, after, total, filters, sort, replica=False),
+            )
+
+        if not settings.coalesce_reads:
+            return await load()
+        return await list_flights.do(key, load)
+
+    async def _load_list(
+        self,
+        skip: int,
+        limit: int,
+        after: tuple[datetime | str, uuid.UUID] | None,
+        total: TotalMode,
+        filters: ItemListFilters,
+        sort: ItemSort,
+        replica: bool = True,
+    ) -> ItemListResponse:
+        # Fetch one extra row to know whether another page follows
+        items, count = await self.repository.get_list(
+            skip=skip,
+            limit=limit + 1,
+            after=after,
+            total_mode=total,
+            filters=filters,
+            sort=sort,
+            replica=replica,
+        )
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            next_cursor = encode_cursor(getattr(last, sort.field), last.id, sort)
+
         return ItemListResponse(
             items=[ItemResponse.model_validate(item) for item in items],
-            total=total,
+            total=count,
+            next_cursor=next_cursor,
+        )
+
+    async def search(
+        self, query: str, limit: int = 20, cursor: str | None = None
+    ) -> ItemListResponse:
+        query = query.strip()
+        if not query:
+            raise ValidationException("Search query must not be blank")
+        after = decode_rank_cursor(cursor) if cursor is not None else None
+
+        rows = await self.repository.search(query, limit=limit + 1, after=after)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last, rank = rows[-1]
+            next_cursor = encode_rank_cursor(rank, last.id)
+
+        return ItemListResponse(
+            items=[ItemResponse.model_validate(item) for item, _ in rows],
+            total=None,
+            next_cursor=next_cursor,
+        )
+
+    async def export(
+        self,
+        export_format: FileFormat,
+        created_since: datetime | None = None,
+        created_until: datetime | None = None,
+        updated_since: datetime | None = None,
+        updated_until: datetime | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Encoded export chunks, one per cursor batch; the next batch is read on demand."""
+        encode = encode_ndjson
+        if export_format == FileFormat.CSV:
+            encode = encode_csv
+            yield csv_header()
+
+        batches = self.repository.stream_rows(
+            created_since=created_since,
+            created_until=created_until,
+            updated_since=updated_since,
+            updated_until=updated_until,
+            batch_size=EXPORT_BATCH_SIZE,
+        )
+        async for rows in batches:
+            yield encode(rows)
+
+    async def import_items(
+        self,
+        chunks: AsyncIterator[bytes],
+        import_format: FileFormat,
+        on_reject: Callable[[ItemImportRejection], None] | None = None,
+    ) -> ItemImportResponse:
+        """Validate and COPY a streamed upload in batches; bad rows are rejected, not fatal.
+
+        Each batch commits on its own, so rows written before a failure stay imported.
+        ``on_reject`` sees every rejected row (the response only echoes the first ones).
+        """
+        started = time.perf_counter()
+        imported = 0
+        rejections: list[ItemImportRejection] = []
+        rejected = 0
+
+        def reject(record: ImportRecord, error: str) -> None:
+            nonlocal rejected
+            rejected += 1
+            rejection = ItemImportRejection(line=record.line, error=error, raw=record.raw)
+            if len(rejections) < IMPORT_REPORTED_REJECTIONS:
+                rejections.append(rejection)
+            if on_reject is not None:
+                on_reject(rejection)
+
+        batch: list[tuple[ImportRecord, dict[str, object]]] = []
+        async for record in parse_records(chunks, import_format):
+            if record.error is not None or record.fields is None:
+                reject(record, record.error or "Empty record")
+                continue
+            try:
+                entry = ItemCreate.model_validate(record.fields)
+            except ValidationError as exc:
+                reject(record, _validation_message(exc))
+                continue
+            batch.append((record, entry.model_dump()))
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                imported += await self._write_import_batch(batch, reject)
+                batch = []
+        if batch:
+            imported += await self._write_import_batch(batch, reject)
+        if imported:
+            await self._invalidate()
+
+        elapsed = time.perf_counter() - started
+        await logger.ainfo("item_import", imported=imported, rejected=rejected, elapsed=elapsed)
+        return ItemImportResponse(
+            imported=imported,
+            rejected=rejected,
+            elapsed_seconds=round(elapsed, 3),
+            rows_per_second=round(imported / elapsed, 1) if elapsed else 0.0,
+            rejections=rejections,
         )
 
+    async def _write_import_batch(
+        self,
+        batch: list[tuple[ImportRecord, dict[str, object]]],
+        reject: Callable[[ImportRecord, str], None],
+    ) -> int:
+        rows = [row for _, row in batch]
+        try:
+            await self.repository.copy_rows(rows)
+            return len(rows)
+        except SQLAlchemyError:
+            await logger.awarning("item_import_batch_failed", line=batch[0][0].line, exc_info=True)
+
+        # Retry row by row so one bad row does not reject the rows around it
+        errors = await self.repository.insert_each(rows)
+        for (record, _), error in zip(batch, errors, strict=True):
+            if error is not None:
+                reject(record, error)
+        return errors.count(None)
+
     async def create(self, data: ItemCreate) -> ItemResponse:
         item = await self.repository.create(**data.model_dump())
+        await self._invalidate()
         return ItemResponse.model_validate(item)
 
-    async def update(self, item_id: uuid.UUID, data: ItemUpdate) -> ItemResponse:
-        item = await self.repository.get_by_id(item_id)
-        if not item:
-            raise NotFoundException(f"Item {item_id} not found")
-        updated = await self.repository.update(item, **data.model_dump(exclude_unset=True))
+    async def update(
+        self,
+        item_id: uuid.UUID,
+        data: ItemUpdate,
+        expected_updated_at: datetime | None = None,
+    ) -> ItemResponse:
+        updated = await self.repository.update(
+            item_id, expected_updated_at, **data.model_dump(exclude_unset=True)
+        )
+        if not updated:
+            await self._raise_write_failed(item_id, expected_updated_at)
+        await self._invalidate(item_id)
         return ItemResponse.model_validate(updated)
 
-    async def delete(self, item_id: uuid.UUID) -> None:
-        item = await self.repository.get_by_id(item_id)
-        if not item:
-            raise NotFoundException(f"Item {item_id} not found")
-        await self.repository.delete(item)
+    async def delete(
+        self, item_id: uuid.UUID, expected_updated_at: datetime | None = None
+    ) -> None:
+        if not await self.repository.delete(item_id, expected_updated_at):
+            await self._raise_write_failed(item_id, expected_updated_at)
+        await self._invalidate(item_id)
+
+    async def _raise_write_failed(
+        self, item_id: uuid.UUID, expected_updated_at: datetime | None
+    ) -> NoReturn:
+        # A conditional write also misses when the row changed after the caller read it
+        if expected_updated_at is not None and await self.repository.get_updated_at(item_id):
+            await self._invalidate(item_id)
+            raise PreconditionFailedException()
+        raise NotFoundException(f"Item {item_id} not found")
+
+    async def _invalidate(self, *item_ids: uuid.UUID) -> None:
+        # Reads issued after a write must not join a flight that started before it
+        for item_id in item_ids:
+            item_flights.forget(item_id)
+        list_flights.forget()
+        if self.cache is not None:
+            await self.cache.invalidate(*item_ids)
+
+    async def create_batch(self, data: ItemBatchCreate) -> ItemBatchResponse:
+        results: list[ItemBatchResult] = []
+        for start in range(0, len(data.items), BATCH_CHUNK_SIZE):
+            chunk = data.items[start : start + BATCH_CHUNK_SIZE]
+            indexes = range(start, start + len(chunk))
+            try:
+                outcomes = await self._create_chunk([entry.model_dump() for entry in chunk])
+            except SQLAlchemyError:
+                await logger.aexception("item_batch_create_failed", offset=start)
+                results += _chunk_failed([(index, None) for index in indexes])
+                continue
+            for index, outcome in zip(indexes, outcomes, strict=True):
+                if isinstance(outcome, str):
+                    results.append(_rejected(index, None, outcome))
+                else:
+                    response = ItemResponse.model_validate(outcome)
+                    results.append(
+                        ItemBatchResult(index=index, status=201, id=outcome.id, item=response)
+                    )
+        await self._invalidate()
+        return _batch_response(results)
+
+    async def _create_chunk(self, rows: list[dict[str, object]]) -> list[Item | str]:
+        try:
+            items = await self.repository.bulk_create(rows)
+        except SQLAlchemyError:
+            await logger.awarning("item_batch_chunk_retried", exc_info=True)
+            # Retry row by row so one bad row does not fail the rows around it
+            return await self.repository.create_each(rows)
+        return list(items)
+
+    async def update_batch(self, data: ItemBatchUpdate) -> ItemBatchResponse:
+        results: list[ItemBatchResult] = []
+        pending: list[tuple[int, uuid.UUID, dict[str, object]]] = []
+        seen: set[uuid.UUID] = set()
+        changed: list[uuid.UUID] = []
+        for index, entry in enumerate(data.items):
+            if entry.id in seen:
+                results.append(_duplicate(index, entry.id))
+                continue
+            seen.add(entry.id)
+            pending.append((index, entry.id, entry.model_dump(exclude_unset=True, exclude={"id"})))
+
+        for start in range(0, len(pending), BATCH_CHUNK_SIZE):
+            chunk = pending[start : start + BATCH_CHUNK_SIZE]
+            try:
+                outcomes = await self._update_chunk(
+                    [(item_id, fields) for _, item_id, fields in chunk]
+                )
+            except SQLAlchemyError:
+                await logger.aexception("item_batch_update_failed", offset=start)
+                results += _chunk_failed([(index, item_id) for index, item_id, _ in chunk])
+                continue
+            for (index, item_id, _), outcome in zip(chunk, outcomes, strict=True):
+                if outcome is None:
+                    results.append(_not_found(index, item_id))
+                elif isinstance(outcome, str):
+                    results.append(_rejected(index, item_id, outcome))
+                else:
+                    changed.append(item_id)
+                    response = ItemResponse.model_validate(outcome)
+                    results.append(
+                        ItemBatchResult(index=index, status=200, id=item_id, item=response)
+                    )
+        await self._invalidate(*changed)
+        return _batch_response(results)
+
+    async def _update_chunk(
+        self, changes: list[tuple[uuid.UUID, dict[str, object]]]
+    ) -> list[Item | str | None]:
+        try:
+            items = await self.repository.bulk_update(changes)
+        except SQLAlchemyError:
+            await logger.awarning("item_batch_chunk_retried", exc_info=True)
+            # Retry row by row so one bad row does not fail the rows around it
+            return await self.repository.update_each(changes)
+        updated = {item.id: item for item in items}
+        return [updated.get(item_id) for item_id, _ in changes]
+
+    async def delete_batch(self, data: ItemBatchDelete) -> ItemBatchResponse:
+        results: list[ItemBatchResult] = []
+        pending: list[tuple[int, uuid.UUID]] = []
+        seen: set[uuid.UUID] = set()
+        changed: list[uuid.UUID] = []
+        for index, item_id in enumerate(data.ids):
+            if item_id in seen:
+                results.append(_duplicate(index, item_id))
+                continue
+            seen.add(item_id)
+            pending.append((index, item_id))
+
+        for start in range(0, len(pending), BATCH_CHUNK_SIZE):
+            chunk = pending[start : start + BATCH_CHUNK_SIZE]
+            try:
+                deleted = set(await self.repository.bulk_delete([item_id for _, item_id in chunk]))
+            except SQLAlchemyError:
+                await logger.aexception("item_batch_delete_failed", offset=start)
+                results += _chunk_failed(chunk)
+                continue
+            changed += deleted
+            for index, item_id in chunk:
+                if item_id in deleted:
+                    results.append(ItemBatchResult(index=index, status=204, id=item_id))
+                else:
+                    results.append(_not_found(index, item_id))
+        await self._invalidate(*changed)
+        return _batch_response(results)
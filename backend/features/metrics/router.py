@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Response
+
+from shared.lib.metrics import render
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus scrape endpoint, aggregated across workers in multi-process mode."""
+    body, content_type = render()
+    return Response(body, media_type=content_type)
@@ -1,10 +1,17 @@
 import warnings
+from typing import Annotated
 
 from pydantic import Field, ValidationInfo, field_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 
 _LOCAL_ORIGINS = [f"http://localhost:{p}" for p in range(3000, 3016)]
 
+# Bulk transfers outlast REQUEST_TIMEOUT; set a route to 0 to remove its deadline
+_DEFAULT_TIMEOUT_ROUTES = {
+    "GET /api/v1/items/export": 300.0,
+    "POST /api/v1/items:import": 300.0,
+}
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
@@ -13,6 +20,7 @@ class Settings(BaseSettings):
     app_debug: bool = False
     postgres_port: int | None = None
     database_url: str
+    database_replica_urls: Annotated[list[str], NoDecode] = []
     redis_url: str | None = None
     cors_origins: list[str] = _LOCAL_ORIGINS
     secret_key: str = Field(min_length=32)
@@ -21,6 +29,56 @@ class Settings(BaseSettings):
     sentry_traces_sample_rate: float = Field(default=0.0, ge=0.0, le=1.0)
     sentry_environment: str | None = None
     rate_limit_default: str = "100/minute"
+    rate_limit_routes: dict[str, str] = {}
+    rate_limit_api_keys: dict[str, str] = {}
+    rate_limit_api_key_header: str = "X-API-Key"
+    rate_limit_exempt_paths: Annotated[list[str], NoDecode] = [
+        "/health",
+        "/health/live",
+        "/metrics",
+    ]
+    items_count_cache_ttl: float = Field(default=5.0, ge=0.0)
+    items_scan_guard_rows: int = Field(default=100_000, ge=0)
+    db_pool_size: int = Field(default=5, ge=1)
+    db_max_overflow: int = Field(default=10, ge=0)
+    db_pool_timeout: float = Field(default=30.0, gt=0.0)
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = Field(default=100, ge=0)
+    db_pgbouncer_mode: bool = False
+    db_replica_check_interval: float = Field(default=5.0, gt=0.0)
+    db_read_your_writes_seconds: float = Field(default=5.0, ge=0.0)
+    cache_ttl: float = Field(default=30.0, ge=0.0)
+    cache_max_entries: int = Field(default=1024, ge=1)
+    cache_local: bool = False
+    coalesce_reads: bool = True
+    request_log_sample_rate: float = Field(default=1.0, ge=0.0, le=1.0)
+    request_log_exclude_paths: Annotated[list[str], NoDecode] = ["/health", "/metrics"]
+    metrics_enabled: bool = True
+    health_cache_ttl: float = Field(default=5.0, ge=0.0)
+    health_check_timeout: float = Field(default=2.0, gt=0.0)
+    server_timing_enabled: bool = True
+    db_slow_query_ms: float = Field(default=200.0, ge=0.0)
+    db_n_plus_one_threshold: int = Field(default=10, ge=0)
+    web_concurrency: int = Field(default=0, ge=0)
+    server_bind: str = "0.0.0.0:8000"
+    server_keepalive: int = Field(default=65, ge=0)
+    server_backlog: int = Field(default=2048, ge=1)
+    server_max_requests: int = Field(default=10_000, ge=0)
+    server_max_requests_jitter: int = Field(default=1_000, ge=0)
+    server_graceful_timeout: int = Field(default=30, ge=0)
+    shutdown_drain_seconds: int = Field(default=0, ge=0)
+    db_pool_warmup: int = Field(default=2, ge=0)
+    request_timeout: float = Field(default=30.0, ge=0.0)
+    request_timeout_routes: dict[str, float] = Field(default_factory=dict, validate_default=True)
+    admission_max_in_flight: int = Field(default=200, ge=0)
+    admission_max_pool_waiters: int = Field(default=50, ge=0)
+    admission_max_pool_wait_ms: float = Field(default=1000.0, ge=0.0)
+    admission_exempt_paths: Annotated[list[str], NoDecode] = [
+        "/health",
+        "/health/live",
+        "/metrics",
+    ]
 
     @field_validator("database_url", mode="after")
     @classmethod
@@ -41,13 +99,26 @@ class Settings(BaseSettings):
             )
         return v
 
-    @field_validator("cors_origins", mode="before")
+    @field_validator(
+        "cors_origins",
+        "request_log_exclude_paths",
+        "rate_limit_exempt_paths",
+        "admission_exempt_paths",
+        "database_replica_urls",
+        mode="before",
+    )
     @classmethod
-    def parse_cors_origins(cls, v: str | list[str]) -> list[str]:
+    def parse_comma_separated(cls, v: str | list[str]) -> list[str]:
         if isinstance(v, str):
             return [origin.strip() for origin in v.split(",") if origin.strip()]
         return v
 
+    @field_validator("request_timeout_routes", mode="after")
+    @classmethod
+    def merge_default_timeouts(cls, v: dict[str, float]) -> dict[str, float]:
+        """Configured routes add to or override the defaults rather than replacing them."""
+        return _DEFAULT_TIMEOUT_ROUTES | v
+
     @property
     def is_development(self) -> bool:
         return self.app_env == "development"
@@ -56,5 +127,10 @@ class Settings(BaseSettings):
     def is_testing(self) -> bool:
         return self.app_env == "testing"
 
+    @property
+    def shutdown_request_timeout(self) -> int:
+        """Seconds in-flight requests get once draining ends, leaving a second to clean up."""
+        return max(1, self.server_graceful_timeout - self.shutdown_drain_seconds - 1)
+
 
 settings = Settings()
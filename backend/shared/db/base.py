@@ -2,7 +2,17 @@ import uuid
 from datetime import datetime
 
 from sqlalchemy import DateTime, func
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.sql import functions
+from sqlalchemy.sql.compiler import SQLCompiler
+
+
+@compiles(functions.now, "sqlite")
+def _sqlite_now(_element: functions.now, _compiler: SQLCompiler, **_kw: object) -> str:
+    # SQLite's CURRENT_TIMESTAMP has second precision and a different text format than
+    # the bound datetime parameters, which breaks keyset comparisons on created_at.
+    return "STRFTIME('%Y-%m-%d %H:%M:%f000', 'now')"
 
 
 class Base(DeclarativeBase):
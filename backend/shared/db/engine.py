@@ -1,14 +1,156 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import os
+from collections.abc import Awaitable, Callable
+from contextlib import AsyncExitStack
+from typing import Any
 
-from shared.config import settings
-
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.app_debug,
+import structlog
+from sqlalchemy import make_url, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 
-async_session_factory = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
+from shared.config import Settings, settings
+from shared.db.instrumentation import instrument_engine
+from shared.db.pool import InstrumentedAsyncQueuePool
+from shared.db.routing import ReplicaSet, RoutingSession
+
+logger = structlog.get_logger()
+
+type WarmUpQuery = Callable[[AsyncSession], Awaitable[object]]
+
+
+def engine_options(config: Settings, url: str | None = None) -> dict[str, Any]:
+    """Pool and driver options for create_async_engine, derived from Settings.
+
+    url defaults to DATABASE_URL; replicas pass their own. Only Postgres gets pool
+    tuning; SQLite (tests) keeps SQLAlchemy's defaults.
+    """
+    if make_url(url or config.database_url).get_backend_name() != "postgresql":
+        return {}
+
+    if config.db_pgbouncer_mode:
+        # PgBouncer (transaction pooling) owns pooling and cannot route prepared statements
+        return {
+            "poolclass": NullPool,
+            "connect_args": {"statement_cache_size": 0, "prepared_statement_cache_size": 0},
+        }
+
+    return {
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_size": config.db_pool_size,
+        "max_overflow": config.db_max_overflow,
+        "pool_timeout": config.db_pool_timeout,
+        "pool_recycle": config.db_pool_recycle,
+        "pool_pre_ping": config.db_pool_pre_ping,
+        "connect_args": {"prepared_statement_cache_size": config.db_statement_cache_size},
+    }
+
+
+class Database:
+    """The engines and session factory of this process.
+
+    Built by get_database() on first use (the app's lifespan, or the first request or
+    script that needs it), so importing the app opens no pools and loads no DB driver.
+    """
+
+    def __init__(self, config: Settings) -> None:
+        self.engine = create_async_engine(
+            config.database_url, echo=config.app_debug, **engine_options(config)
+        )
+
+        # A single connection of its own, so health probes never queue behind request traffic
+        health_options = engine_options(config)
+        if health_options.get("poolclass") is InstrumentedAsyncQueuePool:
+            health_options |= {
+                "poolclass": AsyncAdaptedQueuePool,
+                "pool_size": 1,
+                "max_overflow": 0,
+            }
+        self.health_engine = create_async_engine(config.database_url, **health_options)
+
+        # Each replica gets its own pool of the same size as the primary's
+        self.replicas = ReplicaSet(
+            [
+                create_async_engine(url, echo=config.app_debug, **engine_options(config, url))
+                for url in config.database_replica_urls
+            ]
+        )
+
+        for engine in [self.engine, *self.replicas.engines]:
+            instrument_engine(engine)
+
+        self.session_factory = async_sessionmaker(
+            self.engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            sync_session_class=RoutingSession,
+            replicas=self.replicas if self.replicas.engines else None,
+        )
+
+    @property
+    def engines(self) -> list[AsyncEngine]:
+        return [self.engine, self.health_engine, *self.replicas.engines]
+
+    async def warm_up(self, connections: int, *queries: WarmUpQuery) -> None:
+        """Fill the primary and replica pools with up to ``connections`` open connections.
+
+        The health engine gets its single connection. A failing engine is logged and
+        skipped, so an unreachable database does not stop the app from starting.
+        """
+        for engine in [self.engine, *self.replicas.engines]:
+            await warm_up(engine, connections, *queries)
+        await warm_up(self.health_engine, 1)
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
+
+
+async def warm_up(engine: AsyncEngine, connections: int, *queries: WarmUpQuery) -> None:
+    """Open up to ``connections`` pooled connections and run ``queries`` on each.
+
+    The connections are held together, so each one is new, then returned to the pool:
+    the first requests skip connection setup (and TLS), and asyncpg has their statements
+    prepared already. Pools that keep no connections (NullPool) are left alone.
+    """
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return
+    connections = min(connections, pool.size())
+    try:
+        async with AsyncExitStack() as stack:
+            for _ in range(connections):
+                connection = await stack.enter_async_context(engine.connect())
+                await connection.execute(text("SELECT 1"))
+                if queries:
+                    session = await stack.enter_async_context(AsyncSession(bind=connection))
+                    for query in queries:
+                        await query(session)
+    except Exception:
+        await logger.awarning(
+            "pool_warm_up_failed", engine=engine.url.render_as_string(), exc_info=True
+        )
+
+
+_database: Database | None = None
+
+
+def get_database() -> Database:
+    global _database
+    if _database is None:
+        _database = Database(settings)
+    return _database
+
+
+def _discard_pools_after_fork() -> None:
+    # Pooled connections belong to the parent; a forked worker opens its own
+    if _database is not None:
+        for engine in _database.engines:
+            engine.sync_engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_discard_pools_after_fork)
@@ -0,0 +1,96 @@
+import time
+from typing import Any
+
+import structlog
+from sqlalchemy import Engine, event
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import ConnectionPoolEntry, PoolProxiedConnection
+
+from shared.config import settings
+from shared.db.profiling import SlowQuery, is_slow, query_profile
+from shared.lib.metrics import DB_POOL_CHECKED_OUT, DB_QUERIES, DB_QUERY_DURATION, current_route
+
+logger = structlog.get_logger()
+
+_STARTS = "metrics_query_starts"
+
+# Slow statements are explained later through the async engine they ran on
+_async_engines: dict[Engine, AsyncEngine] = {}
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Time every statement engine runs, for metrics and per-request profiling.
+
+    Query count and duration are recorded per route, along with pool checkouts, when
+    METRICS_ENABLED is set. The route comes from the request being served (see
+    MetricsMiddleware); queries run outside a request, such as health checks from
+    background tasks, are labelled "none". Statements are also added to the request's
+    QueryProfile (see shared.db.profiling).
+    """
+    sync_engine = engine.sync_engine
+    _async_engines[sync_engine] = engine
+    event.listen(sync_engine, "before_cursor_execute", _before_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_execute)
+    event.listen(sync_engine, "handle_error", _on_error)
+    if settings.metrics_enabled:
+        event.listen(sync_engine.pool, "checkout", _on_checkout)
+        event.listen(sync_engine.pool, "checkin", _on_checkin)
+
+
+def _before_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+    conn.info.setdefault(_STARTS, []).append(time.perf_counter())
+
+
+def _after_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    starts = conn.info.get(_STARTS)
+    if not starts:
+        return
+    duration = time.perf_counter() - starts.pop()
+    if settings.metrics_enabled:
+        route = current_route()
+        DB_QUERIES.labels(route).inc()
+        DB_QUERY_DURATION.labels(route).observe(duration)
+
+    if context is not None and not context.execution_options.get("profile", True):
+        return
+    profile = query_profile.get()
+    if profile is not None:
+        profile.record(statement, duration)
+    if is_slow(duration):
+        engine = _async_engines.get(conn.engine)
+        if profile is not None and engine is not None and not executemany:
+            profile.slow.append(SlowQuery(engine, statement, parameters, duration))
+        else:
+            # Outside a request there is no point after which to fetch the plan
+            logger.warning(
+                "slow_query",
+                route=current_route(),
+                statement=statement,
+                duration_ms=round(duration * 1000, 2),
+            )
+
+
+def _on_error(context: ExceptionContext) -> None:
+    # Failed statements never reach after_cursor_execute
+    if context.connection is not None and context.execution_context is not None:
+        starts = context.connection.info.get(_STARTS)
+        if starts:
+            starts.pop()
+
+
+def _on_checkout(
+    dbapi_connection: Any, record: ConnectionPoolEntry, proxy: PoolProxiedConnection
+) -> None:
+    DB_POOL_CHECKED_OUT.inc()
+
+
+def _on_checkin(dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+    DB_POOL_CHECKED_OUT.dec()
@@ -0,0 +1,53 @@
+"""add items search
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+Adds a stored tsvector over name and description with a GIN index, and a trigram
+GIN index on name for prefix and fuzzy matches. Adding the generated column
+rewrites the table, so run it in a maintenance window on large tables.
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0003"
+down_revision: str | None = "0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column(
+        "items",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "to_tsvector('simple'::regconfig, "
+                "coalesce(name, '') || ' ' || coalesce(description, ''))",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index("ix_items_search_vector", "items", ["search_vector"], postgresql_using="gin")
+    op.create_index(
+        "ix_items_name_trgm",
+        "items",
+        ["name"],
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_items_name_trgm", table_name="items")
+    op.drop_index("ix_items_search_vector", table_name="items")
+    op.drop_column("items", "search_vector")
@@ -0,0 +1,41 @@
+"""add items sort indexes
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+Indexes for listing items by updated_at and by name. They are built CONCURRENTLY,
+outside a transaction, so writes to a large items table are not blocked meanwhile.
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0004"
+down_revision: str | None = "0003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_items_updated_at_id",
+            "items",
+            ["updated_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_items_name_id",
+            "items",
+            ["name", "id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_items_name_id", table_name="items", postgresql_concurrently=True)
+        op.drop_index("ix_items_updated_at_id", table_name="items", postgresql_concurrently=True)
@@ -0,0 +1,53 @@
+"""add items description indexes
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+Partial indexes backing has_description filters on the default created_at sort, one
+for items with a description and one for those without. Built CONCURRENTLY, outside a
+transaction, so writes to a large items table are not blocked meanwhile.
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0005"
+down_revision: str | None = "0004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_items_described_created_at_id",
+            "items",
+            [sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_where=sa.text("description IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_items_undescribed_created_at_id",
+            "items",
+            [sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_where=sa.text("description IS NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_items_undescribed_created_at_id",
+            table_name="items",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_items_described_created_at_id",
+            table_name="items",
+            postgresql_concurrently=True,
+        )
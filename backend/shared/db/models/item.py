@@ -1,11 +1,85 @@
-from sqlalchemy import String, Text
+from sqlalchemy import Computed, Connection, Index, String, Text, event, literal_column
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.functions import FunctionElement
 
 from shared.db.base import Base
 
 
+class SearchDocument(FunctionElement[str]):
+    """Searchable text of an item: a tsvector on Postgres, plain text elsewhere."""
+
+    inherit_cache = True
+    name = "search_document"
+
+
+@compiles(SearchDocument)
+def _search_document(element: SearchDocument, compiler: SQLCompiler, **kw: object) -> str:
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(SearchDocument, "postgresql")
+def _pg_search_document(element: SearchDocument, compiler: SQLCompiler, **kw: object) -> str:
+    # 'simple' skips stemming and stop words, so it works for any content language
+    return f"to_tsvector('simple'::regconfig, {compiler.process(element.clauses, **kw)})"
+
+
 class Item(Base):
     __tablename__ = "items"
 
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR().with_variant(Text(), "sqlite"),
+        Computed(
+            SearchDocument(
+                literal_column("coalesce(name, '') || ' ' || coalesce(description, '')")
+            ),
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
+
+# Back keyset pagination for each list sort key; Postgres scans them in either direction
+Index("ix_items_created_at_id", Item.created_at.desc(), Item.id.desc())
+Index("ix_items_updated_at_id", Item.updated_at, Item.id)
+Index("ix_items_name_id", Item.name, Item.id)
+
+# Back has_description filters on the default sort; each holds only the rows it matches
+_described = Item.description.is_not(None)
+_undescribed = Item.description.is_(None)
+Index(
+    "ix_items_described_created_at_id",
+    Item.created_at.desc(),
+    Item.id.desc(),
+    postgresql_where=_described,
+    sqlite_where=_described,
+)
+Index(
+    "ix_items_undescribed_created_at_id",
+    Item.created_at.desc(),
+    Item.id.desc(),
+    postgresql_where=_undescribed,
+    sqlite_where=_undescribed,
+)
+
+# Backs search: full-text matches on search_vector, prefix/substring matches on name
+Index("ix_items_search_vector", Item.search_vector, postgresql_using="gin").ddl_if(
+    dialect="postgresql"
+)
+Index(
+    "ix_items_name_trgm",
+    Item.name,
+    postgresql_using="gin",
+    postgresql_ops={"name": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+
+
+@event.listens_for(Base.metadata, "before_create")
+def _create_extensions(_target: object, connection: Connection, **_kw: object) -> None:
+    # gin_trgm_ops needs pg_trgm before create_all builds ix_items_name_trgm
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
@@ -0,0 +1,78 @@
+import itertools
+import time
+from dataclasses import dataclass, field
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, PoolProxiedConnection
+
+from shared.lib.metrics import DB_POOL_TIMEOUTS, DB_POOL_WAIT
+
+
+@dataclass
+class PoolMetrics:
+    """Process-wide checkout counters for the instrumented pool.
+
+    ``waiting`` holds the start time of every checkout still in progress, so admission
+    control can see how many callers queue for a connection and for how long.
+    """
+
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    waiting: dict[int, float] = field(default_factory=dict)
+
+    def record(self, wait_seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += wait_seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+    def oldest_wait(self) -> float:
+        """Seconds the longest-waiting checkout in progress has waited so far."""
+        if not self.waiting:
+            return 0.0
+        return time.perf_counter() - min(self.waiting.values())
+
+
+pool_metrics = PoolMetrics()
+_checkout_ids = itertools.count()
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waited."""
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        checkout = next(_checkout_ids)
+        pool_metrics.waiting[checkout] = start
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_metrics.timeouts += 1
+            DB_POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            del pool_metrics.waiting[checkout]
+        wait = time.perf_counter() - start
+        pool_metrics.record(wait)
+        DB_POOL_WAIT.observe(wait)
+        return connection
+
+
+def pool_snapshot(pool: Pool) -> dict[str, int | float]:
+    """Current pool occupancy plus the cumulative checkout counters."""
+    snapshot: dict[str, int | float] = {
+        "checkouts": pool_metrics.checkouts,
+        "timeouts": pool_metrics.timeouts,
+        "wait_seconds_total": round(pool_metrics.wait_seconds_total, 6),
+        "wait_seconds_max": round(pool_metrics.wait_seconds_max, 6),
+        "waiting": len(pool_metrics.waiting),
+    }
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        snapshot |= {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        }
+    return snapshot
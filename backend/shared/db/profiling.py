@@ -0,0 +1,95 @@
+"""Per-request SQL profiling.
+
+QueryProfileMiddleware puts a QueryProfile in ``query_profile`` for each request; the
+engine listeners in shared.db.instrumentation add every statement the request runs.
+After the response, slow statements are logged with their plan and statements repeated
+often enough to look like an N+1 are logged as a warning. Statements executed with
+``execution_options(profile=False)`` are left out.
+"""
+
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from shared.config import settings
+
+logger = structlog.get_logger()
+
+_EXPLAIN_PREFIXES = {"postgresql": "EXPLAIN", "sqlite": "EXPLAIN QUERY PLAN"}
+
+
+@dataclass
+class SlowQuery:
+    engine: AsyncEngine
+    statement: str
+    parameters: Any
+    duration: float
+
+
+@dataclass
+class QueryProfile:
+    statements: int = 0
+    duration: float = 0.0
+    counts: Counter[str] = field(default_factory=Counter)
+    slow: list[SlowQuery] = field(default_factory=list)
+
+    def record(self, statement: str, duration: float) -> None:
+        self.statements += 1
+        self.duration += duration
+        self.counts[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements run at least threshold times, most frequent first."""
+        return [(sql, n) for sql, n in self.counts.most_common() if n >= threshold]
+
+
+query_profile: ContextVar[QueryProfile | None] = ContextVar("query_profile", default=None)
+
+
+def is_slow(duration: float) -> bool:
+    return 0 < settings.db_slow_query_ms <= duration * 1000
+
+
+async def explain(engine: AsyncEngine, statement: str, parameters: Any) -> list[str] | None:
+    """The plan of a SELECT, from a separate connection so the caller's is left alone.
+
+    Plain EXPLAIN (no ANALYZE) plans the statement without running it again.
+    """
+    prefix = _EXPLAIN_PREFIXES.get(engine.dialect.name)
+    if prefix is None or not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return None
+    try:
+        async with engine.connect() as connection:
+            result = await connection.exec_driver_sql(
+                f"{prefix} {statement}", parameters, execution_options={"profile": False}
+            )
+            return [" ".join(str(column) for column in row) for row in result]
+    except Exception:
+        await logger.awarning("explain_failed", exc_info=True)
+        return None
+
+
+async def report(profile: QueryProfile, method: str, route: str) -> None:
+    """Log the slow statements and likely N+1 patterns of a finished request."""
+    for query in profile.slow:
+        await logger.awarning(
+            "slow_query",
+            method=method,
+            route=route,
+            statement=query.statement,
+            duration_ms=round(query.duration * 1000, 2),
+            plan=await explain(query.engine, query.statement, query.parameters),
+        )
+    if settings.db_n_plus_one_threshold:
+        for statement, count in profile.repeated(settings.db_n_plus_one_threshold):
+            await logger.awarning(
+                "n_plus_one_suspected",
+                method=method,
+                route=route,
+                statement=statement,
+                count=count,
+            )
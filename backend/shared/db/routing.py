@@ -0,0 +1,119 @@
+"""Read-replica routing for ORM sessions.
+
+Statements marked with ``.execution_options(read_replica=True)`` run on a replica;
+everything else, and every read after the session has written, runs on the primary.
+Reads that must see the latest committed data (version checks before a write, for
+example) simply stay unmarked.
+"""
+
+import asyncio
+import itertools
+from collections.abc import Sequence
+from typing import Any
+
+import structlog
+from sqlalchemy import Engine, event, text
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Executable
+from sqlalchemy.sql.dml import UpdateBase
+
+logger = structlog.get_logger()
+
+
+class ReplicaSet:
+    """Read replicas picked round-robin, skipping those that failed their last check.
+
+    A replica is ejected when its health check fails or a query loses its connection,
+    and comes back after its next successful check.
+    """
+
+    def __init__(self, engines: Sequence[AsyncEngine]) -> None:
+        self.engines = list(engines)
+        self._healthy = dict.fromkeys((engine.sync_engine for engine in self.engines), True)
+        self._turn = itertools.count()
+        for engine in self.engines:
+            event.listen(engine.sync_engine, "handle_error", self._on_error)
+
+    @property
+    def healthy(self) -> int:
+        return sum(self._healthy.values())
+
+    def choose(self) -> Engine | None:
+        """The next healthy replica, or None when there is none."""
+        for _ in range(len(self.engines)):
+            engine = self.engines[next(self._turn) % len(self.engines)].sync_engine
+            if self._healthy[engine]:
+                return engine
+        return None
+
+    def eject(self, engine: Engine) -> None:
+        if self._healthy.get(engine):
+            self._healthy[engine] = False
+            logger.warning("replica_ejected", replica=engine.url.render_as_string())
+
+    def _on_error(self, context: ExceptionContext) -> None:
+        if context.is_disconnect and context.engine is not None:
+            self.eject(context.engine)
+
+    async def check(self, timeout: float = 2.0) -> list[bool]:
+        """Run SELECT 1 on every replica, ejecting or restoring each one."""
+        results = await asyncio.gather(
+            *(asyncio.wait_for(_ping(engine), timeout) for engine in self.engines),
+            return_exceptions=True,
+        )
+        for engine, result in zip(self.engines, results, strict=True):
+            if isinstance(result, BaseException):
+                self.eject(engine.sync_engine)
+            elif not self._healthy[engine.sync_engine]:
+                self._healthy[engine.sync_engine] = True
+                logger.info("replica_restored", replica=engine.url.render_as_string())
+        return [not isinstance(result, BaseException) for result in results]
+
+    async def monitor(self, interval: float) -> None:
+        """Check the replicas every interval seconds until cancelled."""
+        while True:
+            await self.check(timeout=interval)
+            await asyncio.sleep(interval)
+
+
+async def _ping(engine: AsyncEngine) -> None:
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+class RoutingSession(Session):
+    """Session that sends reads marked read_replica=True to a replica.
+
+    Each session sticks to the first replica it picks, so its reads see one
+    consistent snapshot. Once the session flushes or runs DML, or when pin_primary
+    is set, every later statement goes to the primary.
+    """
+
+    def __init__(self, *args: Any, replicas: ReplicaSet | None = None, **kw: Any) -> None:
+        super().__init__(*args, **kw)
+        self.replicas = replicas
+        self.pin_primary = False
+        self._replica: Engine | None = None
+
+    def get_bind(self, mapper: Any = None, *, clause: Any = None, **kw: Any) -> Any:
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.pin_primary = True
+        elif (
+            self.replicas is not None
+            and not self.pin_primary
+            and isinstance(clause, Executable)
+            and clause.get_execution_options().get("read_replica")
+        ):
+            if self._replica is None:
+                self._replica = self.replicas.choose()
+            if self._replica is not None:
+                return self._replica
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+def pin_primary(session: AsyncSession) -> None:
+    """Send every statement of this session to the primary."""
+    if isinstance(session.sync_session, RoutingSession):
+        session.sync_session.pin_primary = True
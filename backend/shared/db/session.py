@@ -1,10 +1,38 @@
+import math
 from collections.abc import AsyncGenerator
 
+from fastapi import Request
+from sqlalchemy import Connection, event, text
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
 
-from shared.db.engine import async_session_factory
+from shared.db.engine import get_database
+from shared.db.routing import RoutingSession, pin_primary
+from shared.middleware.read_your_writes import reads_from_primary
+from shared.middleware.timeout import remaining_time
 
+# Transaction-local, so it resets on commit or rollback before the connection is reused.
+# A bound value keeps it one prepared statement whatever the timeout.
+_STATEMENT_TIMEOUT = text("SELECT set_config('statement_timeout', :timeout, true)")
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session_factory() as session:
+
+@event.listens_for(RoutingSession, "after_begin")
+def _limit_statement_time(
+    _session: Session, _transaction: SessionTransaction, connection: Connection
+) -> None:
+    """Cap statements at the time the current request has left (see RequestTimeoutMiddleware)."""
+    remaining = remaining_time()
+    if remaining is None or connection.dialect.name != "postgresql":
+        return
+    timeout = f"{max(1, math.floor(remaining * 1000))}ms"
+    connection.execute(
+        _STATEMENT_TIMEOUT, {"timeout": timeout}, execution_options={"profile": False}
+    )
+
+
+async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    async with get_database().session_factory() as session:
+        # Clients that wrote moments ago read from the primary until replicas catch up
+        if reads_from_primary(request):
+            pin_primary(session)
         yield session
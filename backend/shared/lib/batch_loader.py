@@ -0,0 +1,66 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Mapping
+
+
+class BatchLoader[K: Hashable, V]:
+    """Resolve load() calls made in the same event-loop tick with one batch call.
+
+    Every caller that asks for a key before the loop gets back to the scheduled
+    dispatch joins the batch; duplicate keys share a result. ``batch_fn`` returns the
+    values it found, keyed by key; keys it leaves out load as None. Results are not
+    memoized past their batch, so a later load always sees fresh data.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[K]], Awaitable[Mapping[K, V]]],
+        max_batch_size: int = 1000,
+    ) -> None:
+        self._batch_fn = batch_fn
+        self._max_batch_size = max_batch_size
+        self._pending: dict[K, asyncio.Future[V | None]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.loads = 0
+        self.batches = 0
+
+    async def load(self, key: K) -> V | None:
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            future = loop.create_future()
+            self._pending[key] = future
+        self.loads += 1
+        # Shielded: a cancelled caller must not cancel the result for the others
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: list[K]) -> list[V | None]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        task = asyncio.get_running_loop().create_task(self._run(pending))
+        # The loop only keeps weak references to tasks
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, pending: dict[K, asyncio.Future[V | None]]) -> None:
+        keys = list(pending)
+        for start in range(0, len(keys), self._max_batch_size):
+            chunk = keys[start : start + self._max_batch_size]
+            self.batches += 1
+            try:
+                values = await self._batch_fn(chunk)
+            except Exception as exc:
+                for key in keys[start:]:
+                    pending[key].set_exception(exc)
+                    # Mark as retrieved so a failure nobody awaits is not logged
+                    pending[key].exception()
+                return
+            except BaseException:
+                for key in keys[start:]:
+                    pending[key].cancel()
+                raise
+            for key in chunk:
+                pending[key].set_result(values.get(key))
@@ -0,0 +1,192 @@
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Protocol
+
+import structlog
+from pydantic import BaseModel
+
+from shared.config import settings
+from shared.lib.metrics import CACHE_REQUESTS
+from shared.lib.redis import get_redis
+from shared.lib.singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis  # type: ignore[import-not-found]
+
+logger = structlog.get_logger()
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def set_many(self, entries: dict[str, bytes], ttl: float) -> None: ...
+
+    async def delete(self, *keys: str) -> None: ...
+
+    async def incr(self, key: str, ttl: float = 0) -> int: ...
+
+
+class LRUCache:
+    """In-process cache with per-entry TTL, evicting the least recently used entry."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at and time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        return [await self.get(key) for key in keys]
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        expires_at = time.monotonic() + ttl if ttl > 0 else 0.0
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def set_many(self, entries: dict[str, bytes], ttl: float) -> None:
+        for key, value in entries.items():
+            await self.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def incr(self, key: str, ttl: float = 0) -> int:
+        current = await self.get(key)
+        value = int(current or 0) + 1
+        await self.set(key, str(value).encode(), ttl)
+        return value
+
+
+class RedisCache:
+    """Redis-backed cache. Errors are logged and treated as misses so reads fall back to the DB."""
+
+    def __init__(self, client: "Redis") -> None:
+        self.client = client
+
+    async def get(self, key: str) -> bytes | None:
+        try:
+            value: bytes | None = await self.client.get(key)
+            return value
+        except Exception:
+            await logger.awarning("cache_get_failed", key=key, exc_info=True)
+            return None
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        try:
+            values: list[bytes | None] = await self.client.mget(keys)
+            return values
+        except Exception:
+            await logger.awarning("cache_get_failed", keys=len(keys), exc_info=True)
+            return [None] * len(keys)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        try:
+            await self.client.set(key, value, px=int(ttl * 1000) if ttl > 0 else None)
+        except Exception:
+            await logger.awarning("cache_set_failed", key=key, exc_info=True)
+
+    async def set_many(self, entries: dict[str, bytes], ttl: float) -> None:
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for key, value in entries.items():
+                    pipe.set(key, value, px=int(ttl * 1000) if ttl > 0 else None)
+                await pipe.execute()
+        except Exception:
+            await logger.awarning("cache_set_failed", keys=len(entries), exc_info=True)
+
+    async def delete(self, *keys: str) -> None:
+        try:
+            await self.client.delete(*keys)
+        except Exception:
+            await logger.awarning("cache_delete_failed", keys=keys, exc_info=True)
+
+    async def incr(self, key: str, ttl: float = 0) -> int:
+        try:
+            if ttl <= 0:
+                value: int = await self.client.incr(key)
+                return value
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.incr(key)
+                pipe.pexpire(key, int(ttl * 1000))
+                value, _ = await pipe.execute()
+            return value
+        except Exception:
+            await logger.awarning("cache_incr_failed", key=key, exc_info=True)
+            return 0
+
+
+_backend: CacheBackend | None = None
+
+
+def get_cache_backend() -> CacheBackend | None:
+    """Redis when REDIS_URL is set, else a per-process LRU if CACHE_LOCAL allows it.
+
+    Writes only invalidate the cache of the worker that made them, so a local cache
+    serves stale data from every other worker; it is off unless enabled explicitly.
+    """
+    global _backend
+    if _backend is None:
+        client = get_redis()
+        if client is not None:
+            _backend = RedisCache(client)
+        elif settings.cache_local:
+            _backend = LRUCache(settings.cache_max_entries)
+    return _backend
+
+
+def _forget_backend() -> None:
+    # The Redis backend holds the parent's client; shared.lib.redis drops that one too
+    global _backend
+    _backend = None
+
+
+os.register_at_fork(after_in_child=_forget_backend)
+
+_flights: SingleFlight[BaseModel] = SingleFlight("cache.read_through")
+
+
+async def read_through[M: BaseModel](
+    backend: CacheBackend,
+    key: str,
+    model: type[M],
+    loader: Callable[[], Awaitable[M]],
+    ttl: float,
+    name: str = "default",
+) -> M:
+    """Return the cached model for key, loading and storing it on a miss.
+
+    Concurrent misses for the same key in this process share a single load. Hits and
+    misses are counted under name in cache_requests_total.
+    """
+    cached = await backend.get(key)
+    if cached is not None:
+        CACHE_REQUESTS.labels(name, "hit").inc()
+        return model.model_validate_json(cached)
+    CACHE_REQUESTS.labels(name, "miss").inc()
+
+    async def load() -> BaseModel:
+        value = await loader()
+        await backend.set(key, value.model_dump_json().encode(), ttl)
+        return value
+
+    result = await _flights.do(key, load)
+    assert isinstance(result, model)
+    return result
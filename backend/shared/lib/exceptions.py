@@ -22,6 +22,11 @@ class ValidationException(AppException):
         super().__init__(message=message, status_code=422)
 
 
+class PreconditionFailedException(AppException):
+    def __init__(self, message: str = "Resource has been modified") -> None:
+        super().__init__(message=message, status_code=412)
+
+
 async def app_exception_handler(_request: Request, exc: AppException) -> JSONResponse:
     return JSONResponse(
         status_code=exc.status_code,
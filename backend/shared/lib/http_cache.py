@@ -0,0 +1,70 @@
+import hashlib
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from shared.lib.exceptions import PreconditionFailedException
+
+
+def make_etag(*parts: object) -> str:
+    """Strong ETag derived from the given version parts (or a rendered response body)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()}"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite returns naive datetimes; the database stores UTC
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+
+
+def _etag_in(header: str, etag: str, *, weak: bool) -> bool:
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    if "*" in candidates:
+        return True
+    if weak:
+        candidates = [candidate.removeprefix("W/") for candidate in candidates]
+    return etag in candidates
+
+
+def has_conditional_read(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None = None) -> bool:
+    """Evaluate If-None-Match (weak comparison), falling back to If-Modified-Since."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_in(if_none_match, etag, weak=True)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have second precision
+    return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+
+
+def check_if_match(request: Request, etag: str) -> None:
+    """Raise 412 when an If-Match header is present and does not match (strong comparison)."""
+    if_match = request.headers.get("if-match")
+    if if_match is not None and not _etag_in(if_match, etag, weak=False):
+        raise PreconditionFailedException()
+
+
+def cache_validators(etag: str, last_modified: datetime | None = None) -> dict[str, str]:
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def not_modified(etag: str, last_modified: datetime | None = None) -> Response:
+    return Response(status_code=304, headers=cache_validators(etag, last_modified))
@@ -0,0 +1,53 @@
+"""Draining state of this worker, shared by the lifespan, /health and LifecycleMiddleware."""
+
+import asyncio
+import signal
+import threading
+import time
+from types import FrameType
+
+
+class Lifecycle:
+    """In-flight requests and whether the worker is draining.
+
+    Draining starts on SIGTERM. The server's own handler runs ``delay`` seconds later,
+    and until then the worker keeps serving while /health answers 503, so load
+    balancers can take it out of rotation before it stops accepting connections.
+    """
+
+    def __init__(self) -> None:
+        self.draining = False
+        self.in_flight = 0
+
+    def drain_on_signal(self, delay: float, signum: int = signal.SIGTERM) -> None:
+        """Wrap the handler the server installed for ``signum`` (uvicorn's sets should_exit).
+
+        A second signal is passed on straight away. Call from the lifespan, which runs
+        after the server has installed its handlers.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
+        previous = signal.getsignal(signum)
+        if not callable(previous):
+            return
+        loop = asyncio.get_running_loop()
+
+        def handle(received: int, frame: FrameType | None) -> None:
+            if self.draining or delay <= 0:
+                self.draining = True
+                previous(received, frame)
+                return
+            self.draining = True
+            loop.call_soon_threadsafe(loop.call_later, delay, previous, received, frame)
+
+        signal.signal(signum, handle)
+
+    async def wait_idle(self, timeout: float, interval: float = 0.05) -> bool:
+        """Wait until no request is in flight; False if some still are after ``timeout``."""
+        deadline = time.monotonic() + timeout
+        while self.in_flight and time.monotonic() < deadline:
+            await asyncio.sleep(interval)
+        return not self.in_flight
+
+
+lifecycle = Lifecycle()
@@ -0,0 +1,83 @@
+"""Prometheus metrics shared by the middleware, the DB layer and the caches.
+
+Under several workers, set PROMETHEUS_MULTIPROC_DIR to an empty directory before the
+workers start: every process then writes its samples to memory-mapped files there and
+/metrics aggregates them, whichever worker serves the scrape.
+"""
+
+import os
+from contextvars import ContextVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.types import Scope
+
+# Query latencies are far below request latencies, so they get finer buckets
+_DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template", ["method", "route", "status"]
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time until the last body chunk", ["method", "route"]
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests being handled", multiprocess_mode="livesum"
+)
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed per route", ["route"])
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "SQL statement execution time", ["route"], buckets=_DB_BUCKETS
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections checked out of the pools", multiprocess_mode="livesum"
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection"
+)
+DB_POOL_TIMEOUTS = Counter("db_pool_checkout_timeouts_total", "Checkouts that hit DB_POOL_TIMEOUT")
+REQUEST_TIMEOUTS = Counter(
+    "http_request_timeouts_total", "Requests cancelled at their deadline", ["route"]
+)
+REQUESTS_SHED = Counter(
+    "http_requests_shed_total", "Requests answered with 503 by admission control", ["reason"]
+)
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total", "Request log records dropped because the writer fell behind"
+)
+RATE_LIMIT_REJECTIONS = Counter("rate_limit_rejections_total", "Requests answered with 429")
+CACHE_REQUESTS = Counter("cache_requests_total", "Read-through cache lookups", ["cache", "result"])
+SINGLEFLIGHT_CALLS = Counter(
+    "singleflight_calls_total", "Calls that ran (leader) or joined (follower)", ["flight", "role"]
+)
+
+# ASGI scope of the request being handled, for labelling work done on its behalf
+request_scope: ContextVar[Scope | None] = ContextVar("request_scope", default=None)
+
+
+def route_label(scope: Scope | None) -> str:
+    """The matched route template, so ids in paths do not become label values."""
+    if scope is None:
+        return "none"
+    route = scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+def current_route() -> str:
+    return route_label(request_scope.get())
+
+
+def render() -> tuple[bytes, str]:
+    """Exposition text for every metric, aggregated across workers in multi-process mode."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)  # type: ignore[no-untyped-call]
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
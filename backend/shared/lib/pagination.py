@@ -0,0 +1,52 @@
+import base64
+import binascii
+import uuid
+from datetime import datetime
+
+from shared.lib.exceptions import ValidationException
+
+
+def _encode(*parts: object) -> str:
+    raw = "|".join(str(part) for part in parts).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode(cursor: str, parts: int = 2) -> list[str]:
+    # The last part may itself contain "|", so split from the left only
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return base64.urlsafe_b64decode(padded.encode()).decode().split("|", parts - 1)
+
+
+def encode_cursor(value: datetime | str, item_id: uuid.UUID, sort: str = "-created_at") -> str:
+    """Build an opaque keyset cursor from the last row of a page and its sort key value."""
+    tagged = f"t{value.isoformat()}" if isinstance(value, datetime) else f"s{value}"
+    return _encode(sort, item_id, tagged)
+
+
+def decode_cursor(cursor: str, sort: str = "-created_at") -> tuple[datetime | str, uuid.UUID]:
+    """Decode a cursor produced by encode_cursor for the same sort into (value, id)."""
+    try:
+        cursor_sort, item_id, tagged = _decode(cursor, parts=3)
+        if cursor_sort != sort:
+            raise ValueError("cursor belongs to another sort order")
+        tag, value = tagged[:1], tagged[1:]
+        if tag not in ("t", "s"):
+            raise ValueError("unknown cursor value type")
+        return datetime.fromisoformat(value) if tag == "t" else value, uuid.UUID(item_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValidationException("Invalid cursor") from exc
+
+
+def encode_rank_cursor(rank: float, item_id: uuid.UUID) -> str:
+    """Keyset cursor for results ordered by a relevance score."""
+    # repr() round-trips the float exactly, so the next page starts right after this row
+    return _encode(repr(rank), item_id)
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, uuid.UUID]:
+    """Decode a cursor produced by encode_rank_cursor into (rank, id)."""
+    try:
+        rank, item_id = _decode(cursor)
+        return float(rank), uuid.UUID(item_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValidationException("Invalid cursor") from exc
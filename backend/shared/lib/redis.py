@@ -0,0 +1,38 @@
+import os
+from typing import TYPE_CHECKING
+
+from shared.config import settings
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis  # type: ignore[import-not-found]
+
+_client: "Redis | None" = None
+
+
+def get_redis() -> "Redis | None":
+    """Process-wide Redis client backed by one connection pool; None without REDIS_URL."""
+    global _client
+    if not settings.redis_url:
+        return None
+    if _client is None:
+        import redis.asyncio as aioredis  # type: ignore[import-not-found]
+
+        _client = aioredis.from_url(settings.redis_url)
+    return _client
+
+
+async def close_redis() -> None:
+    """Close the client's pooled connections; a later get_redis() starts a new client."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _forget_client() -> None:
+    # A forked worker must not share the parent's sockets; it connects on first use
+    global _client
+    _client = None
+
+
+os.register_at_fork(after_in_child=_forget_client)
@@ -0,0 +1,17 @@
+from typing import Any
+
+from pydantic_core import to_json
+from starlette.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded by pydantic-core instead of the stdlib json module.
+
+    Accepts Pydantic models directly, so a handler can return
+    ``FastJSONResponse(model)`` and skip FastAPI's validate-then-serialize pass.
+    Datetimes and UUIDs are encoded the same way as ``model_dump_json``; NaN and
+    infinity become null so the body is always valid JSON.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content, inf_nan_mode="null")
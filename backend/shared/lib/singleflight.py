@@ -0,0 +1,97 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TYPE_CHECKING, Any
+
+from shared.lib.metrics import SINGLEFLIGHT_CALLS
+
+if TYPE_CHECKING:
+    from prometheus_client import Counter
+
+# Named instances, reported by flight_snapshot()
+_registry: dict[str, "SingleFlight[Any]"] = {}
+
+
+class SingleFlight[T]:
+    """Collapse concurrent calls with the same key into one in-flight call.
+
+    The first caller (the leader) runs the function; callers arriving while it is in
+    flight await the leader's result instead of repeating the work. If the leader is
+    cancelled, a waiting caller takes over rather than being cancelled with it.
+    """
+
+    def __init__(self, name: str | None = None) -> None:
+        self._calls: dict[Hashable, asyncio.Future[T]] = {}
+        self.leaders = 0
+        self.followers = 0
+        self._leader_calls: Counter | None = None
+        self._follower_calls: Counter | None = None
+        if name is not None:
+            _registry[name] = self
+            self._leader_calls = SINGLEFLIGHT_CALLS.labels(name, "leader")
+            self._follower_calls = SINGLEFLIGHT_CALLS.labels(name, "follower")
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of calls that were served by another caller's flight."""
+        calls = self.leaders + self.followers
+        return self.followers / calls if calls else 0.0
+
+    def forget(self, key: Hashable | None = None) -> None:
+        """Let later calls for key (or every key) start a new flight.
+
+        Callers already waiting keep the old result; use after a write so that reads
+        issued after it cannot join a flight that started before it.
+        """
+        if key is None:
+            self._calls.clear()
+        else:
+            self._calls.pop(key, None)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        while (future := self._calls.get(key)) is not None:
+            self.followers += 1
+            if self._follower_calls is not None:
+                self._follower_calls.inc()
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if future.cancelled() and task is not None and not task.cancelling():
+                    continue
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        # Mark the outcome as retrieved so a failure without followers is not logged
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._calls[key] = future
+        self.leaders += 1
+        if self._leader_calls is not None:
+            self._leader_calls.inc()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            # forget() may already have replaced or dropped this flight
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+
+def flight_snapshot() -> dict[str, dict[str, int | float]]:
+    """Per-process call counters of every named SingleFlight."""
+    return {
+        name: {
+            "leaders": flight.leaders,
+            "followers": flight.followers,
+            "hit_rate": round(flight.hit_rate, 4),
+            "in_flight": len(flight._calls),
+        }
+        for name, flight in _registry.items()
+    }
@@ -0,0 +1,77 @@
+from fastapi import FastAPI
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from shared.config import settings
+from shared.db.pool import PoolMetrics, pool_metrics
+from shared.lib.lifecycle import Lifecycle, lifecycle
+from shared.lib.metrics import REQUESTS_SHED
+
+
+class AdmissionControlMiddleware:
+    """Pure ASGI middleware answering 503 with Retry-After when this worker is overloaded.
+
+    A request is shed when the worker already handles ``max_in_flight`` requests, or when
+    callers queue for a database connection: more than ``max_pool_waiters`` at once, or
+    the longest of them waiting over ``max_pool_wait`` seconds. Shedding early keeps the
+    latency of admitted requests bounded instead of queueing everything behind the pool.
+    A limit of 0 turns that check off.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_in_flight: int,
+        max_pool_waiters: int,
+        max_pool_wait: float,
+        retry_after: int = 1,
+        exempt_paths: list[str] | None = None,
+        state: Lifecycle = lifecycle,
+        pool: PoolMetrics = pool_metrics,
+    ) -> None:
+        self.app = app
+        self.max_in_flight = max_in_flight
+        self.max_pool_waiters = max_pool_waiters
+        self.max_pool_wait = max_pool_wait
+        self.retry_after = retry_after
+        self.exempt_paths = frozenset(exempt_paths or [])
+        self.state = state
+        self.pool = pool
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        reason = self._overload()
+        if reason is None:
+            await self.app(scope, receive, send)
+            return
+
+        REQUESTS_SHED.labels(reason=reason).inc()
+        response = JSONResponse(
+            {"detail": "Server is overloaded. Try again later."},
+            status_code=503,
+            headers={"Retry-After": str(self.retry_after)},
+        )
+        await response(scope, receive, send)
+
+    def _overload(self) -> str | None:
+        # LifecycleMiddleware, further out, has already counted this request
+        if self.max_in_flight and self.state.in_flight > self.max_in_flight:
+            return "in_flight"
+        if self.max_pool_waiters and len(self.pool.waiting) > self.max_pool_waiters:
+            return "pool_waiters"
+        if self.max_pool_wait and self.pool.oldest_wait() > self.max_pool_wait:
+            return "pool_wait"
+        return None
+
+
+def add_admission_control_middleware(app: FastAPI) -> None:
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        max_in_flight=settings.admission_max_in_flight,
+        max_pool_waiters=settings.admission_max_pool_waiters,
+        max_pool_wait=settings.admission_max_pool_wait_ms / 1000,
+        exempt_paths=settings.admission_exempt_paths,
+    )
@@ -10,5 +10,21 @@ def add_cors_middleware(app: FastAPI) -> None:
         allow_origins=settings.cors_origins,
         allow_credentials=True,
         allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-        allow_headers=["Content-Type", "Authorization"],
+        allow_headers=[
+            "Content-Type",
+            "Authorization",
+            "If-Match",
+            "If-None-Match",
+            "If-Modified-Since",
+            "X-API-Key",
+        ],
+        expose_headers=[
+            "ETag",
+            "Last-Modified",
+            "RateLimit-Limit",
+            "RateLimit-Remaining",
+            "RateLimit-Reset",
+            "RateLimit-Policy",
+            "Retry-After",
+        ],
     )
@@ -0,0 +1,32 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from shared.lib.lifecycle import Lifecycle, lifecycle
+
+
+class LifecycleMiddleware:
+    """Pure ASGI middleware counting in-flight requests for graceful shutdown.
+
+    While the worker drains, responses carry ``Connection: close`` so keep-alive
+    clients reconnect, and land on a worker that is not stopping.
+    """
+
+    def __init__(self, app: ASGIApp, state: Lifecycle = lifecycle) -> None:
+        self.app = app
+        self.state = state
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_closing(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.state.draining:
+                MutableHeaders(scope=message)["connection"] = "close"
+            await send(message)
+
+        self.state.in_flight += 1
+        try:
+            await self.app(scope, receive, send_closing)
+        finally:
+            self.state.in_flight -= 1
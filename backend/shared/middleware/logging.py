@@ -1,28 +1,134 @@
+import os
+import queue
+import random
+import threading
 import time
+from collections.abc import Iterable
+from typing import Any
 
 import structlog
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from shared.config import settings
+from shared.db.profiling import query_profile
+from shared.lib.metrics import LOG_RECORDS_DROPPED
 
 logger = structlog.get_logger()
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        if request.url.path == "/health":
-            return await call_next(request)
+class _LogWriter:
+    """Hands log records to a daemon thread so stdout back-pressure never blocks the loop.
 
-        start_time = time.perf_counter()
-        response = await call_next(request)
-        duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
-
-        await logger.ainfo(
-            "request",
-            method=request.method,
-            path=request.url.path,
-            status=response.status_code,
-            duration_ms=duration_ms,
+    The queue is bounded; when the writer falls behind, records are dropped and counted
+    instead of growing memory or stalling requests (see log_records_dropped_total).
+    """
+
+    def __init__(self, maxsize: int = 10_000) -> None:
+        self.maxsize = maxsize
+        self._reset()
+
+    def _reset(self) -> None:
+        # Also runs in forked children: threads do not survive a fork and a lock or queue
+        # held by the parent at fork time would stay held
+        self._queue: queue.Queue[tuple[str, dict[str, Any]]] = queue.Queue(self.maxsize)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def emit(self, event: str, **fields: Any) -> None:
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait((event, fields))
+        except queue.Full:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.inc()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every queued record has been written; False if ``timeout`` ran out."""
+        with self._queue.all_tasks_done:
+            return self._queue.all_tasks_done.wait_for(
+                lambda: not self._queue.unfinished_tasks, timeout
+            )
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="request-log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            event, fields = self._queue.get()
+            try:
+                logger.info(event, **fields)
+            # A failing sink must not kill the writer thread
+            except Exception:  # nosec B110
+                pass
+            finally:
+                self._queue.task_done()
+
+
+log_writer = _LogWriter()
+os.register_at_fork(after_in_child=log_writer._reset)
+
+
+class RequestLoggingMiddleware:
+    """Pure ASGI request logger.
+
+    Timing ends when the last response body chunk is sent. Error responses (4xx/5xx)
+    are always logged; other responses are sampled at ``sample_rate``. Inside
+    QueryProfileMiddleware, the line also carries the request's SQL statement count
+    and DB time.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        exclude_paths: Iterable[str] | None = None,
+        sample_rate: float | None = None,
+    ) -> None:
+        self.app = app
+        self.exclude_paths = frozenset(
+            settings.request_log_exclude_paths if exclude_paths is None else exclude_paths
         )
+        self.sample_rate = settings.request_log_sample_rate if sample_rate is None else sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        end_time: float | None = None
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, end_time
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                end_time = time.perf_counter()
 
-        return response
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Sampling only — not security sensitive
+            if status >= 400 or random.random() < self.sample_rate:  # nosec B311
+                duration = (end_time or time.perf_counter()) - start_time
+                fields: dict[str, Any] = {}
+                profile = query_profile.get()
+                if profile is not None:
+                    fields["db_statements"] = profile.statements
+                    fields["db_ms"] = round(profile.duration * 1000, 2)
+                log_writer.emit(
+                    "request",
+                    method=scope["method"],
+                    path=scope["path"],
+                    status=status,
+                    duration_ms=round(duration * 1000, 2),
+                    **fields,
+                )
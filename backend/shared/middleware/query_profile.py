@@ -0,0 +1,41 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from shared.config import settings
+from shared.db.profiling import QueryProfile, query_profile, report
+from shared.lib.metrics import route_label
+
+
+class QueryProfileMiddleware:
+    """Pure ASGI middleware collecting the SQL statements each request runs.
+
+    Adds a ``Server-Timing: db`` header with the statement count and DB time spent
+    before the response started, and reports slow statements and likely N+1 patterns
+    once the response has been sent. Sits outside RequestLoggingMiddleware, which adds
+    the totals to its log line.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.server_timing_enabled:
+                MutableHeaders(scope=message).append(
+                    "server-timing",
+                    f'db;dur={profile.duration * 1000:.2f};desc="{profile.statements} queries"',
+                )
+            await send(message)
+
+        token = query_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            query_profile.reset(token)
+            await report(profile, scope["method"], route_label(scope))
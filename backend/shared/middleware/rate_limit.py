@@ -1,22 +1,269 @@
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from starlette.requests import Request
-from starlette.responses import JSONResponse
+import hashlib
+import json
+import math
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import structlog
+from fastapi import FastAPI
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from shared.config import settings
+from shared.lib.metrics import RATE_LIMIT_REJECTIONS
+from shared.lib.redis import get_redis
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis  # type: ignore[import-not-found]
+
+logger = structlog.get_logger()
+
+# Note: identity is the ASGI client host. Behind a reverse proxy (e.g., Caddy, Nginx),
+# run uvicorn with --proxy-headers and configure X-Forwarded-For trust at the proxy level
+# to ensure correct client IP detection.
+
+_RATE_PATTERN = re.compile(r"^\s*(\d+)\s*/\s*(second|minute|hour|day)s?\s*$")
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Token bucket: refill continuously at limit/period, allow a burst of up to limit.
+# Uses the Redis clock so every worker agrees on time. Returns tokens as a string
+# because Lua numbers are truncated to integers on the way out.
+_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+  tokens = capacity
+  ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * refill)
+local allowed = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / refill * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+
+@dataclass(frozen=True)
+class Rate:
+    limit: int
+    period: int
+
+    @classmethod
+    def parse(cls, value: str) -> "Rate":
+        """Parse 'N/second', 'N/minute', 'N/hour' or 'N/day'."""
+        match = _RATE_PATTERN.match(value)
+        if not match or int(match.group(1)) < 1:
+            raise ValueError(f"Invalid rate limit: {value!r}")
+        return cls(limit=int(match.group(1)), period=_PERIODS[match.group(2)])
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.limit / self.period
+
+
+@dataclass(frozen=True)
+class Decision:
+    allowed: bool
+    rate: Rate
+    tokens: float
+
+    @property
+    def remaining(self) -> int:
+        return max(0, math.floor(self.tokens))
+
+    @property
+    def reset_seconds(self) -> int:
+        """Seconds until the bucket is full again."""
+        return math.ceil((self.rate.limit - self.tokens) / self.rate.refill_per_second)
+
+    @property
+    def retry_after_seconds(self) -> int:
+        """Seconds until the next token is available."""
+        return max(1, math.ceil((1 - self.tokens) / self.rate.refill_per_second))
+
+
+class LocalTokenBucket:
+    """Per-process token buckets; used when Redis is not configured or unavailable."""
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def hit(self, key: str, rate: Rate) -> Decision:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (float(rate.limit), now))
+        tokens = min(rate.limit, tokens + (now - updated_at) * rate.refill_per_second)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return Decision(allowed=allowed, rate=rate, tokens=tokens)
+
+
+class RedisTokenBucket:
+    """Token buckets shared by every worker, updated atomically in one round trip."""
+
+    def __init__(self, client: "Redis") -> None:
+        self._script = client.register_script(_BUCKET_SCRIPT)
+
+    async def hit(self, key: str, rate: Rate) -> Decision:
+        allowed, tokens = await self._script(keys=[key], args=[rate.limit, rate.refill_per_second])
+        return Decision(allowed=bool(allowed), rate=rate, tokens=float(tokens))
+
+
+class RateLimiter:
+    """Redis token buckets with a local fallback.
+
+    After a Redis error the limiter stays on local buckets for ``retry_interval`` seconds
+    so an outage does not add a connection timeout to every request.
+    """
+
+    def __init__(self, redis: "Redis | None" = None, retry_interval: float = 5.0) -> None:
+        self.shared = RedisTokenBucket(redis) if redis is not None else None
+        self.local = LocalTokenBucket()
+        self.retry_interval = retry_interval
+        self.rejected = 0
+        self._redis_down_until = 0.0
+
+    async def hit(self, key: str, rate: Rate) -> Decision:
+        decision = await self._hit(key, rate)
+        if not decision.allowed:
+            self.rejected += 1
+            RATE_LIMIT_REJECTIONS.inc()
+        return decision
+
+    async def _hit(self, key: str, rate: Rate) -> Decision:
+        if self.shared is not None and time.monotonic() >= self._redis_down_until:
+            try:
+                return await self.shared.hit(key, rate)
+            except Exception:
+                self._redis_down_until = time.monotonic() + self.retry_interval
+                await logger.awarning("rate_limit_redis_unavailable", exc_info=True)
+        return await self.local.hit(key, rate)
+
+
+class RateLimitMiddleware:
+    """Pure ASGI rate limiter adding RateLimit-* headers and answering 429 with Retry-After.
+
+    The rate is chosen per request: the longest matching route rule ("METHOD /prefix" or
+    "/prefix"), else the limit configured for the caller's API key, else the default.
+    Callers are identified by a configured API key, otherwise by client IP.
+
+    Without a limiter, one is created here. Starlette builds the middleware stack on the
+    first request, so under a preloading server each worker gets its own after the fork.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        default_rate: str,
+        limiter: RateLimiter | None = None,
+        route_rates: dict[str, str] | None = None,
+        api_key_rates: dict[str, str] | None = None,
+        api_key_header: str = "X-API-Key",
+        exempt_paths: list[str] | None = None,
+    ) -> None:
+        self.app = app
+        self.limiter = limiter or RateLimiter(get_redis())
+        self.default_rate = Rate.parse(default_rate)
+        # Longest pattern first so the most specific rule wins
+        self.route_rates = sorted(
+            ((pattern, Rate.parse(rate)) for pattern, rate in (route_rates or {}).items()),
+            key=lambda rule: len(rule[0]),
+            reverse=True,
+        )
+        self.api_key_rates = {key: Rate.parse(rate) for key, rate in (api_key_rates or {}).items()}
+        self.api_key_header = api_key_header
+        self.exempt_paths = frozenset(exempt_paths or [])
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        identity, rate = self._identify(scope)
+        scope_name, rate = self._route_rate(scope) or ("default", rate)
+        decision = await self.limiter.hit(f"ratelimit:{scope_name}:{identity}", rate)
+        headers = _rate_limit_headers(decision)
+
+        if not decision.allowed:
+            headers["Retry-After"] = str(decision.retry_after_seconds)
+            await _send_json(
+                send, 429, {"detail": "Rate limit exceeded. Try again later."}, headers
+            )
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                for name, value in headers.items():
+                    response_headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _identify(self, scope: Scope) -> tuple[str, Rate]:
+        api_key = Headers(scope=scope).get(self.api_key_header)
+        # Only configured keys count; unknown keys would let a client mint fresh buckets
+        if api_key is not None and api_key in self.api_key_rates:
+            digest = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+            return f"key:{digest}", self.api_key_rates[api_key]
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}", self.default_rate
+
+    def _route_rate(self, scope: Scope) -> tuple[str, Rate] | None:
+        path = scope["path"]
+        method_path = f"{scope['method']} {path}"
+        for pattern, rate in self.route_rates:
+            target = method_path if " " in pattern else path
+            if target.startswith(pattern):
+                return pattern, rate
+        return None
+
+
+def _rate_limit_headers(decision: Decision) -> dict[str, str]:
+    return {
+        "RateLimit-Limit": str(decision.rate.limit),
+        "RateLimit-Remaining": str(decision.remaining),
+        "RateLimit-Reset": str(decision.reset_seconds),
+        "RateLimit-Policy": f"{decision.rate.limit};w={decision.rate.period}",
+    }
 
-# Note: get_remote_address uses request.client.host.
-# Behind a reverse proxy (e.g., Caddy, Nginx), configure X-Forwarded-For trust
-# at the proxy level to ensure correct client IP detection.
 
-limiter = Limiter(
-    key_func=get_remote_address,
-    default_limits=[settings.rate_limit_default],
-)
+async def _send_json(
+    send: Send, status: int, content: dict[str, Any], headers: dict[str, str]
+) -> None:
+    body = json.dumps(content).encode()
+    raw_headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+    ]
+    raw_headers += [(name.lower().encode(), value.encode()) for name, value in headers.items()]
+    await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": body})
 
 
-async def rate_limit_exceeded_handler(request: Request, exc: Exception) -> JSONResponse:
-    return JSONResponse(
-        status_code=429,
-        content={"detail": "Rate limit exceeded. Try again later."},
+def add_rate_limit_middleware(app: FastAPI) -> None:
+    app.add_middleware(
+        RateLimitMiddleware,
+        default_rate=settings.rate_limit_default,
+        route_rates=settings.rate_limit_routes,
+        api_key_rates=settings.rate_limit_api_keys,
+        api_key_header=settings.rate_limit_api_key_header,
+        exempt_paths=settings.rate_limit_exempt_paths,
     )
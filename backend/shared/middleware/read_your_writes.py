@@ -0,0 +1,63 @@
+import math
+import time
+
+from fastapi import FastAPI
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from shared.config import settings
+
+COOKIE_NAME = "read_primary_until"
+
+_UNSAFE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+def reads_from_primary(request: Request) -> bool:
+    """Whether the client wrote recently enough that replicas may not have its write yet."""
+    window = settings.db_read_your_writes_seconds
+    value = request.cookies.get(COOKIE_NAME)
+    if not window or value is None:
+        return False
+    try:
+        until = float(value)
+    except ValueError:
+        return False
+    now = time.time()
+    # Clients control the cookie, so a deadline further out than one window is ignored
+    return now < until <= now + window
+
+
+class ReadYourWritesMiddleware:
+    """Pure ASGI middleware that marks clients after a successful write.
+
+    Successful POST/PUT/PATCH/DELETE responses set a cookie holding the time until
+    which that client's reads go to the primary (see shared.db.session.get_session).
+    """
+
+    def __init__(self, app: ASGIApp, window: float) -> None:
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in _UNSAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.window
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{COOKIE_NAME}={until:.3f}; Max-Age={math.ceil(self.window)}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+def add_read_your_writes_middleware(app: FastAPI) -> None:
+    """Only useful with replicas; without them every read already hits the primary."""
+    if settings.database_replica_urls and settings.db_read_your_writes_seconds:
+        app.add_middleware(ReadYourWritesMiddleware, window=settings.db_read_your_writes_seconds)
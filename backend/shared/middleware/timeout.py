@@ -0,0 +1,119 @@
+import asyncio
+import time
+from contextvars import ContextVar
+
+import structlog
+from fastapi import FastAPI
+from sqlalchemy.exc import DBAPIError
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from shared.config import settings
+from shared.lib.metrics import REQUEST_TIMEOUTS, route_label
+
+logger = structlog.get_logger()
+
+# Postgres SQLSTATE for a statement cancelled by statement_timeout
+QUERY_CANCELED = "57014"
+
+# Monotonic time by which the request being handled must be done, if it has a deadline
+request_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+
+def remaining_time() -> float | None:
+    """Seconds left before the current request's deadline; None without a deadline."""
+    deadline = request_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def _query_canceled(exc: DBAPIError) -> bool:
+    return getattr(exc.orig, "sqlstate", None) == QUERY_CANCELED
+
+
+class RequestTimeoutMiddleware:
+    """Pure ASGI middleware giving every request a deadline, after which it is cancelled.
+
+    The timeout is chosen per request: the longest matching route rule ("METHOD /prefix"
+    or "/prefix"), else the default; 0 means no deadline. It covers sending a buffered
+    response too, so a slow client cannot hold a pooled session longer than a slow query
+    could. Sessions opened for the request carry the remaining time as Postgres
+    statement_timeout (see shared.db.session), and a statement cancelled by it is
+    answered like a timeout.
+
+    A streamed response (no Content-Length) is exempt once its headers are sent: cutting
+    it would leave the client with a truncated file and no error. Its queries keep the
+    statement_timeout their transaction began with.
+    """
+
+    def __init__(
+        self, app: ASGIApp, timeout: float, route_timeouts: dict[str, float] | None = None
+    ) -> None:
+        self.app = app
+        self.timeout = timeout
+        # Longest pattern first so the most specific rule wins
+        self.route_timeouts = sorted(
+            (route_timeouts or {}).items(), key=lambda rule: len(rule[0]), reverse=True
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        timeout = self._timeout(scope) if scope["type"] == "http" else 0
+        if not timeout:
+            await self.app(scope, receive, send)
+            return
+
+        started = False
+        deadline = asyncio.timeout(timeout)
+
+        async def send_tracking(message: Message) -> None:
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+                streamed = "content-length" not in Headers(raw=message["headers"])
+                if streamed and not deadline.expired():
+                    deadline.reschedule(None)
+            await send(message)
+
+        token = request_deadline.set(time.monotonic() + timeout)
+        try:
+            async with deadline:
+                await self.app(scope, receive, send_tracking)
+        except TimeoutError:
+            if not deadline.expired():
+                raise
+        except DBAPIError as exc:
+            if not _query_canceled(exc):
+                raise
+        else:
+            return
+        finally:
+            request_deadline.reset(token)
+
+        REQUEST_TIMEOUTS.labels(route=route_label(scope)).inc()
+        await logger.awarning(
+            "request_timed_out",
+            method=scope["method"],
+            path=scope["path"],
+            timeout=timeout,
+            response_started=started,
+        )
+        if not started:
+            response = JSONResponse({"detail": "Request timed out"}, status_code=504)
+            await response(scope, receive, send)
+
+    def _timeout(self, scope: Scope) -> float:
+        path = scope["path"]
+        method_path = f"{scope['method']} {path}"
+        for pattern, timeout in self.route_timeouts:
+            target = method_path if " " in pattern else path
+            if target.startswith(pattern):
+                return timeout
+        return self.timeout
+
+
+def add_timeout_middleware(app: FastAPI) -> None:
+    app.add_middleware(
+        RequestTimeoutMiddleware,
+        timeout=settings.request_timeout,
+        route_timeouts=settings.request_timeout_routes,
+    )
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import pytest
+
+from app.server import AppWorker, cpu_quota, server_options, worker_count
+from shared.config import settings
+
+
+def _write(root: Path, name: str, content: str) -> None:
+    path = root / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def test_cgroup_v2_quota(tmp_path: Path) -> None:
+    _write(tmp_path, "cpu.max", "150000 100000\n")
+    assert cpu_quota(tmp_path) == 1.5
+
+
+def test_cgroup_v2_unlimited(tmp_path: Path) -> None:
+    _write(tmp_path, "cpu.max", "max 100000\n")
+    assert cpu_quota(tmp_path) is None
+
+
+def test_cgroup_v1_quota(tmp_path: Path) -> None:
+    _write(tmp_path, "cpu/cpu.cfs_quota_us", "200000\n")
+    _write(tmp_path, "cpu/cpu.cfs_period_us", "100000\n")
+    assert cpu_quota(tmp_path) == 2.0
+
+
+def test_cgroup_v1_unlimited(tmp_path: Path) -> None:
+    _write(tmp_path, "cpu/cpu.cfs_quota_us", "-1\n")
+    _write(tmp_path, "cpu/cpu.cfs_period_us", "100000\n")
+    assert cpu_quota(tmp_path) is None
+
+
+def test_no_cgroup(tmp_path: Path) -> None:
+    assert cpu_quota(tmp_path) is None
+
+
+def test_worker_count_rounds_quota_up(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("os.sched_getaffinity", lambda _: set(range(8)))
+    _write(tmp_path, "cpu.max", "150000 100000\n")
+    assert worker_count(settings, tmp_path) == 2
+
+
+def test_worker_count_is_capped_by_usable_cpus(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("os.sched_getaffinity", lambda _: {0})
+    _write(tmp_path, "cpu.max", "400000 100000\n")
+    assert worker_count(settings, tmp_path) == 1
+
+
+def test_web_concurrency_wins(tmp_path: Path) -> None:
+    _write(tmp_path, "cpu.max", "100000 100000\n")
+    config = settings.model_copy(update={"web_concurrency": 6})
+    assert worker_count(config, tmp_path) == 6
+
+
+def test_server_options() -> None:
+    options = server_options(settings.model_copy(update={"web_concurrency": 3}))
+    assert options["workers"] == 3
+    assert options["preload_app"] is True
+    assert options["worker_class"] is AppWorker
+    assert options["max_requests"] == settings.server_max_requests
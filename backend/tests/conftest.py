@@ -18,6 +18,10 @@ os.environ.setdefault("APP_ENV", "testing")
 os.environ.setdefault("SECRET_KEY", "test-secret-key-do-not-use-in-production")
 os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
 os.environ.setdefault("REDIS_URL", "")
+# Tests roll back every transaction, which process-level caches cannot observe
+os.environ.setdefault("ITEMS_COUNT_CACHE_TTL", "0")
+os.environ.setdefault("CACHE_TTL", "0")
+os.environ.setdefault("HEALTH_CACHE_TTL", "0")
 # === End environment setup — imports below this line ===
 
 from shared.db.base import Base
@@ -1,5 +1,8 @@
+import pytest
 from httpx import AsyncClient
 
+from shared.lib.lifecycle import lifecycle
+
 
 async def test_health_returns_200(client: AsyncClient) -> None:
     response = await client.get("/health")
@@ -27,6 +30,16 @@ async def test_health_redis_skipped_when_not_configured(client: AsyncClient) ->
     assert data["redis"] == "skipped"
 
 
+async def test_health_returns_503_while_draining(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(lifecycle, "draining", True)
+    response = await client.get("/health")
+    assert response.status_code == 503
+    assert response.json()["status"] == "draining"
+    assert (await client.get("/health/live")).status_code == 200
+
+
 async def test_liveness_returns_200(client: AsyncClient) -> None:
     """Verify /health/live returns 200 with ok status."""
     response = await client.get("/health/live")
@@ -54,3 +67,19 @@ def test_liveness_endpoint_has_no_fastapi_dependencies() -> None:
             for meta in typing.get_args(ann)[1:]:
                 if isinstance(meta, fastapi_params.Depends):
                     raise AssertionError(f"Parameter '{name}' uses Annotated Depends()")
+
+
+async def test_health_pool_returns_counters(client: AsyncClient) -> None:
+    response = await client.get("/health/pool")
+    assert response.status_code == 200
+    data = response.json()
+    assert "checkouts" in data
+    assert "wait_seconds_max" in data
+
+
+async def test_health_coalescing_reports_item_flights(client: AsyncClient) -> None:
+    response = await client.get("/health/coalescing")
+    assert response.status_code == 200
+    data = response.json()
+    assert {"items.get", "items.list"} <= data.keys()
+    assert set(data["items.get"]) == {"leaders", "followers", "hit_rate", "in_flight"}
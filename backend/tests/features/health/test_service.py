@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from features.health.service import HealthService
+
+
+@pytest.fixture
+def service() -> HealthService:
+    return HealthService(create_async_engine("sqlite+aiosqlite://"), ttl=60, timeout=0.05)
+
+
+async def test_result_is_cached_and_refreshed_in_background(
+    service: HealthService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls = 0
+
+    async def check_database() -> str:
+        nonlocal calls
+        calls += 1
+        return "up"
+
+    monkeypatch.setattr(service, "_check_database", check_database)
+    first = await service.check()
+    assert (await service.check()) is first
+    assert calls == 1
+
+    service._checked_at -= 60
+    # The expired result is still served while the refresh runs
+    assert (await service.check()) is first
+    assert service._refresh is not None
+    await service._refresh
+    assert calls == 2
+    assert (await service.check()) is not first
+
+
+async def test_slow_check_times_out_as_down(
+    service: HealthService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def hang() -> str:
+        await asyncio.sleep(10)
+        return "up"
+
+    monkeypatch.setattr(service, "_check_database", hang)
+    result = await service.check()
+
+    assert result.database == "down"
+    assert result.status == "unhealthy"
@@ -0,0 +1,164 @@
+import asyncio
+import uuid
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock
+
+import pytest
+
+import shared.lib.cache as cache_module
+from features.items.cache import ItemCache, get_item_cache
+from features.items.schema import ItemUpdate
+from features.items.service import ItemService
+from shared.config import settings
+from shared.db.models.item import Item
+from shared.lib.cache import LRUCache
+
+
+def _make_item(**kwargs: object) -> Item:
+    item = Item()
+    defaults: dict[str, object] = {
+        "id": uuid.uuid4(),
+        "name": "Cached",
+        "description": None,
+        "created_at": datetime.now(tz=UTC),
+        "updated_at": datetime.now(tz=UTC),
+    }
+    for key, value in (defaults | kwargs).items():
+        setattr(item, key, value)
+    return item
+
+
+def _service(repo: AsyncMock) -> ItemService:
+    return ItemService(repo, cache=ItemCache(LRUCache(), ttl=60))
+
+
+async def test_get_by_id_is_served_from_cache() -> None:
+    item = _make_item()
+    repo = AsyncMock()
+    repo.get_by_id.return_value = item
+    service = _service(repo)
+
+    first = await service.get_by_id(item.id)
+    second = await service.get_by_id(item.id)
+
+    assert first == second
+    # Cache fills read the primary
+    repo.get_by_id.assert_called_once_with(item.id, replica=False)
+
+
+async def test_update_invalidates_cached_item() -> None:
+    item = _make_item(name="Old")
+    repo = AsyncMock()
+    repo.get_by_id.return_value = item
+    repo.update.return_value = _make_item(id=item.id, name="New")
+    service = _service(repo)
+
+    await service.get_by_id(item.id)
+    await service.update(item.id, ItemUpdate(name="New"))
+    repo.get_by_id.return_value = repo.update.return_value
+
+    assert (await service.get_by_id(item.id)).name == "New"
+    assert repo.get_by_id.call_count == 2
+
+
+async def test_list_is_cached_until_a_write() -> None:
+    repo = AsyncMock()
+    repo.get_list.return_value = ([_make_item()], 1)
+    repo.delete.return_value = True
+    service = _service(repo)
+
+    await service.get_list(limit=10)
+    await service.get_list(limit=10)
+    assert repo.get_list.call_count == 1
+
+    await service.get_list(limit=5)
+    assert repo.get_list.call_count == 2
+
+    await service.delete(uuid.uuid4())
+    await service.get_list(limit=10)
+    assert repo.get_list.call_count == 3
+
+
+async def test_load_finishing_after_a_write_does_not_cache_the_old_item() -> None:
+    item = _make_item(name="Old")
+    loading, release = asyncio.Event(), asyncio.Event()
+
+    async def slow_get(_item_id: uuid.UUID, replica: bool = True) -> Item:
+        loading.set()
+        await release.wait()
+        return item
+
+    repo = AsyncMock()
+    repo.get_by_id.side_effect = slow_get
+    repo.update.return_value = _make_item(id=item.id, name="New")
+    service = _service(repo)
+
+    stale_read = asyncio.create_task(service.get_by_id(item.id))
+    await loading.wait()
+    await service.update(item.id, ItemUpdate(name="New"))
+    release.set()
+    assert (await stale_read).name == "Old"
+
+    repo.get_by_id.side_effect = None
+    repo.get_by_id.return_value = repo.update.return_value
+    assert (await service.get_by_id(item.id)).name == "New"
+
+
+def test_item_cache_needs_redis_unless_local_cache_is_enabled(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "cache_ttl", 30.0)
+    monkeypatch.setattr(settings, "redis_url", None)
+    monkeypatch.setattr(cache_module, "_backend", None)
+    assert get_item_cache() is None
+
+    monkeypatch.setattr(settings, "cache_local", True)
+    item_cache = get_item_cache()
+    assert item_cache is not None
+    assert isinstance(item_cache.backend, LRUCache)
+
+
+class _SuspendingCache(LRUCache):
+    """Yields to the event loop on every read, like a network round trip to Redis."""
+
+    async def get(self, key: str) -> bytes | None:
+        await asyncio.sleep(0)
+        return await super().get(key)
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        await asyncio.sleep(0)
+        return await super().get_many(keys)
+
+
+async def test_get_many_loads_every_miss_with_one_repository_call() -> None:
+    items = [_make_item(name=f"Item {i}") for i in range(50)]
+    repo = AsyncMock()
+    repo.get_many.side_effect = lambda ids, replica: [item for item in items if item.id in ids]
+    service = ItemService(repo, cache=ItemCache(_SuspendingCache(), ttl=60))
+    await service.get_many([items[0].id, items[1].id])
+    repo.get_many.reset_mock()
+
+    ids = [item.id for item in items] + [uuid.uuid4()]
+    page = await service.get_many(ids)
+
+    assert [item.id for item in page.items] == ids[:50]
+    repo.get_many.assert_awaited_once_with(ids[2:], replica=False)
+    repo.get_by_id.assert_not_called()
+
+    cached = await service.get_many(ids[:50])
+    assert cached.total == 50
+    repo.get_many.assert_awaited_once()
+
+
+async def test_current_version_bypasses_a_stale_cache() -> None:
+    item = _make_item()
+    current = datetime.now(tz=UTC)
+    repo = AsyncMock()
+    repo.get_by_id.return_value = item
+    repo.get_updated_at.return_value = current
+    service = _service(repo)
+    await service.get_by_id(item.id)
+
+    assert await service.get_version(item.id) == item.updated_at
+    assert await service.get_current_version(item.id) == current
+    repo.get_updated_at.assert_awaited_once_with(item.id)
@@ -0,0 +1,103 @@
+from collections.abc import AsyncIterator
+
+import pytest
+
+from features.items import formats
+from features.items.formats import ImportRecord, parse_records
+from features.items.schema import FileFormat
+from shared.lib.exceptions import ValidationException
+
+
+async def _chunks(*parts: bytes) -> AsyncIterator[bytes]:
+    for part in parts:
+        yield part
+
+
+async def _parse(file_format: FileFormat, *parts: bytes) -> list[ImportRecord]:
+    return [record async for record in parse_records(_chunks(*parts), file_format)]
+
+
+async def test_ndjson_lines_split_across_chunks() -> None:
+    records = await _parse(FileFormat.NDJSON, b'{"name": "a"}\n{"na', b'me": "b"}\n\n[1]\nnope')
+
+    assert [record.fields for record in records[:2]] == [{"name": "a"}, {"name": "b"}]
+    assert [(record.line, record.error) for record in records[2:]] == [
+        (4, "Expected a JSON object"),
+        (5, "Invalid JSON"),
+    ]
+
+
+async def test_invalid_utf8_only_rejects_its_line() -> None:
+    records = await _parse(FileFormat.NDJSON, b'{"name": "\xff"}\r\n{"name": "ok"}\r\n')
+
+    assert records[0].error == "Line is not valid UTF-8"
+    assert records[1].fields == {"name": "ok"}
+
+
+async def test_csv_quoted_newlines_and_empty_cells() -> None:
+    records = await _parse(
+        FileFormat.CSV, b'name,description\r\n"multi\r\nline",\r\nshort\r\n', b'"open\r\n'
+    )
+
+    assert records[0].fields == {"name": "multi\nline"}
+    assert records[0].line == 2
+    assert records[1].error == "Expected 2 columns, got 1"
+    assert records[2].error == "Unterminated quoted field"
+
+
+async def test_csv_requires_name_column() -> None:
+    with pytest.raises(ValidationException):
+        await _parse(FileFormat.CSV, b"title\r\nx\r\n")
+
+
+async def test_csv_quote_inside_unquoted_field_is_literal() -> None:
+    records = await _parse(
+        FileFormat.CSV,
+        b'name,description\r\nlamp 5" shade,oak\r\nchair,pine\r\nrug 2" x,"3"""\r\n',
+    )
+
+    assert [record.fields for record in records] == [
+        {"name": 'lamp 5" shade', "description": "oak"},
+        {"name": "chair", "description": "pine"},
+        {"name": 'rug 2" x', "description": '3"'},
+    ]
+    assert [record.line for record in records] == [2, 3, 4]
+
+
+async def test_csv_error_only_rejects_its_record() -> None:
+    huge = b"x" * 200_000
+    records = await _parse(FileFormat.CSV, b"name\r\n" + huge + b"\r\nok\r\n")
+
+    assert records[0].error is not None
+    assert records[0].error.startswith("Invalid CSV: field larger than field limit")
+    assert records[1].fields == {"name": "ok"}
+
+
+async def test_over_long_lines_are_rejected_without_buffering(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(formats, "MAX_LINE_BYTES", 16)
+    monkeypatch.setattr(formats, "RAW_PREVIEW_LENGTH", 4)
+    records = await _parse(
+        FileFormat.NDJSON,
+        b'{"name": "a"}\n{"name": ',
+        b'"far too long',
+        b'"}\n{"name": "b"}\n' + b"z" * 40,
+    )
+
+    assert [(record.line, record.error, record.raw) for record in records] == [
+        (1, None, '{"name": "a"}'),
+        (2, "Line is longer than 16 bytes", '{"na'),
+        (3, None, '{"name": "b"}'),
+        (4, "Line is longer than 16 bytes", "zzzz"),
+    ]
+
+
+async def test_csv_over_long_record_is_rejected(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(formats, "MAX_RECORD_LENGTH", 20)
+    records = await _parse(
+        FileFormat.CSV, b'name\r\n"opened\r\nnever\r\nclosed\r\nat all\r\nnext\r\n'
+    )
+
+    assert (records[0].line, records[0].error) == (2, "Record is longer than 20 characters")
+    assert records[-1].fields == {"name": "next"}
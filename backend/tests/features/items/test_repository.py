@@ -1,6 +1,26 @@
-from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
 
-from features.items.repository import ItemRepository
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from features.items.repository import (
+    ItemRepository,
+    _after_prefix,
+    _count_indexed,
+    _list_indexed,
+    count_cache,
+)
+from features.items.schema import ItemListFilters, ItemSort, TotalMode
+from shared.config import settings
+from shared.db.base import Base
+from shared.db.instrumentation import instrument_engine
+from shared.db.models.item import Item
+from shared.db.profiling import QueryProfile, query_profile
+from shared.lib.exceptions import ValidationException
 
 
 async def test_create_and_get(session: AsyncSession) -> None:
@@ -15,22 +35,68 @@ async def test_create_and_get(session: AsyncSession) -> None:
     assert fetched.name == "Repo Test"
 
 
+async def test_warm_up_runs_the_hot_reads(tmp_path: Path) -> None:
+    # Its own instrumented engine, so the profile sees exactly the statements sent
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'warm.db'}")
+    instrument_engine(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def profiled(reads: Callable[[ItemRepository], Awaitable[object]]) -> QueryProfile:
+        profile = QueryProfile()
+        token = query_profile.set(profile)
+        try:
+            async with AsyncSession(engine) as session:
+                await reads(ItemRepository(session))
+        finally:
+            query_profile.reset(token)
+        return profile
+
+    async def hot_reads(repo: ItemRepository) -> None:
+        await repo.get_many([uuid.uuid4()])
+        await repo.get_list(total_mode=TotalMode.NONE)
+        await repo.get_updated_at(uuid.uuid4())
+
+    warm = await profiled(ItemRepository.warm_up)
+    hot = await profiled(hot_reads)
+    await engine.dispose()
+
+    # One statement per hot read, the same SQL they send, and no table-scanning count
+    assert warm.statements == 3
+    assert warm.counts == hot.counts
+    assert not any("count(" in statement.lower() for statement in warm.counts)
+
+
 async def test_get_list(session: AsyncSession) -> None:
     repo = ItemRepository(session)
     await repo.create(name="List Item 1")
     await repo.create(name="List Item 2")
 
     items, total = await repo.get_list(skip=0, limit=10)
+    assert total is not None
     assert total >= 2
     assert len(items) >= 2
 
 
+async def test_concurrent_get_by_id_is_one_batch(session: AsyncSession) -> None:
+    repo = ItemRepository(session)
+    items = [await repo.create(name=f"Batched {i}") for i in range(3)]
+    ids = [item.id for item in items] + [uuid.uuid4()]
+
+    found = await asyncio.gather(*(repo.get_by_id(item_id) for item_id in ids))
+
+    assert [item.name if item else None for item in found] == [*(i.name for i in items), None]
+    assert repo.loader.batches == 1
+
+
 async def test_update(session: AsyncSession) -> None:
     repo = ItemRepository(session)
     item = await repo.create(name="Before Update")
 
-    updated = await repo.update(item, name="After Update")
+    updated = await repo.update(item.id, name="After Update")
+    assert updated is not None
     assert updated.name == "After Update"
+    assert updated.updated_at is not None
 
 
 async def test_delete(session: AsyncSession) -> None:
@@ -38,15 +104,252 @@ async def test_delete(session: AsyncSession) -> None:
     item = await repo.create(name="To Delete")
     item_id = item.id
 
-    await repo.delete(item)
+    assert await repo.delete(item_id) is True
 
     deleted = await repo.get_by_id(item_id)
     assert deleted is None
 
 
-async def test_get_nonexistent(session: AsyncSession) -> None:
-    import uuid
+async def test_update_and_delete_nonexistent(session: AsyncSession) -> None:
+    repo = ItemRepository(session)
+    assert await repo.update(uuid.uuid4(), name="Ghost") is None
+    assert await repo.delete(uuid.uuid4()) is False
+
 
+async def test_get_nonexistent(session: AsyncSession) -> None:
     repo = ItemRepository(session)
     result = await repo.get_by_id(uuid.uuid4())
     assert result is None
+
+
+async def test_get_list_after_keyset(session: AsyncSession) -> None:
+    repo = ItemRepository(session)
+    # Two groups of rows sharing created_at, so page boundaries fall inside a tie
+    earlier = datetime(2030, 1, 1, tzinfo=UTC)
+    later = earlier + timedelta(hours=1)
+    items = [
+        await repo.create(name=f"Keyset {i}", created_at=earlier if i < 3 else later)
+        for i in range(6)
+    ]
+    expected = [
+        item.id
+        for item in sorted(items, key=lambda item: (item.created_at, item.id), reverse=True)
+    ]
+
+    pages: list[list[uuid.UUID]] = []
+    after = None
+    while True:
+        page, _ = await repo.get_list(limit=2, after=after)
+        if not page:
+            break
+        pages.append([item.id for item in page])
+        after = (page[-1].created_at, page[-1].id)
+
+    assert [item_id for page in pages for item_id in page] == expected
+    assert [len(page) for page in pages] == [2, 2, 2]
+    seen = [set(page) for page in pages]
+    assert all(a.isdisjoint(b) for i, a in enumerate(seen) for b in seen[i + 1 :])
+
+
+async def test_get_list_total_modes(session: AsyncSession) -> None:
+    repo = ItemRepository(session)
+    await repo.create(name="Counted")
+
+    _, exact = await repo.get_list(total_mode=TotalMode.EXACT)
+    _, estimate = await repo.get_list(total_mode=TotalMode.ESTIMATE)
+    _, none = await repo.get_list(total_mode=TotalMode.NONE)
+
+    assert exact is not None and exact >= 1
+    assert estimate is not None
+    assert none is None
+
+
+async def test_get_list_sorted_and_filtered_keyset(session: AsyncSession) -> None:
+    repo = ItemRepository(session)
+    prefix = f"Keyset sort {uuid.uuid4().hex[:8]}"
+    for suffix in ("b", "a", "c"):
+        await repo.create(name=f"{prefix} {suffix}")
+    filters = ItemListFilters(name_prefix=prefix)
+
+    first_page, total = await repo.get_list(limit=2, filters=filters, sort=ItemSort.NAME_ASC)
+    last = first_page[-1]
+    rest, _ = await repo.get_list(
+        limit=10, after=(last.name, last.id), filters=filters, sort=ItemSort.NAME_ASC
+    )
+
+    assert total == 3
+    assert [item.name[-1] for item in first_page + rest] == ["a", "b", "c"]
+
+
+def test_list_allowlist_accepts_only_index_bounded_combinations() -> None:
+    since = datetime(2024, 1, 1, tzinfo=UTC)
+    created = ItemListFilters(created_since=since)
+
+    assert _list_indexed(ItemListFilters(), ItemSort.NAME_ASC)
+    assert _list_indexed(created, ItemSort.CREATED_AT_ASC)
+    assert not _list_indexed(created, ItemSort.UPDATED_AT_DESC)
+    assert _list_indexed(ItemListFilters(has_description=True), ItemSort.CREATED_AT_DESC)
+    assert not _list_indexed(ItemListFilters(has_description=True), ItemSort.NAME_ASC)
+    assert _list_indexed(ItemListFilters(name_prefix="lamp"), ItemSort.NAME_DESC)
+    assert not _list_indexed(ItemListFilters(name_prefix="lamp"), ItemSort.CREATED_AT_DESC)
+
+
+def test_count_allowlist_accepts_only_single_column_ranges() -> None:
+    since = datetime(2024, 1, 1, tzinfo=UTC)
+
+    assert _count_indexed(ItemListFilters(updated_since=since, updated_until=since))
+    assert _count_indexed(ItemListFilters(name_prefix="lamp"))
+    assert _count_indexed(ItemListFilters(has_description=False, created_since=since))
+    assert not _count_indexed(ItemListFilters(created_since=since, updated_since=since))
+    assert not _count_indexed(ItemListFilters(has_description=True, name_prefix="lamp"))
+
+
+async def test_indexed_filters_pass_the_scan_guard_on_a_large_table(
+    session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def above_threshold(_self: ItemRepository, message: str) -> None:
+        raise ValidationException(message)
+
+    monkeypatch.setattr(ItemRepository, "_reject_large_scan", above_threshold)
+    repo = ItemRepository(session)
+    since = datetime(2024, 1, 1, tzinfo=UTC)
+
+    for filters, sort in [
+        (ItemListFilters(name_prefix="lamp"), ItemSort.NAME_ASC),
+        (ItemListFilters(has_description=True), ItemSort.CREATED_AT_DESC),
+        (ItemListFilters(has_description=False, created_since=since), ItemSort.CREATED_AT_ASC),
+    ]:
+        await repo.get_list(filters=filters, sort=sort, total_mode=TotalMode.EXACT)
+
+    with pytest.raises(ValidationException):
+        await repo.get_list(filters=ItemListFilters(has_description=True), sort=ItemSort.NAME_ASC)
+
+
+async def test_name_prefix_is_a_case_sensitive_range(session: AsyncSession) -> None:
+    repo = ItemRepository(session)
+    prefix = f"Range {uuid.uuid4().hex[:8]}"
+    names = [prefix, f"{prefix}z", f"{prefix}\U0010ffff", prefix.lower(), f"{prefix[:-1]}~"]
+    for name in names:
+        await repo.create(name=name)
+
+    items, total = await repo.get_list(
+        filters=ItemListFilters(name_prefix=prefix), sort=ItemSort.NAME_ASC
+    )
+
+    assert [item.name for item in items] == names[:3]
+    assert total == 3
+
+
+def test_after_prefix() -> None:
+    assert _after_prefix("lamp") == "lamq"
+    assert _after_prefix("a\U0010ffff") == "b"
+    assert _after_prefix("\ud7ff") == "\ue000"
+    assert _after_prefix("\U0010ffff") is None
+
+
+async def test_count_cache_invalidated_on_write(
+    session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "items_count_cache_ttl", 60.0)
+    count_cache.invalidate()
+    repo = ItemRepository(session)
+
+    before = await repo.count()
+    item = await repo.create(name="Cache Buster")
+    assert await repo.count() == before + 1
+
+    await repo.delete(item.id)
+    assert await repo.count() == before
+    count_cache.invalidate()
+
+
+async def test_bulk_create_update_delete(session: AsyncSession) -> None:
+    repo = ItemRepository(session)
+    created = await repo.bulk_create([{"name": f"Bulk {i}"} for i in range(3)])
+    assert [item.name for item in created] == ["Bulk 0", "Bulk 1", "Bulk 2"]
+    assert all(item.created_at is not None for item in created)
+
+    missing = uuid.uuid4()
+    updated = await repo.bulk_update(
+        [
+            (created[0].id, {"name": "Renamed"}),
+            (created[1].id, {"description": "Described"}),
+            (missing, {"name": "Ghost"}),
+        ]
+    )
+    by_id = {item.id: item for item in updated}
+    assert set(by_id) == {created[0].id, created[1].id}
+    assert by_id[created[0].id].name == "Renamed"
+    assert by_id[created[1].id].name == "Bulk 1"
+    assert by_id[created[1].id].description == "Described"
+
+    deleted = await repo.bulk_delete([created[0].id, created[2].id, missing])
+    assert set(deleted) == {created[0].id, created[2].id}
+    assert await repo.get_by_id(created[0].id) is None
+    assert await repo.get_by_id(created[1].id) is not None
+
+
+async def test_create_each_and_update_each_reject_only_bad_rows(tmp_path: Path) -> None:
+    # Its own database: the savepoints would collide with the rollback fixture's
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'each.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await _create_and_update_each(ItemRepository(session))
+    await engine.dispose()
+
+
+async def _create_and_update_each(repo: ItemRepository) -> None:
+    existing = await repo.create(name="Existing")
+
+    created = await repo.create_each(
+        [{"name": "First"}, {"id": existing.id, "name": "Duplicate id"}, {"name": "Last"}]
+    )
+    assert isinstance(created[0], Item)
+    assert created[1] == "Rejected by the database"
+    assert isinstance(created[2], Item)
+
+    missing = uuid.uuid4()
+    updated = await repo.update_each(
+        [
+            (created[0].id, {"name": "Renamed"}),
+            (created[2].id, {"name": None}),
+            (missing, {"name": "Ghost"}),
+        ]
+    )
+    assert isinstance(updated[0], Item)
+    assert updated[0].name == "Renamed"
+    assert updated[1:] == ["Rejected by the database", None]
+
+    names = {item.name for item in await repo.get_many([created[0].id, created[2].id])}
+    assert names == {"Renamed", "Last"}
+
+
+async def test_update_with_stale_version_is_rejected(session: AsyncSession) -> None:
+    repo = ItemRepository(session)
+    item = await repo.create(name="Versioned")
+    stale = item.updated_at - timedelta(seconds=1)
+
+    assert await repo.update(item.id, stale, name="Lost") is None
+    assert await repo.update(item.id, stale) is None
+    assert await repo.delete(item.id, stale) is False
+
+    unchanged = await repo.update(item.id, item.updated_at)
+    assert unchanged is not None
+    assert unchanged.name == "Versioned"
+
+    updated = await repo.update(item.id, item.updated_at, name="Won")
+    assert updated is not None
+    assert updated.name == "Won"
+
+
+async def test_stream_rows_in_batches(session: AsyncSession) -> None:
+    repo = ItemRepository(session)
+    created = await repo.bulk_create([{"name": f"Streamed {i}"} for i in range(5)])
+
+    batches = [batch async for batch in repo.stream_rows(batch_size=2)]
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert {row.id for batch in batches for row in batch} == {item.id for item in created}
+
+    later = created[0].updated_at + timedelta(days=1)
+    assert [batch async for batch in repo.stream_rows(updated_since=later)] == []
@@ -1,7 +1,13 @@
+import csv
+import io
+import json
 import uuid
+from datetime import UTC, datetime
 
 from httpx import AsyncClient
 
+from shared.lib.pagination import encode_cursor
+
 
 async def test_create_item(client: AsyncClient) -> None:
     response = await client.post(
@@ -70,3 +76,392 @@ async def test_delete_nonexistent_item(client: AsyncClient) -> None:
     fake_id = uuid.uuid4()
     response = await client.delete(f"/api/v1/items/{fake_id}")
     assert response.status_code == 404
+
+
+async def test_list_items_cursor_pagination(client: AsyncClient) -> None:
+    created = set()
+    for i in range(5):
+        response = await client.post("/api/v1/items", json={"name": f"Page Item {i}"})
+        created.add(response.json()["id"])
+
+    seen: list[str] = []
+    params: dict[str, str | int] = {"limit": 2}
+    while True:
+        response = await client.get("/api/v1/items", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        seen.extend(item["id"] for item in data["items"])
+        if data["next_cursor"] is None:
+            break
+        params = {"limit": 2, "cursor": data["next_cursor"]}
+
+    assert len(seen) == len(set(seen))
+    assert created <= set(seen)
+
+
+async def test_list_items_invalid_cursor(client: AsyncClient) -> None:
+    response = await client.get("/api/v1/items", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 422
+
+
+async def test_list_items_cursor_with_skip_rejected(client: AsyncClient) -> None:
+    cursor = encode_cursor(datetime.now(tz=UTC), uuid.uuid4())
+    response = await client.get("/api/v1/items", params={"skip": 1, "cursor": cursor})
+    assert response.status_code == 422
+
+
+async def test_list_items_filters(client: AsyncClient) -> None:
+    prefix = f"Filter {uuid.uuid4().hex[:8]}"
+    await client.post("/api/v1/items", json={"name": f"{prefix} a", "description": "d"})
+    await client.post("/api/v1/items", json={"name": f"{prefix} b"})
+    await client.post("/api/v1/items", json={"name": "Unrelated"})
+
+    response = await client.get("/api/v1/items", params={"name_prefix": prefix.lower()})
+    assert response.json()["total"] == 0
+
+    response = await client.get("/api/v1/items", params={"name_prefix": prefix})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 2
+    assert {item["name"] for item in data["items"]} == {f"{prefix} a", f"{prefix} b"}
+
+    params = {"name_prefix": prefix, "has_description": "false"}
+    response = await client.get("/api/v1/items", params=params)
+    assert [item["name"] for item in response.json()["items"]] == [f"{prefix} b"]
+
+    created_at = data["items"][0]["created_at"]
+    params = {"name_prefix": prefix, "created_until": created_at}
+    response = await client.get("/api/v1/items", params=params)
+    assert all(item["created_at"] < created_at for item in response.json()["items"])
+
+
+async def test_list_items_sorted_by_name_with_cursor(client: AsyncClient) -> None:
+    prefix = f"Sort {uuid.uuid4().hex[:8]}"
+    for suffix in ("c", "a", "d", "b"):
+        await client.post("/api/v1/items", json={"name": f"{prefix} {suffix}"})
+
+    names: list[str] = []
+    params: dict[str, str | int] = {"limit": 3, "sort": "-name", "name_prefix": prefix}
+    while True:
+        data = (await client.get("/api/v1/items", params=params)).json()
+        names.extend(item["name"] for item in data["items"])
+        if data["next_cursor"] is None:
+            break
+        params["cursor"] = data["next_cursor"]
+
+    assert names == [f"{prefix} {suffix}" for suffix in "dcba"]
+
+
+async def test_list_items_rejects_cursor_from_other_sort(client: AsyncClient) -> None:
+    cursor = encode_cursor(datetime.now(tz=UTC), uuid.uuid4())
+    response = await client.get("/api/v1/items", params={"sort": "name", "cursor": cursor})
+    assert response.status_code == 422
+
+
+async def test_list_items_rejects_unknown_sort(client: AsyncClient) -> None:
+    response = await client.get("/api/v1/items", params={"sort": "description"})
+    assert response.status_code == 422
+
+
+async def test_list_items_by_ids(client: AsyncClient) -> None:
+    first = (await client.post("/api/v1/items", json={"name": "Multi 1"})).json()["id"]
+    second = (await client.post("/api/v1/items", json={"name": "Multi 2"})).json()["id"]
+    missing = str(uuid.uuid4())
+
+    response = await client.get(
+        "/api/v1/items", params={"ids": [f"{second},{missing}", first, second]}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == [second, first]
+    assert data["total"] == 2
+    assert data["next_cursor"] is None
+
+
+async def test_list_items_by_ids_rejects_bad_input(client: AsyncClient) -> None:
+    response = await client.get("/api/v1/items", params={"ids": "not-a-uuid"})
+    assert response.status_code == 422
+
+    params = {"ids": str(uuid.uuid4()), "name_prefix": "x"}
+    response = await client.get("/api/v1/items", params=params)
+    assert response.status_code == 422
+
+    too_many = ",".join(str(uuid.uuid4()) for _ in range(101))
+    response = await client.get("/api/v1/items", params={"ids": too_many})
+    assert response.status_code == 422
+
+
+async def test_list_items_without_total(client: AsyncClient) -> None:
+    await client.post("/api/v1/items", json={"name": "Uncounted"})
+
+    response = await client.get("/api/v1/items", params={"total": "none"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] is None
+    assert len(data["items"]) >= 1
+
+
+async def test_batch_create_items(client: AsyncClient) -> None:
+    response = await client.post(
+        "/api/v1/items:batch",
+        json={"items": [{"name": "Batch 1"}, {"name": "Batch 2", "description": "two"}]},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["succeeded"] == 2
+    assert data["failed"] == 0
+    assert [result["item"]["name"] for result in data["results"]] == ["Batch 1", "Batch 2"]
+    assert all(result["status"] == 201 for result in data["results"])
+
+
+async def test_batch_update_items_reports_per_item_errors(client: AsyncClient) -> None:
+    create_response = await client.post("/api/v1/items", json={"name": "Before"})
+    item_id = create_response.json()["id"]
+    missing_id = str(uuid.uuid4())
+
+    response = await client.patch(
+        "/api/v1/items:batch",
+        json={
+            "items": [
+                {"id": item_id, "name": "After"},
+                {"id": missing_id, "name": "Ghost"},
+                {"id": item_id, "name": "Again"},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [200, 404, 422]
+    assert results[0]["item"]["name"] == "After"
+
+    get_response = await client.get(f"/api/v1/items/{item_id}")
+    assert get_response.json()["name"] == "After"
+
+
+async def test_batch_update_rejects_null_name(client: AsyncClient) -> None:
+    create_response = await client.post("/api/v1/items", json={"name": "Keep"})
+    item_id = create_response.json()["id"]
+
+    response = await client.patch(
+        "/api/v1/items:batch",
+        json={
+            "items": [
+                {"id": item_id, "description": "ok"},
+                {"id": str(uuid.uuid4()), "name": None},
+            ]
+        },
+    )
+    assert response.status_code == 422
+
+    get_response = await client.get(f"/api/v1/items/{item_id}")
+    assert get_response.json()["name"] == "Keep"
+
+
+async def test_batch_delete_items(client: AsyncClient) -> None:
+    create_response = await client.post("/api/v1/items", json={"name": "Batch Delete"})
+    item_id = create_response.json()["id"]
+
+    response = await client.request(
+        "DELETE", "/api/v1/items:batch", json={"ids": [item_id, str(uuid.uuid4())]}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [result["status"] for result in data["results"]] == [204, 404]
+    assert data["failed"] == 1
+
+    get_response = await client.get(f"/api/v1/items/{item_id}")
+    assert get_response.status_code == 404
+
+
+async def test_batch_rejects_empty_payload(client: AsyncClient) -> None:
+    response = await client.post("/api/v1/items:batch", json={"items": []})
+    assert response.status_code == 422
+
+
+async def test_get_item_returns_validators_and_304(client: AsyncClient) -> None:
+    create_response = await client.post("/api/v1/items", json={"name": "Conditional"})
+    item_id = create_response.json()["id"]
+
+    response = await client.get(f"/api/v1/items/{item_id}")
+    etag = response.headers["etag"]
+    last_modified = response.headers["last-modified"]
+
+    cached = await client.get(f"/api/v1/items/{item_id}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    since = await client.get(
+        f"/api/v1/items/{item_id}", headers={"If-Modified-Since": last_modified}
+    )
+    assert since.status_code == 304
+
+    stale = await client.get(f"/api/v1/items/{item_id}", headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+    assert stale.json()["name"] == "Conditional"
+
+
+async def test_conditional_get_nonexistent_item(client: AsyncClient) -> None:
+    response = await client.get(f"/api/v1/items/{uuid.uuid4()}", headers={"If-None-Match": "*"})
+    assert response.status_code == 404
+
+
+async def test_list_items_returns_304_when_unchanged(client: AsyncClient) -> None:
+    await client.post("/api/v1/items", json={"name": "Listed"})
+    etag = (await client.get("/api/v1/items")).headers["etag"]
+
+    response = await client.get("/api/v1/items", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    await client.post("/api/v1/items", json={"name": "Listed 2"})
+    response = await client.get("/api/v1/items", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+
+async def test_update_item_if_match(client: AsyncClient) -> None:
+    create_response = await client.post("/api/v1/items", json={"name": "Versioned"})
+    item_id = create_response.json()["id"]
+    etag = (await client.get(f"/api/v1/items/{item_id}")).headers["etag"]
+
+    stale = await client.put(
+        f"/api/v1/items/{item_id}", json={"name": "Lost"}, headers={"If-Match": '"stale"'}
+    )
+    assert stale.status_code == 412
+
+    response = await client.put(
+        f"/api/v1/items/{item_id}", json={"name": "Won"}, headers={"If-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["name"] == "Won"
+    assert "etag" in response.headers
+
+
+async def test_delete_item_if_match_mismatch(client: AsyncClient) -> None:
+    create_response = await client.post("/api/v1/items", json={"name": "Keep Me"})
+    item_id = create_response.json()["id"]
+
+    response = await client.delete(f"/api/v1/items/{item_id}", headers={"If-Match": '"stale"'})
+    assert response.status_code == 412
+
+    get_response = await client.get(f"/api/v1/items/{item_id}")
+    assert get_response.status_code == 200
+
+
+async def test_export_items_ndjson(client: AsyncClient) -> None:
+    await client.post("/api/v1/items", json={"name": "Export 1"})
+    await client.post("/api/v1/items", json={"name": "Export 2", "description": "second"})
+
+    response = await client.get("/api/v1/items/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert 'filename="items.ndjson"' in response.headers["content-disposition"]
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert {row["name"] for row in rows} == {"Export 1", "Export 2"}
+    assert {"id", "description", "created_at", "updated_at"} <= rows[0].keys()
+
+
+async def test_export_items_csv(client: AsyncClient) -> None:
+    await client.post("/api/v1/items", json={"name": "Comma, quoted"})
+
+    response = await client.get("/api/v1/items/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ["id", "name", "description", "created_at", "updated_at"]
+    assert rows[1][1:3] == ["Comma, quoted", ""]
+
+
+async def test_export_items_filters_by_range(client: AsyncClient) -> None:
+    await client.post("/api/v1/items", json={"name": "Old enough"})
+
+    response = await client.get(
+        "/api/v1/items/export", params={"updated_since": "2999-01-01T00:00:00"}
+    )
+    assert response.status_code == 200
+    assert response.text == ""
+
+
+async def test_import_items_ndjson_reports_rejections(client: AsyncClient) -> None:
+    body = b"\n".join(
+        [
+            b'{"name": "Imported 1"}',
+            b'{"description": "no name"}',
+            b"not json",
+            b'{"name": "Imported 2"}',
+        ]
+    )
+
+    response = await client.post("/api/v1/items:import", content=body)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["imported"] == 2
+    assert data["rejected"] == 2
+    assert [rejection["line"] for rejection in data["rejections"]] == [2, 3]
+    assert data["rejections"][0]["error"] == "name: Field required"
+
+    names = {item["name"] for item in (await client.get("/api/v1/items")).json()["items"]}
+    assert {"Imported 1", "Imported 2"} <= names
+
+
+async def test_import_items_accepts_csv_export(client: AsyncClient) -> None:
+    await client.post("/api/v1/items", json={"name": "Round, trip", "description": "kept"})
+    exported = (await client.get("/api/v1/items/export", params={"format": "csv"})).content
+
+    response = await client.post(
+        "/api/v1/items:import", params={"format": "csv"}, content=exported
+    )
+    assert response.status_code == 200
+    assert response.json()["imported"] == 1
+    assert response.json()["rejected"] == 0
+
+    listed = (await client.get("/api/v1/items")).json()["items"]
+    assert [item["description"] for item in listed if item["name"] == "Round, trip"] == [
+        "kept",
+        "kept",
+    ]
+
+
+async def test_import_items_csv_without_name_column(client: AsyncClient) -> None:
+    response = await client.post(
+        "/api/v1/items:import", params={"format": "csv"}, content=b"title\nx\n"
+    )
+    assert response.status_code == 422
+
+
+async def test_search_items_ranks_name_matches_first(client: AsyncClient) -> None:
+    await client.post("/api/v1/items", json={"name": "Unrelated", "description": "about lamps"})
+    await client.post("/api/v1/items", json={"name": "Lamp shade"})
+    await client.post("/api/v1/items", json={"name": "Chair"})
+
+    response = await client.get("/api/v1/items/search", params={"q": "lamp"})
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["name"] for item in data["items"]] == ["Lamp shade", "Unrelated"]
+    assert data["total"] is None
+
+
+async def test_search_items_cursor_pagination(client: AsyncClient) -> None:
+    for i in range(5):
+        await client.post("/api/v1/items", json={"name": f"Searchable {i}"})
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params: dict[str, str | int] = {"q": "searchable", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        data = (await client.get("/api/v1/items/search", params=params)).json()
+        seen += [item["id"] for item in data["items"]]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+
+async def test_search_items_rejects_blank_query(client: AsyncClient) -> None:
+    response = await client.get("/api/v1/items/search", params={"q": "   "})
+    assert response.status_code == 422
+
+    response = await client.get("/api/v1/items/search", params={"q": "x", "cursor": "bad"})
+    assert response.status_code == 422
@@ -1,11 +1,24 @@
+import asyncio
 import uuid
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime
 from unittest.mock import AsyncMock
 
 import pytest
-
-from features.items.schema import ItemCreate, ItemUpdate
+from sqlalchemy.exc import SQLAlchemyError
+
+from features.items import service as service_module
+from features.items.schema import (
+    FileFormat,
+    ItemBatchCreate,
+    ItemBatchUpdate,
+    ItemBatchUpdateEntry,
+    ItemCreate,
+    ItemImportRejection,
+    ItemUpdate,
+)
 from features.items.service import ItemService
+from shared.config import settings
 from shared.db.models.item import Item
 from shared.lib.exceptions import NotFoundException
 
@@ -34,7 +47,7 @@ async def test_get_by_id_returns_item() -> None:
     result = await service.get_by_id(item.id)
 
     assert result.name == "Found"
-    repo.get_by_id.assert_called_once_with(item.id)
+    repo.get_by_id.assert_called_once_with(item.id, replica=True)
 
 
 async def test_get_by_id_raises_not_found() -> None:
@@ -46,6 +59,35 @@ async def test_get_by_id_raises_not_found() -> None:
         await service.get_by_id(uuid.uuid4())
 
 
+async def test_concurrent_get_by_id_shares_one_query() -> None:
+    item = _make_item()
+    repo = AsyncMock()
+
+    async def slow_get(_item_id: uuid.UUID, replica: bool = True) -> Item:
+        await asyncio.sleep(0.01)
+        return item
+
+    repo.get_by_id.side_effect = slow_get
+    followers = service_module.item_flights.followers
+
+    results = await asyncio.gather(*(ItemService(repo).get_by_id(item.id) for _ in range(5)))
+
+    assert {result.id for result in results} == {item.id}
+    repo.get_by_id.assert_awaited_once()
+    assert service_module.item_flights.followers == followers + 4
+
+
+async def test_get_by_id_without_coalescing(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "coalesce_reads", False)
+    repo = AsyncMock()
+    repo.get_by_id.return_value = _make_item()
+    item_id = uuid.uuid4()
+
+    await asyncio.gather(*(ItemService(repo).get_by_id(item_id) for _ in range(3)))
+
+    assert repo.get_by_id.await_count == 3
+
+
 async def test_create_item() -> None:
     item = _make_item(name="New Item")
     repo = AsyncMock()
@@ -62,19 +104,134 @@ async def test_update_item() -> None:
     item = _make_item(name="Old")
     updated_item = _make_item(id=item.id, name="Updated")
     repo = AsyncMock()
-    repo.get_by_id.return_value = item
     repo.update.return_value = updated_item
 
     service = ItemService(repo)
     result = await service.update(item.id, ItemUpdate(name="Updated"))
 
     assert result.name == "Updated"
+    repo.update.assert_called_once_with(item.id, None, name="Updated")
+    repo.get_by_id.assert_not_called()
+
+
+async def test_update_raises_not_found() -> None:
+    repo = AsyncMock()
+    repo.update.return_value = None
+
+    service = ItemService(repo)
+    with pytest.raises(NotFoundException):
+        await service.update(uuid.uuid4(), ItemUpdate(name="Missing"))
 
 
 async def test_delete_raises_not_found() -> None:
     repo = AsyncMock()
-    repo.get_by_id.return_value = None
+    repo.delete.return_value = False
 
     service = ItemService(repo)
     with pytest.raises(NotFoundException):
         await service.delete(uuid.uuid4())
+
+
+async def test_create_batch_retries_failed_chunk_row_by_row(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(service_module, "BATCH_CHUNK_SIZE", 2)
+    repo = AsyncMock()
+    repo.bulk_create.side_effect = [
+        [_make_item(name="A"), _make_item(name="B")],
+        SQLAlchemyError("boom"),
+    ]
+    repo.create_each.return_value = [_make_item(name="C"), "Rejected by the database"]
+
+    service = ItemService(repo)
+    result = await service.create_batch(
+        ItemBatchCreate(items=[ItemCreate(name=name) for name in "ABCD"])
+    )
+
+    assert [entry.status for entry in result.results] == [201, 201, 201, 422]
+    assert result.results[2].item is not None
+    assert result.results[2].item.name == "C"
+    assert result.results[3].error == "Rejected by the database"
+    assert result.succeeded == 3
+    assert result.failed == 1
+    repo.create_each.assert_awaited_once_with(
+        [{"name": "C", "description": None}, {"name": "D", "description": None}]
+    )
+
+
+async def test_create_batch_reports_chunk_that_fails_row_by_row_too() -> None:
+    repo = AsyncMock()
+    repo.bulk_create.side_effect = SQLAlchemyError("boom")
+    repo.create_each.side_effect = SQLAlchemyError("connection lost")
+
+    result = await ItemService(repo).create_batch(ItemBatchCreate(items=[ItemCreate(name="A")]))
+
+    assert [(entry.status, entry.error) for entry in result.results] == [(500, "Database error")]
+
+
+async def test_update_batch_fails_only_the_bad_row() -> None:
+    good, bad, missing = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    repo = AsyncMock()
+    repo.bulk_update.side_effect = SQLAlchemyError("value too long")
+    repo.update_each.return_value = [
+        _make_item(id=good, name="ok"),
+        "Rejected by the database",
+        None,
+    ]
+
+    service = ItemService(repo)
+    result = await service.update_batch(
+        ItemBatchUpdate(
+            items=[
+                ItemBatchUpdateEntry(id=good, name="ok"),
+                ItemBatchUpdateEntry(id=bad, name="x" * 300),
+                ItemBatchUpdateEntry(id=missing, name="ghost"),
+            ]
+        )
+    )
+
+    assert [(entry.status, entry.id) for entry in result.results] == [
+        (200, good),
+        (422, bad),
+        (404, missing),
+    ]
+    assert result.succeeded == 1
+
+
+async def test_update_batch_failure_results_carry_the_ids() -> None:
+    item_id = uuid.uuid4()
+    repo = AsyncMock()
+    repo.bulk_update.side_effect = SQLAlchemyError("boom")
+    repo.update_each.side_effect = SQLAlchemyError("connection lost")
+
+    result = await ItemService(repo).update_batch(
+        ItemBatchUpdate(items=[ItemBatchUpdateEntry(id=item_id, name="A")])
+    )
+
+    assert [(entry.status, entry.id) for entry in result.results] == [(500, item_id)]
+
+
+async def _chunks(*parts: bytes) -> AsyncIterator[bytes]:
+    for part in parts:
+        yield part
+
+
+async def test_import_retries_failed_batch_row_by_row() -> None:
+    repo = AsyncMock()
+    repo.copy_rows.side_effect = SQLAlchemyError("value too long")
+    repo.insert_each.return_value = [None, "Rejected by the database"]
+    rejected: list[ItemImportRejection] = []
+
+    service = ItemService(repo)
+    result = await service.import_items(
+        _chunks(b'{"name": "ok"}\n{"name": "too long"}\n'),
+        FileFormat.NDJSON,
+        on_reject=rejected.append,
+    )
+
+    assert result.imported == 1
+    assert result.rejected == 1
+    assert [rejection.line for rejection in rejected] == [2]
+    repo.insert_each.assert_called_once_with(
+        [{"name": "ok", "description": None}, {"name": "too long", "description": None}]
+    )
@@ -0,0 +1,20 @@
+import uuid
+
+from httpx import AsyncClient
+from prometheus_client import REGISTRY
+
+
+async def test_metrics_labels_requests_by_route_template(client: AsyncClient) -> None:
+    labels = {"method": "GET", "route": "/api/v1/items/{item_id}", "status": "404"}
+    before = REGISTRY.get_sample_value("http_requests_total", labels) or 0.0
+    item_id = uuid.uuid4()
+
+    await client.get(f"/api/v1/items/{item_id}")
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'route="/api/v1/items/{item_id}"' in response.text
+    assert str(item_id) not in response.text
+    assert "http_requests_in_flight" in response.text
+    assert REGISTRY.get_sample_value("http_requests_total", labels) == before + 1
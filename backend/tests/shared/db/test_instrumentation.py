@@ -0,0 +1,44 @@
+import pytest
+from fastapi.routing import APIRoute
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from shared.db.instrumentation import instrument_engine
+from shared.lib.metrics import request_scope
+
+
+async def report(report_id: str) -> None:
+    pass
+
+
+def queries(route: str) -> float:
+    return REGISTRY.get_sample_value("db_queries_total", {"route": route}) or 0.0
+
+
+async def test_queries_are_counted_for_the_current_route() -> None:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    instrument_engine(engine)
+    before = queries("/reports/{report_id}")
+    before_unscoped = queries("none")
+
+    route = APIRoute("/reports/{report_id}", report)
+    token = request_scope.set({"type": "http", "route": route})
+    try:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            await connection.execute(text("SELECT 2"))
+            with pytest.raises(OperationalError):
+                await connection.execute(text("SELECT * FROM missing"))
+            assert not connection.sync_connection.info["metrics_query_starts"]  # type: ignore[union-attr]
+    finally:
+        request_scope.reset(token)
+
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+    await engine.dispose()
+
+    assert queries("/reports/{report_id}") == before + 2
+    assert queries("none") == before_unscoped + 1
+    assert REGISTRY.get_sample_value("db_pool_checked_out") == 0
@@ -0,0 +1,142 @@
+import uuid
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from features.items.cache import ItemCache
+from features.items.repository import ItemRepository
+from features.items.schema import ItemUpdate, TotalMode
+from features.items.service import ItemService
+from shared.db.base import Base
+from shared.db.models.item import Item
+from shared.db.routing import ReplicaSet, RoutingSession, pin_primary
+from shared.lib.cache import LRUCache
+
+
+@pytest.fixture
+async def databases(tmp_path: Path) -> AsyncGenerator[tuple[AsyncEngine, AsyncEngine], None]:
+    """A primary and a replica that (deliberately) hold different rows."""
+    primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    for engine, name in ((primary, "on primary"), (replica, "on replica")):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(insert(Item).values(name=name))
+    yield primary, replica
+    await primary.dispose()
+    await replica.dispose()
+
+
+def _session(primary: AsyncEngine, replicas: ReplicaSet) -> AsyncSession:
+    return AsyncSession(
+        primary, sync_session_class=RoutingSession, replicas=replicas, expire_on_commit=False
+    )
+
+
+async def _names(repo: ItemRepository) -> list[str]:
+    items, _ = await repo.get_list(total_mode=TotalMode.NONE)
+    return [item.name for item in items]
+
+
+async def test_marked_reads_go_to_replica_and_writes_to_primary(
+    databases: tuple[AsyncEngine, AsyncEngine],
+) -> None:
+    primary, replica = databases
+    async with _session(primary, ReplicaSet([replica])) as session:
+        repo = ItemRepository(session)
+        assert await _names(repo) == ["on replica"]
+
+        await repo.create(name="written")
+        # After a write the session reads its own writes from the primary
+        assert sorted(await _names(repo)) == ["on primary", "written"]
+
+
+async def test_pinned_session_reads_from_primary(
+    databases: tuple[AsyncEngine, AsyncEngine],
+) -> None:
+    primary, replica = databases
+    async with _session(primary, ReplicaSet([replica])) as session:
+        pin_primary(session)
+        assert await _names(ItemRepository(session)) == ["on primary"]
+
+
+async def test_ejected_replica_falls_back_to_primary(
+    databases: tuple[AsyncEngine, AsyncEngine],
+) -> None:
+    primary, replica = databases
+    replicas = ReplicaSet([replica])
+    replicas.eject(replica.sync_engine)
+
+    async with _session(primary, replicas) as session:
+        assert await _names(ItemRepository(session)) == ["on primary"]
+
+    assert await replicas.check() == [True]
+    async with _session(primary, replicas) as session:
+        assert await _names(ItemRepository(session)) == ["on replica"]
+
+
+async def test_check_ejects_unreachable_replica(
+    databases: tuple[AsyncEngine, AsyncEngine], tmp_path: Path
+) -> None:
+    _, replica = databases
+    broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'x.db'}")
+    replicas = ReplicaSet([replica, broken])
+
+    assert await replicas.check() == [True, False]
+    assert replicas.healthy == 1
+    assert [replicas.choose() for _ in range(3)] == [replica.sync_engine] * 3
+    await broken.dispose()
+
+
+async def test_cache_fills_read_the_primary_not_a_lagging_replica(
+    databases: tuple[AsyncEngine, AsyncEngine],
+) -> None:
+    primary, replica = databases
+    replicas = ReplicaSet([replica])
+    item_id = uuid.uuid4()
+    for engine in databases:
+        async with engine.begin() as conn:
+            await conn.execute(insert(Item).values(id=item_id, name="Old"))
+    cache = ItemCache(LRUCache(), ttl=60)
+
+    async with _session(primary, replicas) as session:
+        await ItemService(ItemRepository(session), cache).get_by_id(item_id)
+    async with _session(primary, replicas) as session:
+        # Only the primary sees the write; the replica has not replayed it yet
+        await ItemService(ItemRepository(session), cache).update(item_id, ItemUpdate(name="New"))
+
+    # Fresh sessions, as in later requests from other clients
+    for _ in range(2):
+        async with _session(primary, replicas) as session:
+            service = ItemService(ItemRepository(session), cache)
+            assert (await service.get_by_id(item_id)).name == "New"
+            assert [item.name for item in (await service.get_many([item_id])).items] == ["New"]
+            page = await service.get_list(total=TotalMode.NONE)
+            assert "Old" not in {item.name for item in page.items}
+
+    # Uncached reads still go to the replica
+    async with _session(primary, replicas) as session:
+        assert (await ItemService(ItemRepository(session)).get_by_id(item_id)).name == "Old"
+
+
+async def test_update_without_changes_reads_the_primary(
+    databases: tuple[AsyncEngine, AsyncEngine],
+) -> None:
+    primary, replica = databases
+    item_id = uuid.uuid4()
+    for engine, name in ((primary, "Current"), (replica, "Lagging")):
+        async with engine.begin() as conn:
+            await conn.execute(insert(Item).values(id=item_id, name=name))
+
+    async with _session(primary, ReplicaSet([replica])) as session:
+        repo = ItemRepository(session)
+        lagging = await repo.get_by_id(item_id)
+        assert lagging is not None
+        assert lagging.name == "Lagging"
+
+        item = await repo.update(item_id)
+        assert item is not None
+        assert item.name == "Current"
@@ -0,0 +1,43 @@
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from shared.db.session import _limit_statement_time
+from shared.middleware.timeout import request_deadline
+
+
+class _Connection:
+    def __init__(self, dialect: str) -> None:
+        self.dialect = SimpleNamespace(name=dialect)
+        self.executed: list[dict[str, Any]] = []
+
+    def execute(self, _statement: object, parameters: dict[str, Any], **_kw: Any) -> None:
+        self.executed.append(parameters)
+
+
+def _begin(connection: _Connection) -> None:
+    _limit_statement_time(None, None, connection)
+
+
+def test_sets_statement_timeout_to_the_time_left() -> None:
+    connection = _Connection("postgresql")
+    token = request_deadline.set(time.monotonic() + 2.0)
+    try:
+        _begin(connection)
+    finally:
+        request_deadline.reset(token)
+
+    [parameters] = connection.executed
+    assert 1900 < int(parameters["timeout"].removesuffix("ms")) <= 2000
+
+
+def test_leaves_statement_timeout_alone_without_a_deadline_or_postgres() -> None:
+    postgres, sqlite = _Connection("postgresql"), _Connection("sqlite")
+    _begin(postgres)
+    token = request_deadline.set(time.monotonic() + 2.0)
+    try:
+        _begin(sqlite)
+    finally:
+        request_deadline.reset(token)
+
+    assert postgres.executed == sqlite.executed == []
@@ -0,0 +1,71 @@
+import asyncio
+from collections.abc import Mapping
+
+import pytest
+
+from shared.lib.batch_loader import BatchLoader
+
+
+class _Source:
+    def __init__(self, data: dict[int, str]) -> None:
+        self.data = data
+        self.calls: list[list[int]] = []
+
+    async def fetch(self, keys: list[int]) -> Mapping[int, str]:
+        self.calls.append(keys)
+        await asyncio.sleep(0)
+        return {key: self.data[key] for key in keys if key in self.data}
+
+
+async def test_loads_in_one_tick_share_one_batch() -> None:
+    source = _Source({1: "a", 2: "b"})
+    loader = BatchLoader(source.fetch)
+
+    results = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1), loader.load(3))
+
+    assert list(results) == ["a", "b", "a", None]
+    assert source.calls == [[1, 2, 3]]
+    assert loader.loads == 4
+    assert loader.batches == 1
+
+
+async def test_sequential_loads_are_not_memoized() -> None:
+    source = _Source({1: "a"})
+    loader = BatchLoader(source.fetch)
+
+    assert await loader.load(1) == "a"
+    source.data[1] = "changed"
+    assert await loader.load(1) == "changed"
+    assert len(source.calls) == 2
+
+
+async def test_large_batches_are_split() -> None:
+    source = _Source({key: str(key) for key in range(5)})
+    loader = BatchLoader(source.fetch, max_batch_size=2)
+
+    assert await loader.load_many(list(range(5))) == ["0", "1", "2", "3", "4"]
+    assert source.calls == [[0, 1], [2, 3], [4]]
+
+
+async def test_batch_error_reaches_every_caller() -> None:
+    async def fail(_keys: list[int]) -> Mapping[int, str]:
+        raise RuntimeError("boom")
+
+    loader = BatchLoader(fail)
+    results = await asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+async def test_cancelled_caller_does_not_cancel_the_batch() -> None:
+    source = _Source({1: "a"})
+    loader = BatchLoader(source.fetch)
+
+    cancelled = asyncio.create_task(loader.load(1))
+    kept = asyncio.create_task(loader.load(1))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert await kept == "a"
@@ -0,0 +1,63 @@
+import asyncio
+
+from pydantic import BaseModel
+
+from shared.lib.cache import LRUCache, read_through
+
+
+class Payload(BaseModel):
+    value: int
+
+
+async def test_lru_cache_evicts_least_recently_used() -> None:
+    cache = LRUCache(max_entries=2)
+    await cache.set("a", b"1", ttl=60)
+    await cache.set("b", b"2", ttl=60)
+    assert await cache.get("a") == b"1"
+
+    await cache.set("c", b"3", ttl=60)
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == b"1"
+    assert await cache.get("c") == b"3"
+
+
+async def test_lru_cache_expires_entries() -> None:
+    cache = LRUCache()
+    await cache.set("a", b"1", ttl=0.01)
+    await asyncio.sleep(0.02)
+    assert await cache.get("a") is None
+
+
+async def test_lru_cache_incr() -> None:
+    cache = LRUCache()
+    assert await cache.incr("version") == 1
+    assert await cache.incr("version") == 2
+    assert await cache.get("version") == b"2"
+
+
+async def test_read_through_loads_once_and_serves_from_cache() -> None:
+    cache = LRUCache()
+    loads = 0
+
+    async def load() -> Payload:
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.01)
+        return Payload(value=7)
+
+    results = await asyncio.gather(
+        *(read_through(cache, "payload", Payload, load, ttl=60) for _ in range(5))
+    )
+    again = await read_through(cache, "payload", Payload, load, ttl=60)
+
+    assert [result.value for result in results] == [7] * 5
+    assert again == Payload(value=7)
+    assert loads == 1
+
+
+async def test_lru_cache_incr_with_ttl_expires() -> None:
+    cache = LRUCache()
+    assert await cache.incr("version", ttl=0.01) == 1
+    await asyncio.sleep(0.02)
+    assert await cache.incr("version") == 1
@@ -0,0 +1,53 @@
+import asyncio
+import signal
+from collections.abc import Iterator
+from types import FrameType
+
+import pytest
+
+from shared.lib.lifecycle import Lifecycle
+
+
+@pytest.fixture
+def server_exits() -> Iterator[list[int]]:
+    """Stands in for the handler a server installs for SIGTERM."""
+    received: list[int] = []
+
+    def handle_exit(signum: int, _frame: FrameType | None) -> None:
+        received.append(signum)
+
+    original = signal.signal(signal.SIGTERM, handle_exit)
+    try:
+        yield received
+    finally:
+        signal.signal(signal.SIGTERM, original)
+
+
+async def test_sigterm_drains_before_passing_the_signal_on(server_exits: list[int]) -> None:
+    state = Lifecycle()
+    state.drain_on_signal(delay=0.05)
+
+    signal.raise_signal(signal.SIGTERM)
+    assert state.draining
+    assert server_exits == []
+
+    await asyncio.sleep(0.1)
+    assert server_exits == [signal.SIGTERM]
+
+
+async def test_second_sigterm_is_passed_on_at_once(server_exits: list[int]) -> None:
+    state = Lifecycle()
+    state.drain_on_signal(delay=60)
+
+    signal.raise_signal(signal.SIGTERM)
+    signal.raise_signal(signal.SIGTERM)
+    assert server_exits == [signal.SIGTERM]
+
+
+async def test_wait_idle() -> None:
+    state = Lifecycle()
+    state.in_flight = 1
+    assert not await state.wait_idle(timeout=0.01)
+
+    asyncio.get_running_loop().call_later(0.02, setattr, state, "in_flight", 0)
+    assert await state.wait_idle(timeout=1)
@@ -0,0 +1,25 @@
+import json
+import math
+import uuid
+from datetime import UTC, datetime
+
+from features.items.schema import ItemResponse
+from shared.lib.responses import FastJSONResponse
+
+
+def test_renders_model_like_model_dump_json() -> None:
+    now = datetime.now(UTC)
+    item = ItemResponse(
+        id=uuid.uuid4(), name="a", description=None, created_at=now, updated_at=now
+    )
+
+    response = FastJSONResponse(item)
+
+    assert response.body == item.model_dump_json().encode()
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_renders_plain_content_as_valid_json() -> None:
+    response = FastJSONResponse({"detail": "ok", "value": math.nan, "name": "café"})
+
+    assert json.loads(bytes(response.body)) == {"detail": "ok", "value": None, "name": "café"}
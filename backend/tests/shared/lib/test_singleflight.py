@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from shared.lib.singleflight import SingleFlight, flight_snapshot
+
+
+async def test_concurrent_calls_share_one_execution() -> None:
+    flight: SingleFlight[int] = SingleFlight()
+    calls = 0
+
+    async def load() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    results = await asyncio.gather(*(flight.do("key", load) for _ in range(10)))
+
+    assert results == [42] * 10
+    assert calls == 1
+    assert flight.leaders == 1
+    assert flight.followers == 9
+
+
+async def test_different_keys_run_separately() -> None:
+    flight: SingleFlight[str] = SingleFlight()
+
+    async def load(value: str) -> str:
+        await asyncio.sleep(0)
+        return value
+
+    results = await asyncio.gather(
+        flight.do("a", lambda: load("a")),
+        flight.do("b", lambda: load("b")),
+    )
+
+    assert list(results) == ["a", "b"]
+    assert flight.leaders == 2
+
+
+async def test_exception_is_shared_with_followers() -> None:
+    flight: SingleFlight[int] = SingleFlight()
+
+    async def fail() -> int:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        flight.do("key", fail), flight.do("key", fail), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+async def test_follower_takes_over_when_leader_is_cancelled() -> None:
+    flight: SingleFlight[int] = SingleFlight()
+    started = asyncio.Event()
+
+    async def slow() -> int:
+        started.set()
+        await asyncio.sleep(10)
+        return 1
+
+    async def fast() -> int:
+        return 2
+
+    leader = asyncio.create_task(flight.do("key", slow))
+    await started.wait()
+    follower = asyncio.create_task(flight.do("key", fast))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert await follower == 2
+
+
+async def test_forget_starts_a_new_flight() -> None:
+    flight: SingleFlight[int] = SingleFlight()
+    release = asyncio.Event()
+    calls = 0
+
+    async def load() -> int:
+        nonlocal calls
+        calls += 1
+        number = calls
+        await release.wait()
+        return number
+
+    first = asyncio.create_task(flight.do("key", load))
+    await asyncio.sleep(0)
+    flight.forget("key")
+    second = asyncio.create_task(flight.do("key", load))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await first == 1
+    assert await second == 2
+    assert calls == 2
+    assert flight.followers == 0
+
+
+async def test_named_flights_are_reported() -> None:
+    flight: SingleFlight[int] = SingleFlight("test.snapshot")
+
+    async def load() -> int:
+        await asyncio.sleep(0.01)
+        return 1
+
+    await asyncio.gather(flight.do("key", load), flight.do("key", load))
+
+    assert flight.hit_rate == 0.5
+    assert flight_snapshot()["test.snapshot"] == {
+        "leaders": 1,
+        "followers": 1,
+        "hit_rate": 0.5,
+        "in_flight": 0,
+    }
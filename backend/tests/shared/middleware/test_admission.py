@@ -0,0 +1,82 @@
+import time
+from typing import Any
+
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from shared.db.pool import PoolMetrics
+from shared.lib.lifecycle import Lifecycle
+from shared.middleware.admission import AdmissionControlMiddleware
+
+
+async def ok(_request: object) -> PlainTextResponse:
+    return PlainTextResponse("ok")
+
+
+def _client(state: Lifecycle, pool: PoolMetrics, **options: Any) -> AsyncClient:
+    app = Starlette(routes=[Route("/ok", ok), Route("/health", ok)])
+    wrapped = AdmissionControlMiddleware(
+        app,
+        max_in_flight=options.pop("max_in_flight", 2),
+        max_pool_waiters=options.pop("max_pool_waiters", 1),
+        max_pool_wait=options.pop("max_pool_wait", 0.5),
+        exempt_paths=["/health"],
+        state=state,
+        pool=pool,
+        **options,
+    )
+    return AsyncClient(transport=ASGITransport(app=wrapped), base_url="http://test")
+
+
+async def test_admits_requests_under_the_limits() -> None:
+    state, pool = Lifecycle(), PoolMetrics()
+    state.in_flight = 2
+    pool.waiting[1] = time.perf_counter()
+    async with _client(state, pool) as client:
+        response = await client.get("/ok")
+
+    assert response.status_code == 200
+
+
+async def test_sheds_when_too_many_requests_are_in_flight() -> None:
+    state = Lifecycle()
+    state.in_flight = 3
+    async with _client(state, PoolMetrics(), retry_after=2) as client:
+        response = await client.get("/ok")
+
+    assert response.status_code == 503
+    assert response.json() == {"detail": "Server is overloaded. Try again later."}
+    assert response.headers["Retry-After"] == "2"
+
+
+async def test_sheds_when_the_pool_queue_is_deep() -> None:
+    pool = PoolMetrics()
+    pool.waiting.update({1: time.perf_counter(), 2: time.perf_counter()})
+    async with _client(Lifecycle(), pool) as client:
+        response = await client.get("/ok")
+
+    assert response.status_code == 503
+
+
+async def test_sheds_when_pool_waits_are_long() -> None:
+    pool = PoolMetrics()
+    pool.waiting[1] = time.perf_counter() - 1.0
+    async with _client(Lifecycle(), pool) as client:
+        shed = await client.get("/ok")
+        health = await client.get("/health")
+
+    assert shed.status_code == 503
+    assert health.status_code == 200
+
+
+async def test_zero_limits_disable_the_checks() -> None:
+    state, pool = Lifecycle(), PoolMetrics()
+    state.in_flight = 100
+    pool.waiting.update({i: time.perf_counter() - 10 for i in range(10)})
+    options = {"max_in_flight": 0, "max_pool_waiters": 0, "max_pool_wait": 0}
+    async with _client(state, pool, **options) as client:
+        response = await client.get("/ok")
+
+    assert response.status_code == 200
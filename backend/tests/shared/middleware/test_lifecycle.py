@@ -0,0 +1,35 @@
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from shared.lib.lifecycle import Lifecycle
+from shared.middleware.lifecycle import LifecycleMiddleware
+
+
+def _client(state: Lifecycle) -> AsyncClient:
+    async def in_flight(_request: Request) -> JSONResponse:
+        return JSONResponse({"in_flight": state.in_flight})
+
+    app = LifecycleMiddleware(Starlette(routes=[Route("/", in_flight)]), state)
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+async def test_counts_requests_in_flight() -> None:
+    state = Lifecycle()
+    async with _client(state) as client:
+        response = await client.get("/")
+
+    assert response.json() == {"in_flight": 1}
+    assert "connection" not in response.headers
+    assert state.in_flight == 0
+
+
+async def test_closes_connections_while_draining() -> None:
+    state = Lifecycle()
+    state.draining = True
+    async with _client(state) as client:
+        response = await client.get("/")
+
+    assert response.headers["connection"] == "close"
@@ -0,0 +1,121 @@
+import threading
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import REGISTRY
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from shared.middleware import logging as logging_module
+from shared.middleware.logging import RequestLoggingMiddleware
+from shared.middleware.query_profile import QueryProfileMiddleware
+
+
+async def ok(_request: object) -> PlainTextResponse:
+    return PlainTextResponse("ok")
+
+
+async def missing(_request: object) -> PlainTextResponse:
+    return PlainTextResponse("missing", status_code=404)
+
+
+async def stream(_request: object) -> StreamingResponse:
+    async def chunks() -> AsyncIterator[bytes]:
+        for chunk in (b"a", b"b", b"c"):
+            yield chunk
+
+    return StreamingResponse(chunks())
+
+
+def _client(sample_rate: float) -> AsyncClient:
+    app = Starlette(
+        routes=[Route("/ok", ok), Route("/missing", missing), Route("/stream", stream)]
+    )
+    wrapped = RequestLoggingMiddleware(app, exclude_paths=["/health"], sample_rate=sample_rate)
+    return AsyncClient(transport=ASGITransport(app=wrapped), base_url="http://test")
+
+
+@pytest.fixture
+def emitted(monkeypatch: pytest.MonkeyPatch) -> list[dict[str, Any]]:
+    records: list[dict[str, Any]] = []
+
+    def emit(event: str, **fields: Any) -> None:
+        records.append({"event": event, **fields})
+
+    monkeypatch.setattr(logging_module.log_writer, "emit", emit)
+    return records
+
+
+async def test_logs_request_fields(emitted: list[dict[str, Any]]) -> None:
+    async with _client(sample_rate=1.0) as client:
+        await client.get("/ok")
+
+    assert len(emitted) == 1
+    record = emitted[0]
+    assert record["event"] == "request"
+    assert record["method"] == "GET"
+    assert record["path"] == "/ok"
+    assert record["status"] == 200
+    assert record["duration_ms"] >= 0
+
+
+async def test_logs_db_totals_inside_query_profiling(emitted: list[dict[str, Any]]) -> None:
+    app = Starlette(routes=[Route("/ok", ok)])
+    wrapped = QueryProfileMiddleware(RequestLoggingMiddleware(app, sample_rate=1.0))
+    transport = ASGITransport(app=wrapped)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/ok")
+
+    assert emitted[0]["db_statements"] == 0
+    assert emitted[0]["db_ms"] == 0
+
+
+async def test_excluded_path_is_not_logged(emitted: list[dict[str, Any]]) -> None:
+    async with _client(sample_rate=1.0) as client:
+        await client.get("/health")
+
+    assert emitted == []
+
+
+async def test_sampling_skips_success_but_keeps_errors(emitted: list[dict[str, Any]]) -> None:
+    async with _client(sample_rate=0.0) as client:
+        await client.get("/ok")
+        await client.get("/missing")
+
+    assert [record["status"] for record in emitted] == [404]
+
+
+async def test_streaming_response_passes_through(emitted: list[dict[str, Any]]) -> None:
+    async with _client(sample_rate=1.0) as client:
+        response = await client.get("/stream")
+
+    assert response.text == "abc"
+    assert emitted[0]["status"] == 200
+
+
+def test_log_writer_writes_from_background_thread() -> None:
+    writer = logging_module._LogWriter()
+    writer.emit("test_event", value=1)
+    writer.flush()
+    assert writer.dropped == 0
+
+
+def test_log_writer_counts_dropped_records_and_flush_times_out(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    release = threading.Event()
+    monkeypatch.setattr(logging_module.logger, "info", lambda *_a, **_kw: release.wait())
+    writer = logging_module._LogWriter(maxsize=1)
+    before = REGISTRY.get_sample_value("log_records_dropped_total") or 0.0
+
+    for value in range(3):
+        writer.emit("test_event", value=value)
+
+    assert writer.dropped >= 1
+    assert REGISTRY.get_sample_value("log_records_dropped_total") == before + writer.dropped
+    assert not writer.flush(timeout=0.05)
+    release.set()
+    assert writer.flush(timeout=5)
@@ -0,0 +1,53 @@
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import REGISTRY
+
+from shared.middleware.metrics import MetricsMiddleware
+
+app = FastAPI()
+
+
+@app.get("/things/{thing_id}")
+async def thing(thing_id: int) -> dict[str, int]:
+    return {"id": thing_id}
+
+
+@app.get("/boom")
+async def boom() -> None:
+    raise RuntimeError("boom")
+
+
+def count(method: str, route: str, status: str) -> float:
+    labels = {"method": method, "route": route, "status": status}
+    return REGISTRY.get_sample_value("http_requests_total", labels) or 0.0
+
+
+@pytest.fixture
+def client() -> AsyncClient:
+    transport = ASGITransport(app=MetricsMiddleware(app), raise_app_exceptions=False)
+    return AsyncClient(transport=transport, base_url="http://test")
+
+
+async def test_requests_are_counted_per_route_template(client: AsyncClient) -> None:
+    before = count("GET", "/things/{thing_id}", "200")
+    async with client:
+        await client.get("/things/1")
+        await client.get("/things/2")
+    assert count("GET", "/things/{thing_id}", "200") == before + 2
+
+
+async def test_unmatched_paths_and_unknown_methods_share_a_label(client: AsyncClient) -> None:
+    before = count("OTHER", "unmatched", "404")
+    async with client:
+        await client.request("FOO", "/nope/1")
+        await client.request("BAR", "/nope/2")
+    assert count("OTHER", "unmatched", "404") == before + 2
+
+
+async def test_unhandled_errors_count_as_500(client: AsyncClient) -> None:
+    before = count("GET", "/boom", "500")
+    async with client:
+        await client.get("/boom")
+    assert count("GET", "/boom", "500") == before + 1
+    assert REGISTRY.get_sample_value("http_requests_in_flight") == 0
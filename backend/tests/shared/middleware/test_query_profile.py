@@ -0,0 +1,74 @@
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from structlog.testing import capture_logs
+
+from shared.config import settings
+from shared.db.instrumentation import instrument_engine
+from shared.middleware.query_profile import QueryProfileMiddleware
+
+
+@pytest.fixture
+async def client(tmp_path: Path) -> AsyncIterator[AsyncClient]:
+    # A file, so the EXPLAIN connection sees the same table
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'profile.db'}")
+    instrument_engine(engine)
+    async with engine.begin() as connection:
+        await connection.execute(text("CREATE TABLE things (id INTEGER PRIMARY KEY)"))
+
+    app = FastAPI()
+
+    @app.get("/things/{count}")
+    async def things(count: int) -> dict[str, int]:
+        async with engine.connect() as connection:
+            for thing_id in range(count):
+                await connection.execute(
+                    text("SELECT id FROM things WHERE id = :id"), {"id": thing_id}
+                )
+        return {"count": count}
+
+    transport = ASGITransport(app=QueryProfileMiddleware(app))
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+    await engine.dispose()
+
+
+async def test_server_timing_reports_statements(client: AsyncClient) -> None:
+    response = await client.get("/things/3")
+    timing = response.headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    assert timing.endswith('desc="3 queries"')
+
+
+async def test_repeated_statement_is_reported_as_n_plus_one(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "db_n_plus_one_threshold", 5)
+    with capture_logs() as logs:
+        await client.get("/things/4")
+        assert not [log for log in logs if log["event"] == "n_plus_one_suspected"]
+        await client.get("/things/5")
+
+    [warning] = [log for log in logs if log["event"] == "n_plus_one_suspected"]
+    assert warning["route"] == "/things/{count}"
+    assert warning["count"] == 5
+    assert "FROM things" in warning["statement"]
+
+
+async def test_slow_statements_are_logged_with_plan(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "db_slow_query_ms", 1e-6)
+    with capture_logs() as logs:
+        await client.get("/things/1")
+
+    [slow] = [log for log in logs if log["event"] == "slow_query"]
+    assert slow["route"] == "/things/{count}"
+    assert "WHERE id = ?" in slow["statement"]
+    assert slow["plan"]
+    assert any("things" in line for line in slow["plan"])
@@ -0,0 +1,109 @@
+from typing import Any
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from shared.middleware.rate_limit import Rate, RateLimiter, RateLimitMiddleware
+
+
+async def ok(_request: object) -> PlainTextResponse:
+    return PlainTextResponse("ok")
+
+
+def _client(limiter: RateLimiter | None = None, **options: Any) -> AsyncClient:
+    app = Starlette(
+        routes=[Route("/ok", ok), Route("/upload", ok, methods=["POST"]), Route("/health", ok)]
+    )
+    wrapped = RateLimitMiddleware(
+        app,
+        limiter=limiter or RateLimiter(),
+        default_rate=options.pop("default_rate", "2/minute"),
+        exempt_paths=["/health"],
+        **options,
+    )
+    return AsyncClient(transport=ASGITransport(app=wrapped), base_url="http://test")
+
+
+class _BrokenRedis:
+    def register_script(self, _script: str) -> Any:
+        async def run(**_kwargs: Any) -> Any:
+            raise ConnectionError("redis down")
+
+        return run
+
+
+async def test_adds_rate_limit_headers() -> None:
+    async with _client() as client:
+        response = await client.get("/ok")
+
+    assert response.status_code == 200
+    assert response.headers["RateLimit-Limit"] == "2"
+    assert response.headers["RateLimit-Remaining"] == "1"
+    assert response.headers["RateLimit-Policy"] == "2;w=60"
+    assert int(response.headers["RateLimit-Reset"]) > 0
+
+
+async def test_rejects_when_bucket_is_empty() -> None:
+    async with _client() as client:
+        await client.get("/ok")
+        await client.get("/ok")
+        response = await client.get("/ok")
+
+    assert response.status_code == 429
+    assert response.json() == {"detail": "Rate limit exceeded. Try again later."}
+    assert response.headers["RateLimit-Remaining"] == "0"
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+async def test_exempt_path_is_not_limited() -> None:
+    async with _client(default_rate="1/minute") as client:
+        responses = [await client.get("/health") for _ in range(3)]
+
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    assert "RateLimit-Limit" not in responses[0].headers
+
+
+async def test_route_rule_uses_its_own_bucket() -> None:
+    async with _client(default_rate="1/minute", route_rates={"POST /upload": "3/minute"}) as c:
+        assert (await c.get("/ok")).status_code == 200
+        assert (await c.get("/ok")).status_code == 429
+        upload = await c.post("/upload")
+
+    assert upload.status_code == 200
+    assert upload.headers["RateLimit-Limit"] == "3"
+
+
+async def test_configured_api_key_gets_its_own_limit() -> None:
+    async with _client(default_rate="1/minute", api_key_rates={"secret": "5/minute"}) as c:
+        keyed = await c.get("/ok", headers={"X-API-Key": "secret"})
+        await c.get("/ok")
+        # Unknown keys fall back to the caller's IP bucket
+        unknown = await c.get("/ok", headers={"X-API-Key": "made-up"})
+
+    assert keyed.headers["RateLimit-Limit"] == "5"
+    assert unknown.status_code == 429
+
+
+async def test_falls_back_to_local_buckets_when_redis_fails() -> None:
+    limiter = RateLimiter(_BrokenRedis())
+    async with _client(limiter) as client:
+        first = await client.get("/ok")
+        await client.get("/ok")
+        third = await client.get("/ok")
+
+    assert first.status_code == 200
+    assert third.status_code == 429
+    assert limiter.rejected == 1
+
+
+@pytest.mark.parametrize("value", ["100", "0/minute", "5/fortnight", "x/second"])
+def test_rate_parse_rejects_invalid_values(value: str) -> None:
+    with pytest.raises(ValueError, match="Invalid rate limit"):
+        Rate.parse(value)
+
+
+def test_rate_parse_accepts_plural_units() -> None:
+    assert Rate.parse("10/minutes") == Rate(limit=10, period=60)
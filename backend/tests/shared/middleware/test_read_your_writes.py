@@ -0,0 +1,60 @@
+import time
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from shared.config import settings
+from shared.middleware.read_your_writes import (
+    COOKIE_NAME,
+    ReadYourWritesMiddleware,
+    reads_from_primary,
+)
+
+
+async def pinned(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(str(reads_from_primary(request)))
+
+
+async def fail(_request: Request) -> PlainTextResponse:
+    return PlainTextResponse("bad", status_code=422)
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch) -> AsyncClient:
+    monkeypatch.setattr(settings, "db_read_your_writes_seconds", 5.0)
+    app = Starlette(
+        routes=[
+            Route("/", pinned, methods=["GET", "POST"]),
+            Route("/fail", fail, methods=["POST"]),
+        ]
+    )
+    wrapped = ReadYourWritesMiddleware(app, window=5.0)
+    return AsyncClient(transport=ASGITransport(app=wrapped), base_url="http://test")
+
+
+async def test_successful_write_pins_later_reads(client: AsyncClient) -> None:
+    async with client:
+        assert (await client.get("/")).text == "False"
+        assert COOKIE_NAME not in (await client.get("/")).cookies
+
+        response = await client.post("/")
+        assert COOKIE_NAME in response.cookies
+        assert (await client.get("/")).text == "True"
+
+
+async def test_failed_write_sets_no_cookie(client: AsyncClient) -> None:
+    async with client:
+        response = await client.post("/fail")
+        assert COOKIE_NAME not in response.cookies
+
+
+async def test_far_future_cookie_is_ignored(client: AsyncClient) -> None:
+    async with client:
+        client.cookies.set(COOKIE_NAME, str(time.time() + 3600))
+        assert (await client.get("/")).text == "False"
+        client.cookies.set(COOKIE_NAME, "garbage")
+        assert (await client.get("/")).text == "False"
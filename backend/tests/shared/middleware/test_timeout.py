@@ -0,0 +1,103 @@
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.exc import DBAPIError
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route, Router
+
+from shared.config import Settings
+from shared.middleware.timeout import RequestTimeoutMiddleware, remaining_time
+
+
+class _Canceled(Exception):
+    sqlstate = "57014"
+
+
+async def slow(_request: Request) -> JSONResponse:
+    await asyncio.sleep(0.2)
+    return JSONResponse({"remaining": remaining_time()})
+
+
+async def canceled(_request: Request) -> JSONResponse:
+    raise DBAPIError("SELECT pg_sleep(10)", None, _Canceled())
+
+
+def _client(timeout: float = 0.05, **options: Any) -> AsyncClient:
+    # A bare router: Starlette's error middleware would answer the DBAPIError with a 500 first
+    app = Router(
+        routes=[
+            Route("/slow", slow),
+            Route("/slow", slow, methods=["POST"]),
+            Route("/canceled", canceled),
+        ]
+    )
+    wrapped = RequestTimeoutMiddleware(app, timeout=timeout, **options)
+    return AsyncClient(transport=ASGITransport(app=wrapped), base_url="http://test")
+
+
+async def test_cancels_requests_past_their_deadline() -> None:
+    async with _client() as client:
+        response = await client.get("/slow")
+
+    assert response.status_code == 504
+    assert response.json() == {"detail": "Request timed out"}
+
+
+async def test_exposes_the_time_left_to_the_handler() -> None:
+    async with _client(timeout=5.0) as client:
+        response = await client.get("/slow")
+
+    assert response.status_code == 200
+    assert 4.0 < response.json()["remaining"] < 5.0
+    assert remaining_time() is None
+
+
+async def test_longest_matching_route_rule_wins() -> None:
+    routes = {"/slow": 0.05, "GET /slow": 5.0}
+    async with _client(route_timeouts=routes) as client:
+        read = await client.get("/slow")
+        write = await client.post("/slow")
+
+    assert read.status_code == 200
+    assert write.status_code == 504
+
+
+async def test_zero_timeout_disables_the_deadline() -> None:
+    async with _client(timeout=0) as client:
+        response = await client.get("/slow")
+
+    assert response.json() == {"remaining": None}
+
+
+async def test_statement_timeout_is_answered_as_a_timeout() -> None:
+    async with _client(timeout=5.0) as client:
+        response = await client.get("/canceled")
+
+    assert response.status_code == 504
+
+
+async def test_streamed_responses_are_exempt_once_started() -> None:
+    async def chunks() -> AsyncIterator[bytes]:
+        for chunk in (b"a", b"b", b"c"):
+            await asyncio.sleep(0.05)
+            yield chunk
+
+    async def stream(_request: Request) -> StreamingResponse:
+        return StreamingResponse(chunks())
+
+    app = RequestTimeoutMiddleware(Router(routes=[Route("/stream", stream)]), timeout=0.08)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/stream")
+
+    assert response.status_code == 200
+    assert response.text == "abc"
+
+
+def test_configured_route_timeouts_are_merged_over_the_defaults() -> None:
+    config = Settings(request_timeout_routes={"GET /api/v1/items/export": 0})
+
+    assert config.request_timeout_routes["GET /api/v1/items/export"] == 0
+    assert config.request_timeout_routes["POST /api/v1/items:import"] == 300
@@ -13,5 +13,6 @@ export interface ItemCreate {
 
 export interface ItemListResponse {
   items: Item[];
-  total: number;
+  total: number | null;
+  next_cursor: string | null;
 }